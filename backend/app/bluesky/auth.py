@@ -1,39 +1,143 @@
 """Blue Sky authentication utilities for creating and managing API clients."""
 
 from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import TYPE_CHECKING
 
-from atproto import Client
 from fastapi import HTTPException, status
 from jose import jwt
 
 from app.core.config import get_settings
 from app.core.logger import setup_logger
 from app.models.auth import AuthResponse, UserProfile
+from app.services.state.factory import get_state_backend
+
+
+if TYPE_CHECKING:
+    from atproto import Client
 
 
 logger = setup_logger(__name__)
 settings = get_settings()
 
 
+def new_client() -> "Client":
+    """Instantiate an unauthenticated Blue Sky client.
+
+    atproto takes seconds to import, so it is imported on first use (or during
+    startup warmup) rather than when the app module is loaded. Every client sends
+    its requests to BLUESKY_API_URL through the shared, rate-limit-aware upstream
+    request layer.
+
+    Returns:
+        A new Client instance
+    """
+    from atproto import Client
+
+    from app.bluesky.upstream import UpstreamRequest
+
+    return Client(base_url=settings.BLUESKY_API_URL, request=UpstreamRequest())
+
+
 class BlueskyAuthManager:
-    """Manages Bluesky authentication and client instances."""
+    """Manages Bluesky authentication and client instances.
+
+    Clients are cached per worker. Their session strings are also written to the
+    shared state backend, so a worker that did not handle the login can restore
+    the user's client instead of rejecting their token, and a cached client picks
+    up a session another worker refreshed (which rotates the refresh token).
+
+    Restoring and refreshing call the PDS, so get_client blocks and is meant to be
+    run off the event loop.
+    """
+
+    _clients: "dict[str, Client]" = {}
+
+    @staticmethod
+    def _session_key(did: str) -> str:
+        """Build the state backend key holding a user's session string."""
+        return f"sessions:{did}"
 
-    _clients: dict[str, Client] = {}
+    @classmethod
+    def _persist_session(cls, did: str, client: "Client") -> None:
+        """Write a client's current session string to the shared state backend."""
+        get_state_backend().set(
+            cls._session_key(did),
+            client.export_session_string().encode(),
+            ttl_seconds=settings.REFRESH_TOKEN_EXPIRE_MINUTES * 60,
+        )
+
+    @classmethod
+    def _restore_client(cls, did: str) -> "Client | None":
+        """Rebuild a client from a session stored by any worker."""
+        session_string = get_state_backend().get(cls._session_key(did))
+        for _attempt in range(2):
+            if not session_string:
+                return None
+            client = new_client()
+            # Registered before login, which refreshes an expiring session and rotates its refresh token
+            client.on_session_change(lambda _event, _session, client=client: cls._persist_session(did, client))
+            try:
+                client.login(session_string=session_string.decode())
+            except Exception as e:
+                # Another worker may have refreshed the session meanwhile; retry with its version
+                latest = get_state_backend().get(cls._session_key(did))
+                if latest == session_string:
+                    logger.warning(f"Failed to restore session for {did}: {e!s}")
+                    get_state_backend().delete(cls._session_key(did))
+                    return None
+                session_string = latest
+                continue
+            cls._clients[did] = client
+            return client
+        return None
 
     @classmethod
-    def get_client(cls, did: str) -> Client | None:
+    def _sync_client(cls, did: str, client: "Client") -> "Client | None":
+        """Bring a cached client up to date with the shared session, refreshing it if it is about to expire."""
+        with client._refresh_lock:
+            stored = get_state_backend().get(cls._session_key(did))
+            if not stored:
+                # Logged out (or the session expired) on another worker
+                cls._clients.pop(did, None)
+                return None
+            if stored.decode() != client.export_session_string():
+                client._import_session_string(stored.decode())
+            if not client._should_refresh_session():
+                return client
+            try:
+                client._refresh_and_set_session()
+                return client
+            except Exception as e:
+                # Another worker may have refreshed first, rotating the token this client just tried to use
+                stored = get_state_backend().get(cls._session_key(did))
+                if stored and stored.decode() != client.export_session_string():
+                    client._import_session_string(stored.decode())
+                    return client
+                logger.warning(f"Failed to refresh session for {did}: {e!s}")
+        cls.remove_client(did)
+        return None
+
+    @classmethod
+    def get_client(cls, did: str) -> "Client | None":
         """Get cached client for user DID.
 
+        Falls back to restoring the client from the shared session store. Blocks on
+        the PDS when restoring or refreshing the session.
+
         Args:
             did: User's decentralized identifier
 
         Returns:
-            Cached client instance or None if not found
+            Client with a current session, or None if the user has no usable session
         """
-        return cls._clients.get(did)
+        client = cls._clients.get(did)
+        if client:
+            return cls._sync_client(did, client)
+        return cls._restore_client(did)
 
     @classmethod
-    def store_client(cls, did: str, client: Client) -> None:
+    def store_client(cls, did: str, client: "Client") -> None:
         """Store client instance for user DID.
 
         Args:
@@ -41,6 +145,8 @@ class BlueskyAuthManager:
             client: Authenticated client instance
         """
         cls._clients[did] = client
+        cls._persist_session(did, client)
+        client.on_session_change(lambda _event, _session: cls._persist_session(did, client))
 
     @classmethod
     def remove_client(cls, did: str) -> None:
@@ -50,9 +156,10 @@ class BlueskyAuthManager:
             did: User's decentralized identifier
         """
         cls._clients.pop(did, None)
+        get_state_backend().delete(cls._session_key(did))
 
 
-def create_bluesky_client(login: str, password: str) -> Client:
+def create_bluesky_client(login: str, password: str) -> "Client":
     """Create an authenticated Blue Sky client.
 
     Args:s
@@ -66,7 +173,7 @@ def create_bluesky_client(login: str, password: str) -> Client:
         HTTPException: If authentication fails
     """
     try:
-        client = Client()
+        client = new_client()
         client.login(login=login, password=password)
         logger.info("Successfully created authenticated Blue Sky client")
         return client
@@ -78,6 +185,19 @@ def create_bluesky_client(login: str, password: str) -> Client:
         )
 
 
+@lru_cache
+def get_service_client() -> "Client":
+    """Get the service-level client used for background crawls.
+
+    Returns:
+        Client authenticated with BLUESKY_IDENTIFIER and BLUESKY_PASSWORD
+
+    Raises:
+        HTTPException: If authentication fails
+    """
+    return create_bluesky_client(login=settings.BLUESKY_IDENTIFIER, password=settings.BLUESKY_PASSWORD)
+
+
 def create_access_token(data: dict, expires_delta: timedelta | None = None) -> str:
     """Create JWT access token.
 
@@ -0,0 +1,69 @@
+"""Process-wide pooled HTTP transport shared by every Blue Sky client."""
+
+import importlib.util
+import threading
+
+import httpx
+
+from app.core.config import get_settings
+from app.core.logger import setup_logger
+
+
+logger = setup_logger(__name__)
+settings = get_settings()
+
+_lock = threading.Lock()
+_client: httpx.Client | None = None
+
+
+def _is_http2_available() -> bool:
+    """Check whether the optional h2 package needed for HTTP/2 is installed."""
+    return importlib.util.find_spec("h2") is not None
+
+
+def _create_http_client() -> httpx.Client:
+    """Create the pooled keep-alive HTTP client from the UPSTREAM_POOL_* settings."""
+    http2 = settings.UPSTREAM_HTTP2
+    if http2 and not _is_http2_available():
+        logger.warning("UPSTREAM_HTTP2 is enabled but h2 is not installed, falling back to HTTP/1.1")
+        http2 = False
+
+    return httpx.Client(
+        http2=http2,
+        limits=httpx.Limits(
+            max_connections=settings.UPSTREAM_POOL_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.UPSTREAM_POOL_MAX_KEEPALIVE,
+            keepalive_expiry=settings.UPSTREAM_POOL_KEEPALIVE_EXPIRY_SECONDS,
+        ),
+        timeout=httpx.Timeout(
+            settings.UPSTREAM_TIMEOUT_SECONDS,
+            pool=settings.UPSTREAM_POOL_TIMEOUT_SECONDS,
+        ),
+    )
+
+
+def get_http_client() -> httpx.Client:
+    """Get the shared pooled HTTP client, creating it on first use.
+
+    httpx.Client is thread-safe, so user sessions, the service account and
+    crawls running in worker threads all reuse the same TCP/TLS connections.
+    Auth headers are never stored on the shared client; each request layer
+    passes its own per request.
+
+    Returns:
+        The shared httpx.Client
+    """
+    global _client
+    with _lock:
+        if _client is None or _client.is_closed:
+            _client = _create_http_client()
+        return _client
+
+
+def close_http_client() -> None:
+    """Close the shared HTTP client and all pooled connections."""
+    global _client
+    with _lock:
+        if _client is not None:
+            _client.close()
+            _client = None
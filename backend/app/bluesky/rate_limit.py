@@ -0,0 +1,186 @@
+"""Adaptive upstream rate limiting driven by Bluesky rate-limit response headers."""
+
+import random
+import threading
+import time
+from collections.abc import Mapping
+from dataclasses import dataclass
+
+from app.core.config import get_settings
+from app.models.metrics import UpstreamMetrics
+
+
+settings = get_settings()
+
+RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+
+def _parse_float(value: str | None) -> float | None:
+    """Parse a numeric header value, ignoring malformed values."""
+    if value is None:
+        return None
+    try:
+        return float(value.split(",")[0].strip())
+    except ValueError:
+        return None
+
+
+# Identifies one upstream budget: (DID of the session, or None for unauthenticated calls, XRPC method)
+BudgetKey = tuple[str | None, str]
+
+
+@dataclass
+class _Budget:
+    """Rate-limit state reported for one session and route."""
+
+    limit: int | None = None
+    remaining: int | None = None
+    reset_at: float | None = None
+    blocked_until: float = 0.0
+    next_request_at: float = 0.0
+
+    def pacing_interval(self, now: float) -> float:
+        """Spacing between requests needed to make the remaining budget last."""
+        if self.limit is None or self.remaining is None or self.reset_at is None or self.reset_at <= now:
+            return 0.0
+        if self.remaining > self.limit * settings.UPSTREAM_PACING_THRESHOLD:
+            return 0.0
+        return (self.reset_at - now) / max(self.remaining, 1)
+
+    def is_expired(self, now: float) -> bool:
+        """Check whether the budget no longer holds back any request."""
+        return (self.reset_at is None or self.reset_at <= now) and max(self.blocked_until, self.next_request_at) <= now
+
+
+class UpstreamRateLimiter:
+    """Paces upstream requests so each advertised budget lasts until its window resets.
+
+    Bluesky reports its budget with RateLimit-Limit, RateLimit-Remaining and
+    RateLimit-Reset (epoch seconds) headers. Budgets are tracked per session and
+    XRPC method, so one account's exhausted budget never slows down another
+    account or another route. While plenty of budget remains, requests go out
+    unthrottled. Below UPSTREAM_PACING_THRESHOLD of the limit, requests are spaced
+    evenly over the rest of the window. After a 429, every caller of that budget
+    waits until the window resets or Retry-After passes.
+    """
+
+    def __init__(self):
+        """Initialize with no known budget."""
+        self._lock = threading.Lock()
+        self._budgets: dict[BudgetKey, _Budget] = {}
+        self._requests_total = 0
+        self._throttled_total = 0
+        self._retries_total = 0
+        self._wait_seconds_total = 0.0
+
+    def _budget(self, key: BudgetKey, now: float) -> _Budget:
+        """Get the budget of a key, dropping budgets that have expired when a new one is added."""
+        budget = self._budgets.get(key)
+        if budget is None:
+            self._budgets = {k: b for k, b in self._budgets.items() if not b.is_expired(now)}
+            budget = self._budgets[key] = _Budget()
+        return budget
+
+    def acquire(self, key: BudgetKey) -> None:
+        """Block until the next request against a budget may be sent.
+
+        Args:
+            key: Session and XRPC method of the request
+        """
+        with self._lock:
+            now = time.time()
+            budget = self._budget(key, now)
+            send_at = max(now, budget.blocked_until, budget.next_request_at)
+            budget.next_request_at = send_at + budget.pacing_interval(now)
+            self._requests_total += 1
+            wait = send_at - now
+            self._wait_seconds_total += wait
+        if wait > 0:
+            time.sleep(wait)
+
+    def observe(self, key: BudgetKey, status_code: int, headers: Mapping[str, str]) -> None:
+        """Update a budget from a response.
+
+        Args:
+            key: Session and XRPC method of the request
+            status_code: HTTP status code of the response
+            headers: Response headers (case-insensitive mapping)
+        """
+        limit = _parse_float(headers.get("ratelimit-limit"))
+        remaining = _parse_float(headers.get("ratelimit-remaining"))
+        reset_at = _parse_float(headers.get("ratelimit-reset"))
+        with self._lock:
+            budget = self._budget(key, time.time())
+            if limit is not None:
+                budget.limit = int(limit)
+            if remaining is not None:
+                budget.remaining = int(remaining)
+            if reset_at is not None:
+                budget.reset_at = reset_at
+            if status_code == 429:
+                self._throttled_total += 1
+                delay = self.retry_after(status_code, headers, attempt=0)
+                budget.blocked_until = max(budget.blocked_until, time.time() + delay)
+
+    def retry_after(self, status_code: int | None, headers: Mapping[str, str], attempt: int) -> float:
+        """Compute how long to wait before retrying a failed request.
+
+        Bluesky sends RateLimit-* headers on every response, so RateLimit-Reset
+        only says when to retry a 429; Retry-After is honoured for 429 and 503.
+        Every other failure uses exponential backoff with full jitter.
+
+        Args:
+            status_code: HTTP status code of the failed response, None for transport errors
+            headers: Headers of the failed response, empty for transport errors
+            attempt: Zero-based retry attempt
+
+        Returns:
+            Seconds to wait, capped at UPSTREAM_MAX_BACKOFF_SECONDS
+        """
+        retry_after = None
+        if status_code in (429, 503):
+            retry_after = _parse_float(headers.get("retry-after"))
+        if retry_after is None and status_code == 429:
+            reset_at = _parse_float(headers.get("ratelimit-reset"))
+            if reset_at is not None:
+                retry_after = reset_at - time.time()
+        if retry_after is None or retry_after <= 0:
+            retry_after = random.uniform(0, settings.UPSTREAM_BACKOFF_BASE_SECONDS * 2**attempt)
+        return min(retry_after, settings.UPSTREAM_MAX_BACKOFF_SECONDS)
+
+    def record_retry(self, delay: float) -> None:
+        """Count a retry and the time spent waiting for it.
+
+        Args:
+            delay: Seconds slept before the retry
+        """
+        with self._lock:
+            self._retries_total += 1
+            self._wait_seconds_total += delay
+
+    def metrics(self) -> UpstreamMetrics:
+        """Get a snapshot of the most constrained upstream budget and the limiter counters.
+
+        Returns:
+            UpstreamMetrics
+        """
+        with self._lock:
+            now = time.time()
+            budgets = [budget for budget in self._budgets.values() if not budget.is_expired(now)]
+            known = [budget for budget in budgets if budget.remaining is not None]
+            tightest = min(known, key=lambda budget: budget.remaining / max(budget.limit or 1, 1), default=None)
+            reset_at = tightest.reset_at if tightest else None
+            return UpstreamMetrics(
+                limit=tightest.limit if tightest else None,
+                remaining=tightest.remaining if tightest else None,
+                reset_in_seconds=None if reset_at is None else max(reset_at - now, 0.0),
+                pacing_interval_seconds=tightest.pacing_interval(now) if tightest else 0.0,
+                budgets=len(budgets),
+                requests_total=self._requests_total,
+                throttled_total=self._throttled_total,
+                retries_total=self._retries_total,
+                wait_seconds_total=self._wait_seconds_total,
+            )
+
+
+upstream_rate_limiter = UpstreamRateLimiter()
@@ -0,0 +1,78 @@
+"""Rate-limit-aware request layer for atproto clients."""
+
+# _handle_request_errors and _handle_response are private atproto_client helpers, used so retried
+# requests raise the same atproto exceptions as the stock request layer; atproto is pinned in
+# requirements.txt because they may change between releases
+import time
+
+import httpx
+from atproto_client.request import Request, RequestBase, _handle_request_errors, _handle_response
+from atproto_server.auth.jwt import get_jwt_payload
+
+from app.bluesky.http_pool import get_http_client
+from app.bluesky.rate_limit import RETRYABLE_STATUS_CODES, upstream_rate_limiter
+from app.core.config import get_settings
+from app.core.logger import setup_logger
+
+
+logger = setup_logger(__name__)
+settings = get_settings()
+
+
+class UpstreamRequest(Request):
+    """atproto request layer that paces calls by their upstream budget.
+
+    Every request waits for the shared limiter and reports the rate-limit headers
+    it receives, under the budget of its session (the DID the access token was
+    issued to) and XRPC method. Idempotent reads (GET) that hit a 429, a 5xx or a transport error
+    are retried with jittered backoff up to UPSTREAM_MAX_RETRIES times. Writes are
+    paced but never retried.
+
+    All instances send through the shared connection pool; the session's auth
+    headers live on the instance and are attached to each request.
+    """
+
+    def __init__(self):
+        """Initialize without creating a private httpx.Client."""
+        RequestBase.__init__(self)
+        self._session_did: str | None = None
+
+    def set_additional_headers(self, headers: dict[str, str]) -> None:
+        """Set the session's auth headers and remember which account they belong to."""
+        super().set_additional_headers(headers)
+        token = headers.get("Authorization", "").removeprefix("Bearer ")
+        try:
+            self._session_did = get_jwt_payload(token).sub if token else None
+        except Exception:
+            self._session_did = None
+
+    def close(self) -> None:
+        """Leave the shared pool open; it is closed on application shutdown."""
+
+    def _send_request(self, method: str, url: str, **kwargs: object) -> httpx.Response:
+        headers = self.get_headers(kwargs.pop("headers", None))
+        is_idempotent = method == "GET"
+        budget = (self._session_did, url.rsplit("/", 1)[-1])
+
+        attempt = 0
+        while True:
+            can_retry = is_idempotent and attempt < settings.UPSTREAM_MAX_RETRIES
+            upstream_rate_limiter.acquire(budget)
+            try:
+                response = get_http_client().request(method=method, url=url, headers=headers, **kwargs)
+            except httpx.TransportError as e:
+                if not can_retry:
+                    _handle_request_errors(e)
+                    raise
+                delay = upstream_rate_limiter.retry_after(None, {}, attempt)
+                logger.warning(f"Upstream {method} {url} failed ({e!s}), retrying in {delay:.2f}s")
+            else:
+                upstream_rate_limiter.observe(budget, response.status_code, response.headers)
+                if response.status_code not in RETRYABLE_STATUS_CODES or not can_retry:
+                    return _handle_response(response)
+                delay = upstream_rate_limiter.retry_after(response.status_code, response.headers, attempt)
+                logger.warning(f"Upstream {method} {url} returned {response.status_code}, retrying in {delay:.2f}s")
+
+            upstream_rate_limiter.record_retry(delay)
+            time.sleep(delay)
+            attempt += 1
@@ -0,0 +1,236 @@
+"""Admission control for expensive recommendation strategies.
+
+Each strategy gets a gate that lets a fixed number of requests compute at once.
+Requests beyond that wait in a bounded queue for at most
+ADMISSION_QUEUE_TIMEOUT_SECONDS; when the queue (or the user's share of it) is
+full they are rejected straight away, so the router can answer 429 with a
+Retry-After estimate instead of piling more crawls onto upstream.
+
+Freed slots are handed to waiting users in round-robin order, so one user
+firing many requests cannot starve everyone else queued behind them. Gates are
+per worker process: the effective limit of a deployment is the per-worker
+limit times the number of workers.
+"""
+
+import asyncio
+import math
+import time
+from collections import OrderedDict, deque
+from collections.abc import AsyncIterator
+from contextlib import AbstractAsyncContextManager, asynccontextmanager
+from functools import lru_cache
+
+from app.core.config import get_settings
+from app.models.metrics import AdmissionMetrics, StrategyAdmissionMetrics
+
+
+class AdmissionRejectedError(Exception):
+    """Raised when a request cannot be admitted now and should be retried later."""
+
+    def __init__(self, strategy: str, reason: str, retry_after: int):
+        """Initialize the rejection.
+
+        Args:
+            strategy: Strategy whose gate rejected the request
+            reason: Why the request was rejected
+            retry_after: Suggested seconds to wait before retrying
+        """
+        super().__init__(f"{strategy} admission rejected: {reason}")
+        self.strategy = strategy
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class StrategyGate:
+    """Concurrency limit with a bounded, per-user fair wait queue for one strategy."""
+
+    def __init__(self, strategy: str, max_concurrency: int, max_queue: int, max_queued_per_user: int, timeout: float):
+        """Initialize the gate.
+
+        Args:
+            strategy: Strategy name, used in errors and logs
+            max_concurrency: Requests allowed to compute at once
+            max_queue: Requests allowed to wait for a slot
+            max_queued_per_user: Requests one user may have waiting at once
+            timeout: Seconds a request may wait before it is rejected
+        """
+        self.strategy = strategy
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.max_queued_per_user = max_queued_per_user
+        self.timeout = timeout
+        self.active = 0
+        self._waiters: OrderedDict[str, deque[asyncio.Future]] = OrderedDict()
+        self._queued = 0
+        self._metrics = StrategyAdmissionMetrics(max_concurrency=max_concurrency, max_queue=max_queue)
+        # Moving average of how long admitted requests hold a slot, for Retry-After estimates
+        self._service_seconds = 1.0
+
+    def _retry_after(self) -> int:
+        """Estimate how long until a retry would likely be admitted."""
+        waves = (self._queued + 1) / self.max_concurrency
+        return max(1, math.ceil(waves * self._service_seconds))
+
+    def _reject(self, reason: str, counter: str) -> AdmissionRejectedError:
+        """Count and build a rejection."""
+        setattr(self._metrics, counter, getattr(self._metrics, counter) + 1)
+        return AdmissionRejectedError(self.strategy, reason, self._retry_after())
+
+    def _enqueue(self, user: str) -> asyncio.Future:
+        """Add a waiter for a user, or raise if the queue or the user's share of it is full."""
+        if self._queued >= self.max_queue:
+            raise self._reject("queue full", "rejected_total")
+        if len(self._waiters.get(user, ())) >= self.max_queued_per_user:
+            raise self._reject("too many queued requests for this user", "rejected_total")
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.setdefault(user, deque()).append(waiter)
+        self._queued += 1
+        self._metrics.queue_depth_max = max(self._metrics.queue_depth_max, self._queued)
+        return waiter
+
+    def _dequeue(self, user: str, waiter: asyncio.Future) -> None:
+        """Remove a waiter that gave up."""
+        waiters = self._waiters.get(user)
+        if waiters and waiter in waiters:
+            waiters.remove(waiter)
+            self._queued -= 1
+            if not waiters:
+                del self._waiters[user]
+
+    def _next_waiter(self) -> asyncio.Future | None:
+        """Pop the oldest waiter of the next user in round-robin order."""
+        while self._waiters:
+            user, waiters = self._waiters.popitem(last=False)
+            waiter = waiters.popleft()
+            self._queued -= 1
+            if waiters:
+                # The user goes to the back of the rotation
+                self._waiters[user] = waiters
+            if not waiter.done():
+                return waiter
+        return None
+
+    async def _acquire(self, user: str) -> None:
+        """Take a slot, waiting in the queue if none is free."""
+        if self.active < self.max_concurrency and not self._queued:
+            self.active += 1
+            return
+
+        waiter = self._enqueue(user)
+        started = time.perf_counter()
+        try:
+            await asyncio.wait({waiter}, timeout=self.timeout)
+        except asyncio.CancelledError:
+            self._abandon(user, waiter)
+            raise
+        self._metrics.wait_seconds_total += time.perf_counter() - started
+        self._metrics.wait_seconds_max = max(self._metrics.wait_seconds_max, time.perf_counter() - started)
+        if not waiter.done():
+            self._abandon(user, waiter)
+            raise self._reject(f"no slot within {self.timeout:g}s", "timed_out_total")
+
+    def _abandon(self, user: str, waiter: asyncio.Future) -> None:
+        """Give up waiting, passing on the slot if it was handed over in the meantime."""
+        if waiter.done() and not waiter.cancelled():
+            self._release()
+            return
+        waiter.cancel()
+        self._dequeue(user, waiter)
+
+    def _release(self) -> None:
+        """Hand the slot to the next waiting user, or free it."""
+        waiter = self._next_waiter()
+        if waiter:
+            waiter.set_result(None)
+        else:
+            self.active -= 1
+
+    @asynccontextmanager
+    async def admit(self, user: str) -> AsyncIterator[None]:
+        """Hold a slot of this gate for the duration of the block.
+
+        Args:
+            user: DID of the requesting user, used for fairness
+
+        Raises:
+            AdmissionRejectedError: If the queue is full or no slot frees up in time
+        """
+        await self._acquire(user)
+        self._metrics.admitted_total += 1
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._service_seconds = 0.8 * self._service_seconds + 0.2 * (time.perf_counter() - started)
+            self._release()
+
+    def metrics(self) -> StrategyAdmissionMetrics:
+        """Snapshot the gate's state and counters.
+
+        Returns:
+            StrategyAdmissionMetrics for this gate
+        """
+        return self._metrics.model_copy(update={"active": self.active, "queue_depth": self._queued})
+
+
+class AdmissionController:
+    """Admission gates of every strategy, created on first use."""
+
+    def __init__(self):
+        """Initialize the controller from the admission settings."""
+        settings = get_settings()
+        self._limits = settings.admission_strategy_concurrency
+        self._default_concurrency = settings.ADMISSION_DEFAULT_CONCURRENCY
+        self._max_queue = settings.ADMISSION_MAX_QUEUE
+        self._max_queued_per_user = settings.ADMISSION_MAX_QUEUED_PER_USER
+        self._timeout = settings.ADMISSION_QUEUE_TIMEOUT_SECONDS
+        self._gates: dict[str, StrategyGate] = {}
+
+    def gate(self, strategy: str) -> StrategyGate:
+        """Get the gate of a strategy.
+
+        Args:
+            strategy: Recommendation strategy
+
+        Returns:
+            The strategy's gate
+        """
+        if strategy not in self._gates:
+            concurrency = self._limits.get(strategy, self._default_concurrency)
+            self._gates[strategy] = StrategyGate(
+                strategy, concurrency, self._max_queue, self._max_queued_per_user, self._timeout
+            )
+        return self._gates[strategy]
+
+    def admit(self, strategy: str, user: str) -> AbstractAsyncContextManager[None]:
+        """Hold a slot of a strategy's gate for the duration of an `async with` block.
+
+        Args:
+            strategy: Recommendation strategy
+            user: DID of the requesting user
+
+        Returns:
+            Async context manager holding the slot
+
+        Raises:
+            AdmissionRejectedError: If the request cannot be admitted
+        """
+        return self.gate(strategy).admit(user)
+
+    def metrics(self) -> AdmissionMetrics:
+        """Snapshot every gate.
+
+        Returns:
+            AdmissionMetrics keyed by strategy
+        """
+        return AdmissionMetrics(strategies={name: gate.metrics() for name, gate in self._gates.items()})
+
+
+@lru_cache
+def get_admission_controller() -> AdmissionController:
+    """Get this worker's admission controller.
+
+    Returns:
+        AdmissionController: Controller configured from the ADMISSION_* settings
+    """
+    return AdmissionController()
@@ -13,12 +13,76 @@ class Settings(BaseSettings):
         BLUESKY_API_URL: Blue Sky API base URL
         BLUESKY_IDENTIFIER: Blue Sky user identifier
         BLUESKY_PASSWORD: Blue Sky user password
+        LOG_FORMAT: Log output format, "text" or "json" (one object per line)
+        LOG_RATE_LIMIT_PER_SECOND: Warnings and below each logging call site may emit per second, 0 to disable
+        LOG_RATE_LIMIT_BURST: Warnings and below each logging call site may emit back to back
         DEBUG: Debug mode flag
         CORS_ORIGINS: List of allowed CORS origins
         JWT_SECRET_KEY: JWT secret key
         JWT_ALGORITHM: JWT algorithm
         ACCESS_TOKEN_EXPIRE_MINUTES: Access token expiration minutes
         REFRESH_TOKEN_EXPIRE_MINUTES: Refresh token expiration minutes
+        CRAWL_STORE_PATH: Path of the SQLite database holding crawl checkpoints
+        CRAWL_PAGE_SIZE: Page size requested from paginated graph endpoints
+        CRAWL_MAX_AGE_SECONDS: Age after which a completed or interrupted crawl is re-walked
+        CRAWL_VIEWER_MAX_AGE_SECONDS: Age after which a crawl of the logged-in user's own follows is re-walked
+        GRAPH_SNAPSHOT_DIR: Directory of memory-mapped follow graph snapshots
+        GRAPH_SNAPSHOT_KEEP: Number of snapshot versions kept on disk
+        GRAPH_SNAPSHOT_EXPORT_ON_SHUTDOWN: Whether the app exports a snapshot of the crawl store on shutdown
+        GRAPH_SHARDS: Worker processes the published snapshot is partitioned across by DID, 0 to map it in-process
+        GRAPH_SHARD_REPLICAS: Virtual points per shard on the consistent hash ring
+        STATE_BACKEND: Shared state backend ("memory", "sqlite" or "shared_memory")
+        STATE_SQLITE_PATH: Path of the SQLite database used by the "sqlite" backend
+        STATE_SHM_DIR: tmpfs directory used by the "shared_memory" backend
+        STATE_PURGE_INTERVAL_SECONDS: Interval between sweeps deleting expired state entries
+        RESULT_CACHE_TTL_SECONDS: Time to live of cached recommendation responses
+        NEGATIVE_CACHE_TTL_SECONDS: Time to live of cached unresolvable-profile lookups
+        UPSTREAM_MAX_RETRIES: Retries for idempotent upstream reads that hit 429, 5xx or transport errors
+        UPSTREAM_BACKOFF_BASE_SECONDS: Base delay of the jittered exponential backoff
+        UPSTREAM_MAX_BACKOFF_SECONDS: Upper bound on any single retry or rate-limit wait
+        UPSTREAM_PACING_THRESHOLD: Fraction of the rate-limit budget below which requests are paced
+        UPSTREAM_POOL_MAX_CONNECTIONS: Maximum open connections in the shared upstream HTTP pool
+        UPSTREAM_POOL_MAX_KEEPALIVE: Maximum idle keep-alive connections kept in the pool
+        UPSTREAM_POOL_KEEPALIVE_EXPIRY_SECONDS: Idle time after which a pooled connection is closed
+        UPSTREAM_POOL_TIMEOUT_SECONDS: Time to wait for a free pooled connection
+        UPSTREAM_TIMEOUT_SECONDS: Connect, read and write timeout of upstream requests
+        UPSTREAM_HTTP2: Whether to use HTTP/2 upstream (requires the h2 package)
+        COMMON_FOLLOWERS_SEED_ACCOUNTS: Comma-separated seed accounts for the common_followers strategy
+        COMMON_FOLLOWERS_COUNTING: "exact" or "approximate" (fixed-memory SpaceSaving) candidate counting
+        COMMON_FOLLOWERS_SKETCH_CAPACITY: Candidates tracked by approximate counting; candidates followed by
+            more than total seed follows / capacity seeds are never missed
+        FOLLOW_BACK_MAX_CANDIDATES: Most recent unreciprocated followers ranked by the follow_back strategy
+        FOLLOW_BACK_CRAWL_CONCURRENCY: Concurrent candidate follow crawls when counting mutual connections
+        GRAPH_SET_TTL_SECONDS: Time to live of stored follower/follow sets used for incremental syncs
+        SUGGESTION_POOL_TTL_SECONDS: Time to live of a user's cached pool of hydrated suggestions
+        SUGGESTION_POOL_MIN_SIZE: Suggestions pooled for the basic strategy even when fewer are requested
+        SUGGESTION_POOL_MAX_PAGES: Maximum getSuggestions pages fetched by one request
+        SUGGESTION_PAGE_SIZE: Suggestions requested per getSuggestions page (at most 100)
+        NETWORK_STATE_PATH: Path of the SQLite database holding per-user network strategy counts
+        NETWORK_MAX_FOLLOWS: Most recent follows of a user whose follow lists the network strategy counts
+        NETWORK_MIN_COUNT: Minimum number of counted follows that must follow a network candidate
+        NETWORK_MAX_CANDIDATES: Highest-counted candidates hydrated by the network strategy
+        NETWORK_CRAWL_CONCURRENCY: Concurrent follow crawls when updating network counts
+        EMBEDDING_ENABLED: Whether the app builds the follow-graph embedding index in the background
+        EMBEDDING_DIM: Dimension of the truncated SVD account embeddings
+        EMBEDDING_MIN_FOLLOWERS: Crawled followers an account needs to be embedded
+        EMBEDDING_IVF_LISTS: Inverted lists of the nearest-neighbour index, 0 for sqrt(accounts)
+        EMBEDDING_N_PROBE: Inverted lists scanned per query, trading latency for recall
+        EMBEDDING_MAX_CANDIDATES: Nearest accounts hydrated by the embedding strategy
+        EMBEDDING_REBUILD_INTERVAL_SECONDS: Interval between checks for graph changes that trigger a rebuild
+        PRECOMPUTE_STORE_PATH: Path of the SQLite database holding precomputed recommendations
+        PRECOMPUTE_MAX_AGE_SECONDS: Age after which precomputed recommendations are no longer served
+        PRECOMPUTE_MAX_RESULTS: Recommendations stored per user and strategy by the precompute job
+        PRECOMPUTE_WORKERS: Concurrent users processed by the precompute job
+        ADMISSION_STRATEGY_CONCURRENCY: Comma-separated strategy=limit pairs of concurrent live computations per worker
+        ADMISSION_DEFAULT_CONCURRENCY: Concurrent live computations per worker for strategies not listed above
+        ADMISSION_MAX_QUEUE: Requests per strategy allowed to wait for a free slot
+        ADMISSION_MAX_QUEUED_PER_USER: Requests per strategy one user may have waiting at once
+        ADMISSION_QUEUE_TIMEOUT_SECONDS: Time a request may wait for a slot before it is rejected with 429
+        SCHEDULER_WORKERS: Crawl and hydration jobs per worker process allowed to run at once
+        SCHEDULER_INTERACTIVE_RESERVED: Scheduler workers kept free of background jobs for user requests
+        WARMUP_PRELOAD_SEEDS: Whether startup crawls the seed graphs with the service account
+        WARMUP_MAX_SESSIONS: Maximum number of persisted sessions restored at startup
     """
 
     API_V1_STR: str
@@ -26,11 +90,74 @@ class Settings(BaseSettings):
     BLUESKY_IDENTIFIER: str
     BLUESKY_PASSWORD: str
     DEBUG: bool = False
+    LOG_FORMAT: str = "text"
+    LOG_RATE_LIMIT_PER_SECOND: float = 20.0
+    LOG_RATE_LIMIT_BURST: int = 100
     CORS_ORIGINS: str
     JWT_SECRET_KEY: str
     JWT_ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     REFRESH_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 7  # 7 days
+    CRAWL_STORE_PATH: str = "data/crawls.sqlite3"
+    CRAWL_PAGE_SIZE: int = 100
+    CRAWL_MAX_AGE_SECONDS: int = 60 * 60 * 24  # 1 day
+    CRAWL_VIEWER_MAX_AGE_SECONDS: int = 60
+    GRAPH_SNAPSHOT_DIR: str = "data/graph_snapshots"
+    GRAPH_SNAPSHOT_KEEP: int = 2
+    GRAPH_SNAPSHOT_EXPORT_ON_SHUTDOWN: bool = True
+    GRAPH_SHARDS: int = 0
+    GRAPH_SHARD_REPLICAS: int = 64
+    STATE_BACKEND: str = "memory"
+    STATE_SQLITE_PATH: str = "data/state.sqlite3"
+    STATE_SHM_DIR: str = "/dev/shm/bsky-recommender"
+    STATE_PURGE_INTERVAL_SECONDS: int = 600
+    RESULT_CACHE_TTL_SECONDS: int = 300
+    NEGATIVE_CACHE_TTL_SECONDS: int = 60 * 60 * 6  # 6 hours
+    UPSTREAM_MAX_RETRIES: int = 4
+    UPSTREAM_BACKOFF_BASE_SECONDS: float = 0.5
+    UPSTREAM_MAX_BACKOFF_SECONDS: float = 60.0
+    UPSTREAM_PACING_THRESHOLD: float = 0.5
+    UPSTREAM_POOL_MAX_CONNECTIONS: int = 100
+    UPSTREAM_POOL_MAX_KEEPALIVE: int = 20
+    UPSTREAM_POOL_KEEPALIVE_EXPIRY_SECONDS: float = 30.0
+    UPSTREAM_POOL_TIMEOUT_SECONDS: float = 10.0
+    UPSTREAM_TIMEOUT_SECONDS: float = 5.0
+    UPSTREAM_HTTP2: bool = False
+    COMMON_FOLLOWERS_SEED_ACCOUNTS: str = "togelius.bsky.social,hamel.bsky.social,karpathy.bsky.social"
+    COMMON_FOLLOWERS_COUNTING: str = "exact"
+    COMMON_FOLLOWERS_SKETCH_CAPACITY: int = 100_000
+    FOLLOW_BACK_MAX_CANDIDATES: int = 50
+    FOLLOW_BACK_CRAWL_CONCURRENCY: int = 4
+    GRAPH_SET_TTL_SECONDS: int = 60 * 60 * 24 * 7  # 7 days
+    SUGGESTION_POOL_TTL_SECONDS: int = 60 * 30  # 30 minutes
+    SUGGESTION_POOL_MIN_SIZE: int = 50
+    SUGGESTION_POOL_MAX_PAGES: int = 5
+    SUGGESTION_PAGE_SIZE: int = 100
+    NETWORK_STATE_PATH: str = "data/network_scores.sqlite3"
+    NETWORK_MAX_FOLLOWS: int = 200
+    NETWORK_MIN_COUNT: int = 2
+    NETWORK_MAX_CANDIDATES: int = 50
+    NETWORK_CRAWL_CONCURRENCY: int = 4
+    EMBEDDING_ENABLED: bool = True
+    EMBEDDING_DIM: int = 64
+    EMBEDDING_MIN_FOLLOWERS: int = 2
+    EMBEDDING_IVF_LISTS: int = 0
+    EMBEDDING_N_PROBE: int = 8
+    EMBEDDING_MAX_CANDIDATES: int = 50
+    EMBEDDING_REBUILD_INTERVAL_SECONDS: int = 600
+    PRECOMPUTE_STORE_PATH: str = "data/precomputed.sqlite3"
+    PRECOMPUTE_MAX_AGE_SECONDS: int = 60 * 60 * 6  # 6 hours
+    PRECOMPUTE_MAX_RESULTS: int = 100
+    PRECOMPUTE_WORKERS: int = 4
+    ADMISSION_STRATEGY_CONCURRENCY: str = "common_followers=4,follow_back=4,network=4,embedding=16,basic=32"
+    ADMISSION_DEFAULT_CONCURRENCY: int = 8
+    ADMISSION_MAX_QUEUE: int = 64
+    ADMISSION_MAX_QUEUED_PER_USER: int = 2
+    ADMISSION_QUEUE_TIMEOUT_SECONDS: float = 10.0
+    SCHEDULER_WORKERS: int = 16
+    SCHEDULER_INTERACTIVE_RESERVED: int = 4
+    WARMUP_PRELOAD_SEEDS: bool = True
+    WARMUP_MAX_SESSIONS: int = 100
 
     model_config = SettingsConfigDict(
         env_file=".env",
@@ -47,6 +174,34 @@ class Settings(BaseSettings):
         """
         return [origin.strip() for origin in self.CORS_ORIGINS.split(",") if origin]
 
+    @property
+    def common_followers_seed_accounts(self) -> list[str]:
+        """Parse COMMON_FOLLOWERS_SEED_ACCOUNTS string into list.
+
+        Returns:
+            list[str]: Seed account handles or DIDs
+        """
+        return [seed.strip() for seed in self.COMMON_FOLLOWERS_SEED_ACCOUNTS.split(",") if seed.strip()]
+
+    @property
+    def common_followers_sketch_capacity(self) -> int | None:
+        """Resolve COMMON_FOLLOWERS_COUNTING into the capacity of approximate counting.
+
+        Returns:
+            int | None: COMMON_FOLLOWERS_SKETCH_CAPACITY in approximate mode, None for exact counting
+        """
+        return self.COMMON_FOLLOWERS_SKETCH_CAPACITY if self.COMMON_FOLLOWERS_COUNTING == "approximate" else None
+
+    @property
+    def admission_strategy_concurrency(self) -> dict[str, int]:
+        """Parse ADMISSION_STRATEGY_CONCURRENCY "strategy=limit" pairs into a dictionary.
+
+        Returns:
+            dict[str, int]: Concurrent requests allowed per strategy
+        """
+        pairs = (pair.split("=", 1) for pair in self.ADMISSION_STRATEGY_CONCURRENCY.split(",") if "=" in pair)
+        return {strategy.strip(): int(limit) for strategy, limit in pairs}
+
 
 @lru_cache
 def get_settings() -> Settings:
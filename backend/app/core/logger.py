@@ -1,6 +1,167 @@
-"""Logging configuration and setup utilities."""
+"""Logging configuration and setup utilities.
 
+Loggers created with setup_logger never write to the stream themselves: their
+records go onto an in-memory queue, and a single background QueueListener
+thread formats and writes them, so a burst of warnings costs request threads
+an enqueue each rather than a blocking write. Output is plain text or one JSON
+object per line (LOG_FORMAT). Each call site is rate limited with a token
+bucket (LOG_RATE_LIMIT_PER_SECOND, LOG_RATE_LIMIT_BURST) below ERROR level;
+suppressed records are counted and reported on the next record that passes.
+"""
+
+import atexit
+import copy
 import logging
+import os
+import queue
+import threading
+import time
+from datetime import UTC, datetime
+from logging.handlers import QueueHandler, QueueListener
+
+import orjson
+
+
+TEXT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+_lock = threading.Lock()
+_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+_listener: QueueListener | None = None
+_rate_limit_filter: "RateLimitFilter | None" = None
+
+
+class JsonFormatter(logging.Formatter):
+    """Formats records as single-line JSON objects."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        """Format a record as JSON.
+
+        Args:
+            record: Log record to format
+
+        Returns:
+            JSON object with time, level, logger and message, plus exception and suppressed count if present
+        """
+        entry = {
+            "time": datetime.fromtimestamp(record.created, UTC).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        if getattr(record, "suppressed", 0):
+            entry["suppressed"] = record.suppressed
+        return orjson.dumps(entry).decode()
+
+
+class _QueueHandler(QueueHandler):
+    """Queue handler that renders the message in the caller but leaves formatting to the listener."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """Make a picklable copy of a record with its message and traceback rendered.
+
+        Args:
+            record: Log record
+
+        Returns:
+            Copy of the record with args merged into the message and exc_text set
+        """
+        record = copy.copy(record)
+        record.msg = record.message = record.getMessage()
+        if record.exc_info and not record.exc_text:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record.args = None
+        record.exc_info = None
+        return record
+
+
+class RateLimitFilter(logging.Filter):
+    """Token-bucket rate limit per logging call site for records below ERROR."""
+
+    def __init__(self, rate: float, burst: int):
+        """Initialize the filter.
+
+        Args:
+            rate: Records per second each call site may emit once its burst is spent, 0 to disable
+            burst: Records each call site may emit back to back
+        """
+        super().__init__()
+        self.rate = rate
+        self.burst = burst
+        self._lock = threading.Lock()
+        # Call site -> (tokens, last refill time, records suppressed since the last one emitted)
+        self._buckets: dict[tuple[str, int], tuple[float, float, int]] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        """Decide whether a record is emitted.
+
+        Args:
+            record: Log record
+
+        Returns:
+            True if the record should be emitted
+        """
+        if self.rate <= 0 or record.levelno >= logging.ERROR:
+            return True
+        site = (record.pathname, record.lineno)
+        now = time.monotonic()
+        with self._lock:
+            tokens, refilled_at, suppressed = self._buckets.get(site, (self.burst, now, 0))
+            tokens = min(self.burst, tokens + (now - refilled_at) * self.rate)
+            if tokens < 1:
+                self._buckets[site] = (tokens, now, suppressed + 1)
+                return False
+            self._buckets[site] = (tokens - 1, now, 0)
+        if suppressed:
+            record.suppressed = suppressed
+            record.msg = f"{record.msg} (suppressed {suppressed} similar messages)"
+        return True
+
+
+def _logging_settings() -> tuple[str, float, int]:
+    """Read LOG_FORMAT, LOG_RATE_LIMIT_PER_SECOND and LOG_RATE_LIMIT_BURST.
+
+    Falls back to text output with the default limits when the settings cannot
+    be loaded (e.g. a script run without a .env), so logging never breaks imports.
+    """
+    from app.core.config import Settings, get_settings
+
+    try:
+        settings = get_settings()
+    except Exception:
+        defaults = Settings.model_fields
+        return (
+            defaults["LOG_FORMAT"].default,
+            defaults["LOG_RATE_LIMIT_PER_SECOND"].default,
+            defaults["LOG_RATE_LIMIT_BURST"].default,
+        )
+    return settings.LOG_FORMAT, settings.LOG_RATE_LIMIT_PER_SECOND, settings.LOG_RATE_LIMIT_BURST
+
+
+def _start_listener() -> None:
+    """Start the background writer and the shared rate limit filter once per process."""
+    global _listener, _rate_limit_filter
+    log_format, rate, burst = _logging_settings()
+    handler = logging.StreamHandler()
+    handler.setFormatter(JsonFormatter() if log_format == "json" else logging.Formatter(TEXT_FORMAT))
+    _rate_limit_filter = RateLimitFilter(rate, burst)
+    _listener = QueueListener(_queue, handler, respect_handler_level=True)
+    _listener.start()
+    # Flush queued records on interpreter exit
+    atexit.register(_listener.stop)
+
+
+def _restart_in_child() -> None:
+    """Restart the writer in a forked child process, which does not inherit the listener thread."""
+    global _listener
+    if _listener is not None:
+        _listener = QueueListener(_queue, *_listener.handlers, respect_handler_level=True)
+        _listener.start()
+        atexit.register(_listener.stop)
+
+
+os.register_at_fork(after_in_child=_restart_in_child)
 
 
 def setup_logger(name: str) -> logging.Logger:
@@ -14,13 +175,13 @@ def setup_logger(name: str) -> logging.Logger:
     """
     logger = logging.getLogger(name)
 
-    if not logger.handlers:
-        handler = logging.StreamHandler()
-        formatter = logging.Formatter(
-            "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-        )
-        handler.setFormatter(formatter)
-        logger.addHandler(handler)
-        logger.setLevel(logging.INFO)
+    with _lock:
+        if _listener is None:
+            _start_listener()
+        if not logger.handlers:
+            handler = _QueueHandler(_queue)
+            handler.addFilter(_rate_limit_filter)
+            logger.addHandler(handler)
+            logger.setLevel(logging.INFO)
 
     return logger
@@ -0,0 +1,115 @@
+"""Fast JSON serialization and conditional response helpers."""
+
+import hashlib
+from collections.abc import Iterable
+from datetime import datetime
+from typing import TYPE_CHECKING
+
+import orjson
+
+from app.models.recommendations import RecommendationSource
+
+
+if TYPE_CHECKING:
+    from atproto import models as bsky_models
+
+
+def compute_etag(*parts: str) -> str:
+    """Compute a weak ETag from ordered string parts.
+
+    The tag identifies the ranking, not the exact bytes: precomputed and live
+    bodies with the same ranked DIDs differ in source, generated_at and hydrated
+    profile fields, so they are only semantically equivalent.
+
+    Args:
+        parts: Ordered values identifying the response body (e.g. strategy and ranked DIDs)
+
+    Returns:
+        Weak ETag header value (W/"...")
+    """
+    digest = hashlib.blake2b("\n".join(parts).encode(), digest_size=16).hexdigest()
+    return f'W/"{digest}"'
+
+
+def is_not_modified(if_none_match: str | None, etag: str) -> bool:
+    """Check an If-None-Match header against the current ETag, using weak comparison.
+
+    Args:
+        if_none_match: Raw If-None-Match request header, if any
+        etag: Current ETag of the resource
+
+    Returns:
+        True if the client's cached representation is still current
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return etag.removeprefix("W/") in candidates
+
+
+def recommendation_items(
+    profiles: "Iterable[bsky_models.AppBskyActorDefs.ProfileViewDetailed]",
+    reason: str,
+) -> list[dict]:
+    """Convert hydrated profiles to RecommendedUser-shaped dictionaries.
+
+    Skips building intermediate RecommendedUser models; the field layout matches
+    app.models.recommendations.RecommendedUser.
+
+    Args:
+        profiles: Ranked profiles to include in the response
+        reason: Reason for recommendation shared by all profiles
+
+    Returns:
+        One dictionary per profile, in rank order
+    """
+    return [
+        {
+            "did": profile.did,
+            "handle": profile.handle,
+            "display_name": profile.display_name,
+            "avatar_url": profile.avatar,
+            "follower_count": profile.followers_count or -1,
+            "following_count": profile.follows_count or -1,
+            "reason": reason,
+        }
+        for profile in profiles
+    ]
+
+
+def serialize_recommendation_items(
+    items: list[dict],
+    generated_at: datetime,
+    source: RecommendationSource = RecommendationSource.LIVE,
+) -> bytes:
+    """Serialize recommendation dictionaries to a RecommendationsResponse JSON body.
+
+    Args:
+        items: RecommendedUser-shaped dictionaries, in rank order
+        generated_at: Time the recommendations were computed
+        source: Whether they were computed live or precomputed
+
+    Returns:
+        UTF-8 encoded JSON body
+    """
+    return orjson.dumps({"recommendations": items, "generated_at": generated_at, "source": source.value})
+
+
+def serialize_recommendations(
+    profiles: "Iterable[bsky_models.AppBskyActorDefs.ProfileViewDetailed]",
+    reason: str,
+    generated_at: datetime,
+) -> bytes:
+    """Serialize live hydrated profiles straight to a RecommendationsResponse JSON body.
+
+    Args:
+        profiles: Ranked profiles to include in the response
+        reason: Reason for recommendation shared by all profiles
+        generated_at: Time the recommendations were computed
+
+    Returns:
+        UTF-8 encoded JSON body
+    """
+    return serialize_recommendation_items(recommendation_items(profiles, reason), generated_at)
@@ -1,9 +1,9 @@
 """Dependencies for Blue Sky authentication and client management."""
 
+import asyncio
 from datetime import datetime
-from typing import Annotated
+from typing import TYPE_CHECKING, Annotated
 
-from atproto import Client
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from jose import JWTError, jwt
@@ -13,6 +13,10 @@ from app.core.config import get_settings
 from app.models.auth import UserAuth, UserProfile
 
 
+if TYPE_CHECKING:
+    from atproto import Client
+
+
 security = HTTPBearer()
 settings = get_settings()
 
@@ -44,12 +48,12 @@ async def get_current_user(
             raise ValueError("Invalid token payload")
 
         # Get cached client
-        client = BlueskyAuthManager.get_client(did)
+        client = await asyncio.to_thread(BlueskyAuthManager.get_client, did)
         if not client:
             raise ValueError("No authenticated client found")
 
         # Get current profile
-        profile = client.app.bsky.actor.get_profile({"actor": did})
+        profile = await asyncio.to_thread(client.app.bsky.actor.get_profile, {"actor": did})
 
         return UserProfile(
             did=did,
@@ -71,7 +75,7 @@ async def get_current_user(
 
 async def get_bluesky_client(
     current_user: Annotated[UserAuth, Depends(get_current_user)],
-) -> Client:
+) -> "Client":
     """Create authenticated Blue Sky client for current user.
 
     Args:
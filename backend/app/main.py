@@ -1,20 +1,67 @@
 """Main FastAPI application initialization."""
 
-from fastapi import FastAPI
+import asyncio
+import contextlib
+from collections.abc import AsyncIterator
+
+from fastapi import FastAPI, Response, status
 from fastapi.middleware.cors import CORSMiddleware
 
+from app.bluesky.http_pool import close_http_client
 from app.core.config import get_settings
-from app.routers import auth, recommendations
+from app.core.logger import setup_logger
+from app.models.readiness import ReadinessResponse
+from app.routers import auth, metrics, recommendations
+from app.services.graph.crawl_store import get_crawl_store
+from app.services.graph.embeddings import run_embedding_refresher
+from app.services.graph.sharding import close_graph_shards
+from app.services.graph.snapshot import export_snapshot
+from app.services.scheduler import close_scheduler
+from app.services.state.factory import run_state_purger
+from app.services.warmup import get_readiness, run_warmup
 
 
+logger = setup_logger(__name__)
 settings = get_settings()
 
+
+@contextlib.asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Run startup warmup, state purging and embedding index rebuilds in the background and clean up on shutdown.
+
+    Shutdown cancels any unfinished warmup and the background tasks, exports the crawled graph to a
+    snapshot for the next start, stops the scheduler and graph shard workers and closes the shared
+    upstream connection pool.
+
+    Args:
+        app: The FastAPI application
+    """
+    warmup_task = asyncio.create_task(run_warmup())
+    tasks = [warmup_task, asyncio.create_task(run_state_purger())]
+    if settings.EMBEDDING_ENABLED:
+        tasks.append(asyncio.create_task(run_embedding_refresher(after=warmup_task)))
+    yield
+    for task in tasks:
+        task.cancel()
+    with contextlib.suppress(asyncio.CancelledError):
+        await asyncio.gather(*tasks)
+    if settings.GRAPH_SNAPSHOT_EXPORT_ON_SHUTDOWN:
+        try:
+            await asyncio.to_thread(export_snapshot, get_crawl_store())
+        except Exception as e:
+            logger.error(f"Failed to export graph snapshot: {e!s}")
+    close_scheduler()
+    close_graph_shards()
+    close_http_client()
+
+
 app = FastAPI(
     title="Blue Sky Follow Recommender",
     description="API for recommending Blue Sky users to follow",
     version="0.1.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    lifespan=lifespan,
 )
 
 # Setup CORS middleware
@@ -28,6 +75,7 @@ app.add_middleware(
 
 app.include_router(auth.router)
 app.include_router(recommendations.router)
+app.include_router(metrics.router)
 
 
 @app.get("/health")
@@ -39,3 +87,23 @@ async def health_check() -> dict[str, str]:
         dict: Status message indicating the API is running
     """
     return {"status": "healthy"}
+
+
+@app.get("/ready", response_model=ReadinessResponse)
+async def readiness_check(response: Response) -> ReadinessResponse:
+    """
+    Readiness endpoint reporting whether startup warmup has finished.
+
+    Unlike /health, this returns 503 until heavy imports, stores, sessions and
+    seed graphs are loaded, so load balancers only route traffic to warm workers.
+
+    Args:
+        response: Outgoing response, used to set the status code
+
+    Returns:
+        ReadinessResponse: Warmup progress per phase
+    """
+    readiness = get_readiness()
+    if not readiness.is_ready:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return readiness
@@ -0,0 +1,33 @@
+"""Models for crawled social graph data."""
+
+from datetime import datetime
+from enum import Enum
+from typing import NamedTuple
+
+from pydantic import BaseModel, Field
+
+
+class FollowProjection(str, Enum):
+    """Shape of each account yielded by a streaming follow crawl."""
+
+    DID = "did"
+    COMPACT = "compact"
+
+
+class CompactProfile(NamedTuple):
+    """Minimal account identity kept from a follow page instead of a full ProfileView."""
+
+    did: str
+    handle: str
+    display_name: str | None
+
+
+class FollowCrawlResult(BaseModel):
+    """Result of a (possibly resumed) follow crawl for a single actor."""
+
+    actor: str = Field(..., description="Handle or DID whose follows were crawled")
+    dids: list[str] = Field(default_factory=list, description="DIDs of the followed accounts")
+    is_complete: bool = Field(False, description="Whether the cursor was walked to the end")
+    pages_fetched: int = Field(0, description="Pages fetched from upstream during this run")
+    pages_total: int = Field(0, description="Pages checkpointed for this crawl so far")
+    updated_at: datetime = Field(..., description="Time of the last checkpoint")
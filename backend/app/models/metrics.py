@@ -0,0 +1,58 @@
+"""Models for operational metrics."""
+
+from pydantic import BaseModel, Field
+
+
+class UpstreamMetrics(BaseModel):
+    """Most constrained upstream rate-limit budget and limiter counters."""
+
+    limit: int | None = Field(None, description="Requests allowed per window, as last reported upstream")
+    remaining: int | None = Field(None, description="Requests left in the current window")
+    reset_in_seconds: float | None = Field(None, description="Seconds until the window resets")
+    pacing_interval_seconds: float = Field(0.0, description="Current spacing enforced between requests")
+    budgets: int = Field(0, description="Active budgets, one per session and XRPC method")
+    requests_total: int = Field(0, description="Requests sent upstream")
+    throttled_total: int = Field(0, description="Responses with HTTP 429")
+    retries_total: int = Field(0, description="Retried idempotent requests")
+    wait_seconds_total: float = Field(0.0, description="Time spent waiting for budget or backoff")
+
+
+class StrategyAdmissionMetrics(BaseModel):
+    """Admission gate state and counters of one recommendation strategy."""
+
+    max_concurrency: int = Field(description="Requests allowed to compute at once")
+    max_queue: int = Field(description="Requests allowed to wait for a slot")
+    active: int = Field(0, description="Requests currently computing")
+    queue_depth: int = Field(0, description="Requests currently waiting for a slot")
+    queue_depth_max: int = Field(0, description="Highest queue depth seen")
+    admitted_total: int = Field(0, description="Requests admitted, immediately or after waiting")
+    rejected_total: int = Field(0, description="Requests rejected with 429 because the queue was full")
+    timed_out_total: int = Field(0, description="Requests rejected with 429 after waiting too long")
+    wait_seconds_total: float = Field(0.0, description="Time queued requests spent waiting")
+    wait_seconds_max: float = Field(0.0, description="Longest time a request spent waiting")
+
+
+class AdmissionMetrics(BaseModel):
+    """Admission control state of every strategy requested so far."""
+
+    strategies: dict[str, StrategyAdmissionMetrics] = Field(default_factory=dict)
+
+
+class PriorityMetrics(BaseModel):
+    """Scheduler state and counters of one priority class."""
+
+    running: int = Field(0, description="Jobs currently holding a worker")
+    queued: int = Field(0, description="Jobs currently waiting for a worker")
+    submitted_total: int = Field(0, description="Jobs submitted, excluding deduplicated requests")
+    completed_total: int = Field(0, description="Jobs finished, successfully or not")
+    wait_seconds_total: float = Field(0.0, description="Time started jobs spent waiting for a worker")
+
+
+class SchedulerMetrics(BaseModel):
+    """Crawl and hydration scheduler state of this worker."""
+
+    workers: int = Field(description="Jobs allowed to run at once")
+    interactive_reserved: int = Field(description="Workers background jobs may not use")
+    priorities: dict[str, PriorityMetrics] = Field(default_factory=dict)
+    deduplicated_total: int = Field(0, description="Requests that joined an already queued or running job")
+    promoted_total: int = Field(0, description="Queued background jobs promoted by an interactive request")
@@ -0,0 +1,20 @@
+"""Models for startup warmup and readiness reporting."""
+
+from pydantic import BaseModel, Field
+
+
+class WarmupPhase(BaseModel):
+    """Progress of a single startup warmup phase."""
+
+    name: str = Field(..., description="Phase name")
+    is_complete: bool = Field(False, description="Whether the phase has finished")
+    duration_ms: float | None = Field(None, description="Wall time spent in the phase")
+    detail: str | None = Field(None, description="Outcome summary or error")
+
+
+class ReadinessResponse(BaseModel):
+    """Readiness of the application to serve fast responses."""
+
+    is_ready: bool = Field(..., description="Whether every warmup phase has finished")
+    elapsed_ms: float = Field(..., description="Time since warmup started")
+    phases: list[WarmupPhase] = Field(..., description="Warmup phases in execution order")
@@ -1,8 +1,27 @@
 """Models for recommendation-related data."""
 
+from datetime import datetime
+from enum import Enum
+
 from pydantic import BaseModel, Field
 
 
+class ScoringMeasure(str, Enum):
+    """Similarity measure used to rank common-follow candidates."""
+
+    COUNT = "count"
+    JACCARD = "jaccard"
+    ADAMIC_ADAR = "adamic_adar"
+    POPULARITY = "popularity"
+
+
+class RecommendationSource(str, Enum):
+    """Where a recommendations response was computed."""
+
+    LIVE = "live"
+    PRECOMPUTED = "precomputed"
+
+
 class RecommendedUser(BaseModel):
     """Recommended user to follow."""
 
@@ -21,3 +40,7 @@ class RecommendationsResponse(BaseModel):
     recommendations: list[RecommendedUser] = Field(
         ..., description="List of recommended users"
     )
+    generated_at: datetime | None = Field(None, description="Time the recommendations were computed")
+    source: RecommendationSource = Field(
+        RecommendationSource.LIVE, description="Whether computed live or served from the precomputed store"
+    )
@@ -0,0 +1,44 @@
+"""Router for operational metrics endpoints."""
+
+from fastapi import APIRouter
+
+from app.bluesky.rate_limit import upstream_rate_limiter
+from app.core.admission import get_admission_controller
+from app.models.metrics import AdmissionMetrics, SchedulerMetrics, UpstreamMetrics
+from app.services.scheduler import get_scheduler
+
+
+router = APIRouter(prefix="/metrics", tags=["metrics"])
+
+
+@router.get("/upstream", response_model=UpstreamMetrics)
+async def get_upstream_metrics() -> UpstreamMetrics:
+    """
+    Report the remaining upstream rate-limit budget and limiter counters.
+
+    Returns:
+        UpstreamMetrics for this worker
+    """
+    return upstream_rate_limiter.metrics()
+
+
+@router.get("/admission", response_model=AdmissionMetrics)
+async def get_admission_metrics() -> AdmissionMetrics:
+    """
+    Report per-strategy concurrency, queue depth and wait times of admission control.
+
+    Returns:
+        AdmissionMetrics for this worker
+    """
+    return get_admission_controller().metrics()
+
+
+@router.get("/scheduler", response_model=SchedulerMetrics)
+async def get_scheduler_metrics() -> SchedulerMetrics:
+    """
+    Report running and queued crawl and hydration jobs per priority class.
+
+    Returns:
+        SchedulerMetrics for this worker
+    """
+    return get_scheduler().metrics()
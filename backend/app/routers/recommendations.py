@@ -1,19 +1,31 @@
+import asyncio
+from datetime import datetime
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Response, status
 
 from app.bluesky.auth import BlueskyAuthManager
+from app.core.admission import AdmissionRejectedError, get_admission_controller
+from app.core.config import get_settings
 from app.core.logger import setup_logger
+from app.core.responses import (
+    compute_etag,
+    is_not_modified,
+    serialize_recommendation_items,
+    serialize_recommendations,
+)
 from app.dependencies.bluesky import get_current_user
 from app.models.auth import UserProfile
-from app.models.recommendations import RecommendationsResponse, RecommendedUser
-from app.services.recommenders.basic import BasicRecommender
-from app.services.recommenders.common_followers import (
-    CommonFollowersRecommender,
-)
+from app.models.recommendations import RecommendationSource, RecommendationsResponse, ScoringMeasure
+from app.services.graph.incremental import get_newest_follows
+from app.services.precomputed_store import get_precomputed_store
+from app.services.recommenders.factory import STRATEGY_REASONS, create_recommender
+from app.services.result_cache import build_result_key, cache_response, get_cached_response, response_dids
+from app.services.scheduler import Priority, scheduling_priority
 
 
 logger = setup_logger(__name__)
+settings = get_settings()
 
 
 router = APIRouter(prefix="/recommendations", tags=["recommendations"])
@@ -24,23 +36,40 @@ async def get_recommendations(
     current_user: Annotated[UserProfile, Depends(get_current_user)],
     strategy: str = "basic",
     limit: int = 10,
-) -> RecommendationsResponse:
+    scoring: ScoringMeasure = ScoringMeasure.COUNT,
+    if_none_match: Annotated[str | None, Header()] = None,
+) -> Response:
     """Get personalized user recommendations.
 
+    A fresh entry written by the offline precompute job is served when one exists;
+    otherwise recommendations are computed live. The body reports which of the two
+    it came from and when it was generated. It is serialized straight from the
+    hydrated profiles and tagged with a weak ETag derived from the ranked DIDs. A
+    matching If-None-Match gets a 304 without any serialization. Accounts on the
+    newest page of the user's follows are dropped from precomputed entries, and
+    cached responses that recommend one are not served again.
+
+    Live computations go through per-strategy admission control: when too many
+    are already running and queued, the request gets a 429 with Retry-After.
+    Their crawls and hydrations are scheduled as interactive jobs, ahead of any
+    queued background prefetch.
+
     Args:
         current_user: The authenticated user's profile
-        strategy: Recommendation strategy ('basic' or 'common_followers')
+        strategy: Recommendation strategy ('basic', 'common_followers', 'follow_back', 'embedding' or 'network')
         limit: Maximum number of recommendations to return
+        scoring: Similarity measure used to rank 'common_followers' candidates
+        if_none_match: ETag of the client's cached response, if any
 
     Returns:
-        RecommendationsResponse containing list of recommended users
+        JSON RecommendationsResponse body, or an empty 304 response
 
     Raises:
-        HTTPException: If fetching recommendations fails
+        HTTPException: 429 if the strategy is saturated, 500 if fetching recommendations fails
     """
     try:
         # Get cached client
-        client = BlueskyAuthManager.get_client(current_user.did)
+        client = await asyncio.to_thread(BlueskyAuthManager.get_client, current_user.did)
         logger.info(f"Retrieved client for user: {current_user.did}")
         if not client:
             logger.error(f"No client found for user: {current_user.did}")
@@ -50,41 +79,58 @@ async def get_recommendations(
         if hasattr(client, "_session") and client._session:
             client._session.timeout = 30.0
 
-        # Choose recommender based on strategy
-        if strategy == "basic":
-            recommender = BasicRecommender()
-        elif strategy == "common_followers":
-            # Use some popular tech accounts as seeds
-            recommender = CommonFollowersRecommender(
-                seed_accounts=[
-                    "togelius.bsky.social",
-                    "hamel.bsky.social",
-                    "karpathy.bsky.social",
-                ],
-                min_common_follows=2,
-            )
-        else:
-            raise ValueError(f"Invalid recommendation strategy: {strategy}")
-
-        # Get recommendations
-        profiles = await recommender.get_recommendations(client, current_user.did)
-
-        # Convert to response format
-        recommendations = [
-            RecommendedUser(
-                did=profile.did,
-                handle=profile.handle,
-                display_name=profile.display_name,
-                avatar_url=profile.avatar,
-                follower_count=profile.followers_count or -1,
-                following_count=profile.follows_count or -1,
-                reason="Popular in your network" if strategy == "basic" else "Common connections",
-            )
-            for profile in profiles[:limit]
-        ]
-
-        return RecommendationsResponse(recommendations=recommendations)
+        # Accounts the user followed recently must not be served from responses computed before
+        with scheduling_priority(Priority.INTERACTIVE):
+            followed = await get_newest_follows(client, current_user.did) or set()
+
+        # Serve from the shared result cache when another request (on any worker) computed it recently
+        cache_key = build_result_key(current_user.did, strategy, scoring.value, str(limit))
+        cached = await asyncio.to_thread(get_cached_response, cache_key)
+        if cached and followed.isdisjoint(response_dids(cached[1])):
+            etag, body = cached
+            if is_not_modified(if_none_match, etag):
+                return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+            return Response(content=body, media_type="application/json", headers={"ETag": etag})
+
+        # Serve recommendations computed ahead of time by the precompute job while they are fresh
+        # Opening the store and reading from it both block on SQLite, so neither runs on the event loop
+        entry = await asyncio.to_thread(lambda: get_precomputed_store().get(current_user.did, strategy, scoring.value))
+        if entry and entry.age_seconds <= settings.PRECOMPUTE_MAX_AGE_SECONDS:
+            items = [item for item in entry.recommendations if item["did"] not in followed][:limit]
+            etag = compute_etag(strategy, scoring.value, STRATEGY_REASONS[strategy], *(item["did"] for item in items))
+            if is_not_modified(if_none_match, etag):
+                return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+            generated_at = datetime.fromtimestamp(entry.generated_at)
+            body = serialize_recommendation_items(items, generated_at, RecommendationSource.PRECOMPUTED)
+            await asyncio.to_thread(cache_response, cache_key, etag, body)
+            return Response(content=body, media_type="application/json", headers={"ETag": etag})
 
+        # Choose recommender based on strategy
+        recommender = create_recommender(strategy, scoring, limit)
+
+        # Get recommendations, waiting for a slot if the strategy is at its concurrency limit
+        with scheduling_priority(Priority.INTERACTIVE):
+            async with get_admission_controller().admit(strategy, current_user.did):
+                generated_at = datetime.now()
+                profiles = await recommender.get_recommendations(client, current_user.did)
+
+        ranked = profiles[:limit]
+        reason = STRATEGY_REASONS[strategy]
+        etag = compute_etag(strategy, scoring.value, reason, *(profile.did for profile in ranked))
+        if is_not_modified(if_none_match, etag):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+        body = serialize_recommendations(ranked, reason, generated_at)
+        await asyncio.to_thread(cache_response, cache_key, etag, body)
+        return Response(content=body, media_type="application/json", headers={"ETag": etag})
+
+    except AdmissionRejectedError as e:
+        logger.warning(f"Rejected {strategy} request from {current_user.did}: {e.reason}")
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=f"Too many {strategy} recommendation requests, retry later",
+            headers={"Retry-After": str(e.retry_after)},
+        ) from e
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
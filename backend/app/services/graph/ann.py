@@ -0,0 +1,89 @@
+"""Inverted-file (IVF) approximate nearest-neighbour index over unit vectors.
+
+Vectors are clustered with spherical k-means into `n_lists` inverted lists. A
+query scores the list centroids, then scans only the `n_probe` closest lists,
+so with n_lists ~ sqrt(N) a query touches O(sqrt(N)) vectors instead of all N.
+Recall is traded against latency with `n_probe`: probing every list is an
+exact search.
+"""
+
+import numpy as np
+
+
+def _nearest_centroid(vectors: np.ndarray, centroids: np.ndarray, batch_size: int = 65_536) -> np.ndarray:
+    """Assign each vector to its closest centroid, in batches to bound memory."""
+    return np.concatenate(
+        [
+            np.argmax(vectors[start : start + batch_size] @ centroids.T, axis=1)
+            for start in range(0, len(vectors), batch_size)
+        ]
+        or [np.empty(0, dtype=np.int64)]
+    )
+
+
+def _spherical_kmeans(vectors: np.ndarray, n_lists: int, n_iter: int, rng: np.random.Generator) -> np.ndarray:
+    """Cluster unit vectors by cosine similarity on a sample of at most 64 vectors per list."""
+    sample = vectors[rng.choice(len(vectors), size=min(len(vectors), n_lists * 64), replace=False)]
+    centroids = sample[rng.choice(len(sample), size=n_lists, replace=False)].copy()
+    for _ in range(n_iter):
+        assignments = _nearest_centroid(sample, centroids)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assignments, sample)
+        norms = np.linalg.norm(sums, axis=1, keepdims=True)
+        # Keep the previous centroid for lists that lost all their vectors
+        centroids = np.where(norms > 0, sums / np.maximum(norms, 1e-12), centroids)
+    return centroids.astype(np.float32)
+
+
+class IvfIndex:
+    """Approximate maximum inner product search over L2-normalized vectors."""
+
+    def __init__(self, vectors: np.ndarray, n_lists: int | None = None, n_iter: int = 10, seed: int = 0):
+        """Cluster vectors into inverted lists.
+
+        Args:
+            vectors: Float32 array of shape (N, dim) with unit-length rows
+            n_lists: Number of inverted lists, defaults to sqrt(N)
+            n_iter: Number of k-means iterations
+            seed: Random seed of the centroid initialization
+        """
+        n_lists = max(1, min(n_lists or int(np.sqrt(len(vectors))), len(vectors)))
+        self.centroids = _spherical_kmeans(vectors, n_lists, n_iter, np.random.default_rng(seed))
+
+        # Store vectors grouped by list so a probe reads one contiguous block
+        assignments = _nearest_centroid(vectors, self.centroids)
+        self.ids = np.argsort(assignments, kind="stable").astype(np.int64)
+        self.vectors = np.ascontiguousarray(vectors[self.ids])
+        self.offsets = np.concatenate([[0], np.cumsum(np.bincount(assignments, minlength=n_lists))])
+
+    @property
+    def n_lists(self) -> int:
+        """Number of inverted lists."""
+        return len(self.centroids)
+
+    def search(
+        self, query: np.ndarray, k: int, n_probe: int = 8, exclude: np.ndarray | None = None
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Find the vectors with the highest inner product with a query.
+
+        Args:
+            query: Query vector of shape (dim,)
+            k: Number of neighbours to return
+            n_probe: Number of inverted lists to scan
+            exclude: Vector ids that must not be returned
+
+        Returns:
+            Tuple of (ids, scores) of up to k neighbours, best first
+        """
+        n_probe = min(n_probe, self.n_lists)
+        lists = np.argpartition(-(self.centroids @ query), n_probe - 1)[:n_probe]
+        positions = np.concatenate([np.arange(self.offsets[i], self.offsets[i + 1]) for i in lists])
+        if exclude is not None and len(exclude):
+            positions = positions[~np.isin(self.ids[positions], exclude)]
+        if not len(positions):
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+
+        scores = self.vectors[positions] @ query
+        top = np.argpartition(-scores, min(k, len(scores)) - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return self.ids[positions[top]], scores[top]
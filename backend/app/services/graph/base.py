@@ -0,0 +1,105 @@
+"""Base classes and protocols for read-only follow graph stores."""
+
+from abc import ABC, abstractmethod
+from collections import Counter
+from collections.abc import Iterable
+from typing import Protocol
+
+from app.models.graph import FollowCrawlResult
+
+
+class GraphStoreProtocol(Protocol):
+    """Protocol defining the interface for looking up crawled follow lists."""
+
+    def get_follows(self, actor: str) -> FollowCrawlResult | None:
+        """Get the stored follows of an actor.
+
+        Args:
+            actor: Handle or DID that was crawled
+
+        Returns:
+            FollowCrawlResult with the followed DIDs, or None if the actor is not stored
+        """
+        ...
+
+    def get_follows_many(self, actors: Iterable[str]) -> dict[str, FollowCrawlResult]:
+        """Get the stored follows of several actors.
+
+        Args:
+            actors: Handles or DIDs that were crawled
+
+        Returns:
+            FollowCrawlResult of each stored actor
+        """
+        ...
+
+    def count_follows(self, actors: Iterable[str]) -> Counter[str]:
+        """Count how many of the given actors follow each account.
+
+        Args:
+            actors: Handles or DIDs whose follows are counted
+
+        Returns:
+            Number of the given actors (among those stored) following each account
+        """
+        ...
+
+    def actors(self) -> list[str]:
+        """List the actors whose follows are stored.
+
+        Returns:
+            Handles or DIDs of the stored actors
+        """
+        ...
+
+
+class BaseGraphStore(ABC):
+    """Abstract base class for graph stores."""
+
+    @abstractmethod
+    def get_follows(self, actor: str) -> FollowCrawlResult | None:
+        """Get the stored follows of an actor.
+
+        Args:
+            actor: Handle or DID that was crawled
+
+        Returns:
+            FollowCrawlResult with the followed DIDs, or None if the actor is not stored
+        """
+        pass
+
+    def get_follows_many(self, actors: Iterable[str]) -> dict[str, FollowCrawlResult]:
+        """Get the stored follows of several actors.
+
+        Args:
+            actors: Handles or DIDs that were crawled
+
+        Returns:
+            FollowCrawlResult of each stored actor
+        """
+        return {actor: result for actor in actors if (result := self.get_follows(actor))}
+
+    @abstractmethod
+    def count_follows(self, actors: Iterable[str]) -> Counter[str]:
+        """Count how many of the given actors follow each account.
+
+        Args:
+            actors: Handles or DIDs whose follows are counted
+
+        Returns:
+            Number of the given actors (among those stored) following each account
+        """
+        pass
+
+    @abstractmethod
+    def actors(self) -> list[str]:
+        """List the actors whose follows are stored.
+
+        Returns:
+            Handles or DIDs of the stored actors
+        """
+        pass
+
+    def close(self) -> None:
+        """Release resources held by the store."""
+        return None
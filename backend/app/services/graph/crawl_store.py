@@ -0,0 +1,226 @@
+"""SQLite-backed checkpoint store for paginated graph crawls."""
+
+import json
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+
+from app.core.config import get_settings
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS crawl_jobs (
+    actor TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    cursor TEXT,
+    pages INTEGER NOT NULL DEFAULT 0,
+    is_complete INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    started_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (actor, kind)
+);
+CREATE TABLE IF NOT EXISTS crawl_pages (
+    actor TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    page_index INTEGER NOT NULL,
+    dids TEXT NOT NULL,
+    PRIMARY KEY (actor, kind, page_index)
+);
+"""
+
+
+@dataclass(frozen=True)
+class CrawlJob:
+    """Checkpointed state of a single crawl."""
+
+    actor: str
+    kind: str
+    cursor: str | None
+    pages: int
+    is_complete: bool
+    error: str | None
+    started_at: float
+    updated_at: float
+
+
+class CrawlStore:
+    """Persists crawl cursors and fetched pages so crawls can resume after errors or restarts."""
+
+    def __init__(self, path: str):
+        """Open (and create if needed) the checkpoint database.
+
+        Args:
+            path: Filesystem path of the SQLite database, or ":memory:"
+        """
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def get_job(self, actor: str, kind: str) -> CrawlJob | None:
+        """Get the checkpoint for a crawl.
+
+        Args:
+            actor: Handle or DID being crawled
+            kind: Crawl kind (e.g. "follows")
+
+        Returns:
+            The stored job or None if the crawl was never started
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT cursor, pages, is_complete, error, started_at, updated_at"
+                " FROM crawl_jobs WHERE actor = ? AND kind = ?",
+                (actor, kind),
+            ).fetchone()
+        if not row:
+            return None
+        cursor, pages, is_complete, error, started_at, updated_at = row
+        return CrawlJob(actor, kind, cursor, pages, bool(is_complete), error, started_at, updated_at)
+
+    def start_job(self, actor: str, kind: str) -> CrawlJob:
+        """Start a crawl from scratch, discarding any previous pages.
+
+        Args:
+            actor: Handle or DID being crawled
+            kind: Crawl kind
+
+        Returns:
+            The freshly created job
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            self._conn.execute("DELETE FROM crawl_pages WHERE actor = ? AND kind = ?", (actor, kind))
+            self._conn.execute(
+                "INSERT OR REPLACE INTO crawl_jobs (actor, kind, cursor, pages, is_complete, error, started_at,"
+                " updated_at) VALUES (?, ?, NULL, 0, 0, NULL, ?, ?)",
+                (actor, kind, now, now),
+            )
+            self._conn.execute("COMMIT")
+        return CrawlJob(actor, kind, None, 0, False, None, now, now)
+
+    def append_page(self, job: CrawlJob, dids: list[str], next_cursor: str | None) -> CrawlJob:
+        """Checkpoint a fetched page together with the cursor that follows it.
+
+        The page and cursor are written in one transaction, so a crash never leaves
+        a cursor pointing past pages that were not stored.
+
+        Args:
+            job: Current job state
+            dids: DIDs on the fetched page
+            next_cursor: Cursor for the next page, or None if this was the last page
+
+        Returns:
+            The updated job
+        """
+        now = time.time()
+        is_complete = next_cursor is None
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            self._conn.execute(
+                "INSERT OR REPLACE INTO crawl_pages (actor, kind, page_index, dids) VALUES (?, ?, ?, ?)",
+                (job.actor, job.kind, job.pages, json.dumps(dids)),
+            )
+            self._conn.execute(
+                "UPDATE crawl_jobs SET cursor = ?, pages = ?, is_complete = ?, error = NULL, updated_at = ?"
+                " WHERE actor = ? AND kind = ?",
+                (next_cursor, job.pages + 1, int(is_complete), now, job.actor, job.kind),
+            )
+            self._conn.execute("COMMIT")
+        return CrawlJob(job.actor, job.kind, next_cursor, job.pages + 1, is_complete, None, job.started_at, now)
+
+    def record_error(self, job: CrawlJob, error: str) -> CrawlJob:
+        """Record the error that interrupted a crawl, keeping its last good cursor.
+
+        Args:
+            job: Current job state
+            error: Description of the failure
+
+        Returns:
+            The updated job
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "UPDATE crawl_jobs SET error = ?, updated_at = ? WHERE actor = ? AND kind = ?",
+                (error, now, job.actor, job.kind),
+            )
+        return CrawlJob(job.actor, job.kind, job.cursor, job.pages, job.is_complete, error, job.started_at, now)
+
+    def list_complete_jobs(self, kind: str) -> list[CrawlJob]:
+        """List every crawl of a kind that was walked to the end.
+
+        Args:
+            kind: Crawl kind
+
+        Returns:
+            Completed jobs ordered by actor
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT actor, cursor, pages, error, started_at, updated_at"
+                " FROM crawl_jobs WHERE kind = ? AND is_complete = 1 ORDER BY actor",
+                (kind,),
+            ).fetchall()
+        return [
+            CrawlJob(actor, kind, cursor, pages, True, error, started_at, updated_at)
+            for actor, cursor, pages, error, started_at, updated_at in rows
+        ]
+
+    def count_complete(self, kind: str) -> tuple[int, int]:
+        """Count the actors and followed DIDs of every crawl of a kind that was walked to the end.
+
+        Args:
+            kind: Crawl kind
+
+        Returns:
+            Tuple of (completed crawls, DIDs stored for them)
+        """
+        with self._lock:
+            actors, dids = self._conn.execute(
+                "SELECT COUNT(DISTINCT j.actor), COALESCE(SUM(json_array_length(p.dids)), 0)"
+                " FROM crawl_jobs j LEFT JOIN crawl_pages p ON p.actor = j.actor AND p.kind = j.kind"
+                " WHERE j.kind = ? AND j.is_complete = 1",
+                (kind,),
+            ).fetchone()
+        return actors, dids
+
+    def get_dids(self, actor: str, kind: str) -> list[str]:
+        """Get all checkpointed DIDs for a crawl in page order.
+
+        Args:
+            actor: Handle or DID being crawled
+            kind: Crawl kind
+
+        Returns:
+            DIDs from every stored page
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT dids FROM crawl_pages WHERE actor = ? AND kind = ? ORDER BY page_index",
+                (actor, kind),
+            ).fetchall()
+        return [did for (page,) in rows for did in json.loads(page)]
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
+
+
+@lru_cache
+def get_crawl_store() -> CrawlStore:
+    """Get the shared crawl checkpoint store.
+
+    Returns:
+        CrawlStore: Store located at the configured CRAWL_STORE_PATH
+    """
+    return CrawlStore(get_settings().CRAWL_STORE_PATH)
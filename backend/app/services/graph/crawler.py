@@ -0,0 +1,252 @@
+"""Resumable, checkpointed crawls of paginated Blue Sky graph endpoints."""
+
+import time
+from collections.abc import AsyncIterator
+from datetime import datetime
+from typing import TYPE_CHECKING
+
+from app.core.config import get_settings
+from app.core.logger import setup_logger
+from app.models.graph import CompactProfile, FollowCrawlResult, FollowProjection
+from app.services.graph.crawl_store import CrawlJob, CrawlStore, get_crawl_store
+from app.services.graph.sharding import GraphShardError, get_graph_store
+from app.services.scheduler import run_job
+
+
+if TYPE_CHECKING:
+    from atproto import Client
+
+
+logger = setup_logger(__name__)
+settings = get_settings()
+
+FOLLOWS = "follows"
+FOLLOWERS = "followers"
+
+# Graph kind -> (XRPC query, atproto params model, list field of the response)
+GRAPH_QUERIES = {
+    FOLLOWS: ("app.bsky.graph.getFollows", "AppBskyGraphGetFollows", "follows"),
+    FOLLOWERS: ("app.bsky.graph.getFollowers", "AppBskyGraphGetFollowers", "followers"),
+}
+
+
+def _project(account: dict, projection: FollowProjection) -> str | CompactProfile:
+    """Reduce a raw profile record to the requested projection."""
+    if projection is FollowProjection.DID:
+        return account["did"]
+    return CompactProfile(account["did"], account["handle"], account.get("displayName"))
+
+
+def _session_did(client: "Client | None") -> str | None:
+    """Get the DID of the account a client is logged in as, which scopes shared fetches to one viewer."""
+    return client.me.did if client and client.me else None
+
+
+def _fetch_graph_page(
+    client: "Client",
+    kind: str,
+    actor: str,
+    cursor: str | None,
+    projection: FollowProjection = FollowProjection.DID,
+) -> tuple[list[str] | list[CompactProfile], str | None]:
+    """Fetch one page of an actor's follows or followers, projected as it arrives.
+
+    The page is requested through the raw XRPC query rather than
+    client.app.bsky.graph.get_follows, so no ProfileView models (with avatars,
+    descriptions and labels) are built for accounts the caller only needs the
+    identity of.
+
+    Args:
+        client: Authenticated Blue Sky client
+        kind: FOLLOWS or FOLLOWERS
+        actor: The user's handle or DID
+        cursor: Cursor returned by the previous page, or None for the first page
+        projection: Whether to keep bare DIDs or CompactProfile tuples
+
+    Returns:
+        Tuple of (projected accounts on the page, cursor for the next page or None)
+    """
+    from atproto import models as bsky_models
+
+    nsid, params_model, field = GRAPH_QUERIES[kind]
+    params = getattr(bsky_models, params_model).Params(actor=actor, limit=settings.CRAWL_PAGE_SIZE, cursor=cursor)
+    content = client.invoke_query(nsid, params=params).content
+    return [_project(account, projection) for account in content[field]], content.get("cursor")
+
+
+async def iter_graph_pages(
+    client: "Client",
+    actor: str,
+    kind: str = FOLLOWS,
+    projection: FollowProjection = FollowProjection.DID,
+    cursor: str | None = None,
+) -> AsyncIterator[tuple[list[str] | list[CompactProfile], str | None]]:
+    """Stream an actor's follows or followers page by page without checkpointing.
+
+    Pages come newest first. Each page is fetched as a scheduler job and projected
+    before it is yielded, so the caller holds at most one raw page at a time and
+    can stop early. Concurrent requests for the same page by the same logged-in
+    account share one fetch; upstream responses depend on the viewer (blocks,
+    mutes), so pages are never shared between sessions.
+
+    Args:
+        client: Authenticated Blue Sky client
+        actor: The user's handle or DID
+        kind: FOLLOWS or FOLLOWERS
+        projection: Whether to yield bare DIDs or CompactProfile tuples
+        cursor: Cursor to start from, or None for the newest accounts
+
+    Yields:
+        Tuple of (projected accounts on the page, cursor for the next page or None)
+    """
+    viewer = _session_did(client)
+    while True:
+        key = ("page", viewer, kind, actor, cursor, projection)
+        page, cursor = await run_job(key, _fetch_graph_page, client, kind, actor, cursor, projection)
+        yield page, cursor
+        if not cursor:
+            return
+
+
+def _max_age(client: "Client | None", actor: str) -> int:
+    """Get how long a crawl of an actor's follows may be reused.
+
+    The logged-in user's own follows change with every account they follow from the
+    recommendations, and are excluded from them, so they are reused only briefly.
+    """
+    me = client.me if client else None
+    is_viewer = me is not None and actor in (me.did, me.handle)
+    return settings.CRAWL_VIEWER_MAX_AGE_SECONDS if is_viewer else settings.CRAWL_MAX_AGE_SECONDS
+
+
+def _is_stale(job: CrawlJob, max_age: int) -> bool:
+    """Check whether a crawl, completed or interrupted, is too old to be reused or resumed."""
+    return time.time() - job.updated_at > max_age
+
+
+def _to_result(store: CrawlStore, job: CrawlJob, pages_fetched: int) -> FollowCrawlResult:
+    """Build a crawl result from the checkpointed pages of a job."""
+    return FollowCrawlResult(
+        actor=job.actor,
+        dids=store.get_dids(job.actor, job.kind),
+        is_complete=job.is_complete,
+        pages_fetched=pages_fetched,
+        pages_total=job.pages,
+        updated_at=datetime.fromtimestamp(job.updated_at),
+    )
+
+
+def _from_snapshot(actor: str, max_age: int) -> FollowCrawlResult | None:
+    """Get an actor's follows from the graph snapshot (or its shards) if they are fresh enough."""
+    graph = get_graph_store()
+    try:
+        result = graph.get_follows(actor) if graph else None
+    except GraphShardError as e:
+        logger.warning(f"Crawling follows of {actor} without the graph shards: {e!s}")
+        return None
+    if result and time.time() - result.updated_at.timestamp() <= max_age:
+        return result
+    return None
+
+
+def _crawl_follows(client: "Client", actor: str, store: CrawlStore) -> FollowCrawlResult:
+    """Run a follows crawl to completion or to the first upstream error (blocking)."""
+    job = store.get_job(actor, FOLLOWS)
+    max_age = _max_age(client, actor)
+
+    # The memory-mapped snapshot is cheaper to read than decoding the stored pages, so it
+    # answers first unless the store holds a newer completed crawl
+    result = _from_snapshot(actor, max_age)
+    if result and not (job and job.is_complete and datetime.fromtimestamp(job.updated_at) > result.updated_at):
+        return result
+
+    if job and job.is_complete and not _is_stale(job, max_age):
+        return _to_result(store, job, pages_fetched=0)
+
+    if not job or job.is_complete or _is_stale(job, max_age):
+        job = store.start_job(actor, FOLLOWS)
+    elif job.pages:
+        logger.info(f"Resuming follows crawl for {actor} at page {job.pages}")
+
+    pages_fetched = 0
+    while not job.is_complete:
+        try:
+            dids, next_cursor = _fetch_graph_page(client, FOLLOWS, actor, job.cursor)
+        except Exception as e:
+            job = store.record_error(job, f"{type(e).__name__}: {e!s}")
+            logger.error(f"Follows crawl for {actor} interrupted at page {job.pages}: {e!s}")
+            break
+
+        job = store.append_page(job, dids, next_cursor)
+        pages_fetched += 1
+
+    return _to_result(store, job, pages_fetched)
+
+
+def _get_cached_follows(client: "Client", actors: list[str], store: CrawlStore) -> dict[str, list[str]]:
+    """Get the follows a crawl would serve without touching upstream for several actors (blocking)."""
+    graph = get_graph_store()
+    try:
+        snapshots = graph.get_follows_many(actors) if graph else {}
+    except GraphShardError as e:
+        logger.warning(f"Reading cached follows without the graph shards: {e!s}")
+        snapshots = {}
+
+    cached = {}
+    for actor in actors:
+        max_age = _max_age(client, actor)
+        snapshot = snapshots.get(actor)
+        if snapshot and time.time() - snapshot.updated_at.timestamp() > max_age:
+            snapshot = None
+        job = store.get_job(actor, FOLLOWS)
+        if job and job.is_complete and not _is_stale(job, max_age):
+            if not snapshot or datetime.fromtimestamp(job.updated_at) > snapshot.updated_at:
+                cached[actor] = store.get_dids(actor, FOLLOWS)
+                continue
+        if snapshot:
+            cached[actor] = snapshot.dids
+    return cached
+
+
+async def get_cached_follows(
+    client: "Client", actors: list[str], store: CrawlStore | None = None
+) -> dict[str, list[str]]:
+    """Get the follows of several actors from the graph snapshot (or its shards) and the store only.
+
+    Follows are returned under the same freshness rules crawl_follows serves them
+    by, but actors without a fresh completed crawl are left out instead of crawled.
+
+    Args:
+        client: Authenticated Blue Sky client
+        actors: Handles or DIDs of the actors
+        store: Checkpoint store, defaults to the shared crawl store
+
+    Returns:
+        Followed DIDs of each actor with a fresh completed crawl
+    """
+    store = store or get_crawl_store()
+    return await run_job(None, _get_cached_follows, client, actors, store)
+
+
+async def crawl_follows(client: "Client", actor: str, store: CrawlStore | None = None) -> FollowCrawlResult:
+    """Crawl the accounts an actor follows, resuming from the last checkpoint.
+
+    Completed crawls younger than CRAWL_MAX_AGE_SECONDS (CRAWL_VIEWER_MAX_AGE_SECONDS
+    for the logged-in user's own follows) are served from the graph snapshot (or its
+    shards), or from the store when it has a newer crawl, without touching upstream.
+    Interrupted crawls continue from the last stored cursor unless they are older
+    than that, and an upstream error leaves a partial result that the next call resumes.
+    The blocking client and store calls run as one scheduler job, shared by
+    concurrent calls for the same actor from the same logged-in account.
+
+    Args:
+        client: Authenticated Blue Sky client
+        actor: The user's handle or DID
+        store: Checkpoint store, defaults to the shared crawl store
+
+    Returns:
+        FollowCrawlResult with the followed DIDs and whether the crawl is complete
+    """
+    store = store or get_crawl_store()
+    key = ("crawl", _session_did(client), FOLLOWS, actor, id(store))
+    return await run_job(key, _crawl_follows, client, actor, store)
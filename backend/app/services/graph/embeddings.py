@@ -0,0 +1,234 @@
+"""Low-rank account embeddings of the crawled follow graph.
+
+Every crawled actor is a row and every followed account a column of a sparse
+adjacency matrix. A truncated SVD of that matrix gives each followed account a
+vector whose direction reflects who follows it, so accounts followed by the
+same kinds of actors end up close together. The vectors are held in an
+in-memory IVF index (app.services.graph.ann) for sublinear similarity search.
+
+The graph is the loaded snapshot merged with the crawl store. The index is
+rebuilt in a background thread whenever that graph changes and published by
+swapping a single module-level reference, so requests always see either the
+previous or the new index, never a partial one.
+"""
+
+import asyncio
+import threading
+import time
+from dataclasses import dataclass
+
+import numpy as np
+
+from app.core.config import get_settings
+from app.core.logger import setup_logger
+from app.services.graph.ann import IvfIndex
+from app.services.graph.crawl_store import CrawlStore, get_crawl_store
+from app.services.graph.crawler import FOLLOWS
+from app.services.graph.snapshot import build_graph_arrays, get_graph_snapshot, subgraph_arrays
+
+
+logger = setup_logger(__name__)
+settings = get_settings()
+
+_build_lock = threading.Lock()
+_index: "EmbeddingIndex | None" = None
+_fingerprint: tuple | None = None
+
+
+@dataclass(frozen=True)
+class EmbeddingIndex:
+    """Account embeddings and their nearest-neighbour index.
+
+    Attributes:
+        dids: Sorted UTF-8 DIDs of the embedded accounts
+        vectors: Unit-length embedding of each DID, in DID order
+        ann: IVF index over the vectors
+        built_at: Epoch seconds the index was built
+    """
+
+    dids: np.ndarray
+    vectors: np.ndarray
+    ann: IvfIndex
+    built_at: float
+
+    def lookup(self, dids: list[str]) -> np.ndarray:
+        """Find the rows of the embedded accounts among a list of DIDs.
+
+        Args:
+            dids: DIDs to look up
+
+        Returns:
+            Rows of the DIDs that have an embedding
+        """
+        if not dids or not len(self.dids):
+            return np.empty(0, dtype=np.int64)
+        encoded = np.char.encode(np.array(dids, dtype=np.str_), "utf-8")
+        rows = np.minimum(np.searchsorted(self.dids, encoded), len(self.dids) - 1)
+        return np.unique(rows[self.dids[rows] == encoded])
+
+    def similar(self, follows: list[str], k: int, n_probe: int, exclude: list[str] | None = None) -> list[str]:
+        """Find the accounts most similar to a set of followed accounts.
+
+        The query is the normalized mean of the followed accounts' embeddings;
+        the followed accounts themselves are never returned.
+
+        Args:
+            follows: DIDs the user follows
+            k: Number of similar accounts to return
+            n_probe: Number of inverted lists to scan
+            exclude: Further DIDs that must not be returned, e.g. the user's own
+
+        Returns:
+            DIDs of the most similar accounts, most similar first
+        """
+        rows = self.lookup(follows)
+        if not len(rows):
+            return []
+        query = self.vectors[rows].mean(axis=0)
+        query /= max(float(np.linalg.norm(query)), 1e-12)
+        excluded = np.concatenate([rows, self.lookup(exclude or [])])
+        ids, _ = self.ann.search(query, k, n_probe=n_probe, exclude=excluded)
+        return np.char.decode(self.dids[ids], "utf-8").tolist()
+
+
+def compute_embeddings(arrays: dict, dim: int, min_followers: int) -> tuple[np.ndarray, np.ndarray]:
+    """Embed followed accounts with a truncated SVD of the follow adjacency matrix.
+
+    Rows are scaled by 1/sqrt(out-degree) so actors following thousands of
+    accounts do not dominate the factorization. The rank is capped below the
+    number of crawled actors, which bounds how much structure can be captured.
+
+    Args:
+        arrays: Graph arrays as built by app.services.graph.snapshot.graph_arrays_from_follows
+        dim: Embedding dimension
+        min_followers: Crawled followers an account needs to be embedded
+
+    Returns:
+        Tuple of (sorted UTF-8 DIDs, float32 unit vectors of shape (len(dids), rank))
+    """
+    from scipy.sparse import csr_matrix, diags
+    from scipy.sparse.linalg import svds
+
+    indptr, indices, nodes = np.asarray(arrays["indptr"]), np.asarray(arrays["indices"]), arrays["nodes"]
+    followers = np.bincount(indices, minlength=len(nodes))
+    keep = np.flatnonzero(followers >= min_followers)
+    adjacency = csr_matrix(
+        (np.ones(len(indices), dtype=np.float32), indices, indptr), shape=(len(indptr) - 1, len(nodes))
+    )
+    adjacency = (diags(1.0 / np.sqrt(np.maximum(np.diff(indptr), 1))) @ adjacency)[:, keep]
+
+    rank = min(dim, min(adjacency.shape) - 1)
+    if rank < 1:
+        return nodes[keep], np.empty((len(keep), 0), dtype=np.float32)
+    _, singular_values, vt = svds(adjacency.astype(np.float64), k=rank, random_state=0)
+    vectors = (vt.T * singular_values).astype(np.float32)
+    vectors /= np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+    return np.asarray(nodes[keep]), vectors
+
+
+def build_embedding_index(arrays: dict) -> EmbeddingIndex | None:
+    """Embed the accounts of a follow graph and index them.
+
+    Args:
+        arrays: Graph arrays as built by app.services.graph.snapshot.graph_arrays_from_follows
+
+    Returns:
+        The index, or None if the graph is too small to embed
+    """
+    dids, vectors = compute_embeddings(arrays, settings.EMBEDDING_DIM, settings.EMBEDDING_MIN_FOLLOWERS)
+    if not vectors.shape[1]:
+        return None
+    return EmbeddingIndex(
+        dids=dids, vectors=vectors, ann=IvfIndex(vectors, settings.EMBEDDING_IVF_LISTS or None), built_at=time.time()
+    )
+
+
+def _graph_fingerprint(store: CrawlStore) -> tuple | None:
+    """Identify the graph to embed: the loaded snapshot merged with the crawl store.
+
+    The fingerprint is built from the graph's content rather than crawl times, so
+    re-crawls that leave the follow lists the same size (such as the frequent
+    crawls of users' own follows) do not trigger a rebuild.
+
+    Returns:
+        Fingerprint of the graph, or None if there is no graph yet
+    """
+    actors, edges = store.count_complete(FOLLOWS)
+    snapshot = get_graph_snapshot()
+    if not actors and not snapshot:
+        return None
+    return (snapshot.path.name if snapshot else None, actors, edges)
+
+
+def _merge_graph_arrays(first: dict, second: dict) -> dict:
+    """Stack the rows of two graphs over the union of their nodes."""
+    nodes = np.union1d(first["nodes"], second["nodes"])
+    indices = [np.searchsorted(nodes, arrays["nodes"])[arrays["indices"]] for arrays in (first, second)]
+    return {
+        "nodes": nodes,
+        "indptr": np.concatenate([first["indptr"], first["indptr"][-1] + second["indptr"][1:]]),
+        "indices": np.concatenate(indices),
+    }
+
+
+def _graph_arrays(store: CrawlStore) -> dict:
+    """Load the snapshot's follow lists merged with the crawl store's, the store winning for actors in both."""
+    arrays = build_graph_arrays(store, FOLLOWS)
+    snapshot = get_graph_snapshot()
+    if snapshot is None:
+        return arrays
+    crawled = arrays["nodes"][arrays["actors"]]
+    rows = np.flatnonzero(~np.isin(snapshot.nodes[snapshot.actor_nodes], crawled))
+    return _merge_graph_arrays(subgraph_arrays(snapshot, rows), arrays)
+
+
+def refresh_embedding_index(store: CrawlStore | None = None, force: bool = False) -> EmbeddingIndex | None:
+    """Rebuild the embedding index if the follow graph changed, then publish it.
+
+    Args:
+        store: Crawl checkpoint store, defaults to the shared store
+        force: Rebuild even if the graph is unchanged
+
+    Returns:
+        The published index, or None if there is no graph to embed yet
+    """
+    global _index, _fingerprint
+    store = store or get_crawl_store()
+    with _build_lock:
+        fingerprint = _graph_fingerprint(store)
+        if fingerprint is None or (fingerprint == _fingerprint and not force):
+            return _index
+        started = time.perf_counter()
+        index = build_embedding_index(_graph_arrays(store))
+        _index, _fingerprint = index, fingerprint
+    if index:
+        logger.info(
+            f"Built embedding index of {len(index.dids)} accounts ({index.vectors.shape[1]} dims, "
+            f"{index.ann.n_lists} lists) in {time.perf_counter() - started:.2f}s"
+        )
+    return index
+
+
+async def run_embedding_refresher(after: asyncio.Task | None = None) -> None:
+    """Keep the embedding index fresh, rebuilding it off the event loop whenever the graph changes.
+
+    Args:
+        after: Task to wait for before the first build, e.g. startup warmup loading the snapshot and seed graphs
+    """
+    if after:
+        await asyncio.wait([after])
+    while True:
+        try:
+            await asyncio.to_thread(refresh_embedding_index)
+        except Exception as e:
+            logger.error(f"Failed to rebuild embedding index: {e!s}")
+        await asyncio.sleep(settings.EMBEDDING_REBUILD_INTERVAL_SECONDS)
+
+
+def get_embedding_index() -> EmbeddingIndex | None:
+    """Get the currently published embedding index.
+
+    Returns:
+        The latest index, or None if none has been built yet
+    """
+    return _index
@@ -0,0 +1,150 @@
+"""Incremental sync of a user's follower and follow sets against their last stored copy."""
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+import orjson
+
+from app.core.config import get_settings
+from app.core.logger import setup_logger
+from app.services.graph.crawler import FOLLOWS, iter_graph_pages
+from app.services.state.factory import get_state_backend
+
+
+if TYPE_CHECKING:
+    from atproto import Client
+
+
+logger = setup_logger(__name__)
+settings = get_settings()
+
+
+@dataclass(frozen=True)
+class GraphSetSync:
+    """Result of syncing one follower or follow set.
+
+    Attributes:
+        dids: Current DIDs, newest first
+        added: DIDs not present in the previously stored set
+        pages_fetched: Pages requested from upstream during this sync
+        is_full_refresh: Whether the whole list was re-crawled instead of just its head
+    """
+
+    dids: list[str]
+    added: list[str]
+    pages_fetched: int
+    is_full_refresh: bool
+
+
+def _key(kind: str, actor: str) -> str:
+    """Build the state backend key holding an actor's stored set."""
+    return f"graph_sets:{kind}:{actor}"
+
+
+def _load(kind: str, actor: str) -> dict | None:
+    """Load a stored set as {"dids", "count", "synced_at"}, or None if absent."""
+    entry = get_state_backend().get(_key(kind, actor))
+    return orjson.loads(entry) if entry else None
+
+
+def _save(kind: str, actor: str, dids: list[str], count: int | None) -> None:
+    """Store a set along with the upstream count it was synced against."""
+    entry = {"dids": dids, "count": len(dids) if count is None else count, "synced_at": time.time()}
+    get_state_backend().set(_key(kind, actor), orjson.dumps(entry), ttl_seconds=settings.GRAPH_SET_TTL_SECONDS)
+
+
+async def _fetch_until_known(client: "Client", actor: str, kind: str, known: set[str]) -> tuple[list[str], int]:
+    """Walk pages newest first until reaching a DID that is already known.
+
+    Args:
+        client: Authenticated Blue Sky client
+        actor: The user's handle or DID
+        kind: FOLLOWS or FOLLOWERS
+        known: DIDs from the previous sync, empty to fetch everything
+
+    Returns:
+        Tuple of (unknown DIDs newest first, pages fetched)
+    """
+    added: list[str] = []
+    pages = 0
+    async for page, _ in iter_graph_pages(client, actor, kind):
+        pages += 1
+        for did in page:
+            if did in known:
+                return added, pages
+            added.append(did)
+    return added, pages
+
+
+async def sync_graph_set(client: "Client", actor: str, kind: str, count: int | None = None) -> GraphSetSync:
+    """Bring an actor's stored follower or follow set up to date.
+
+    Upstream lists are newest first, so new accounts are found by reading pages
+    only until the first already-known DID. Removals cannot be seen that way;
+    they are detected by comparing the net change in the upstream count with the
+    number of accounts added. On a mismatch, or when the stored set is older than
+    CRAWL_MAX_AGE_SECONDS, the whole list is re-crawled.
+
+    Args:
+        client: Authenticated Blue Sky client
+        actor: The user's DID
+        kind: FOLLOWS or FOLLOWERS
+        count: Current upstream size of the list (e.g. followersCount), if known
+
+    Returns:
+        GraphSetSync with the current DIDs and what changed
+    """
+    previous = _load(kind, actor)
+    if previous and time.time() - previous["synced_at"] <= settings.CRAWL_MAX_AGE_SECONDS:
+        added, pages = await _fetch_until_known(client, actor, kind, set(previous["dids"]))
+        if count is None or len(added) == count - previous["count"]:
+            dids = added + previous["dids"]
+            _save(kind, actor, dids, count)
+            return GraphSetSync(dids=dids, added=added, pages_fetched=pages, is_full_refresh=False)
+        logger.info(
+            f"{kind} of {actor} changed by {count - previous['count']} upstream but {len(added)} were added, "
+            "running a full refresh"
+        )
+
+    dids, pages = await _fetch_until_known(client, actor, kind, set())
+    _save(kind, actor, dids, count)
+    known = set(previous["dids"]) if previous else set()
+    return GraphSetSync(
+        dids=dids,
+        added=[did for did in dids if did not in known],
+        pages_fetched=pages,
+        is_full_refresh=True,
+    )
+
+
+async def get_newest_follows(client: "Client", did: str) -> set[str] | None:
+    """Get the accounts on the newest page of a user's follows.
+
+    Accounts the user followed recently, typically from their own recommendations,
+    are on this page, so cached recommendations are checked against it. The page is
+    kept in the state backend for CRAWL_VIEWER_MAX_AGE_SECONDS, so this costs at most
+    one upstream call per user and interval across all workers.
+
+    Args:
+        client: The user's authenticated Blue Sky client
+        did: The user's DID
+
+    Returns:
+        DIDs on the newest follows page, or None if it cannot be fetched
+    """
+    backend = get_state_backend()
+    key = f"newest_follows:{did}"
+    entry = await asyncio.to_thread(backend.get, key)
+    if entry is not None:
+        return set(orjson.loads(entry))
+    try:
+        async for page, _ in iter_graph_pages(client, did, FOLLOWS):
+            await asyncio.to_thread(
+                backend.set, key, orjson.dumps(page), ttl_seconds=settings.CRAWL_VIEWER_MAX_AGE_SECONDS
+            )
+            return set(page)
+    except Exception as e:
+        logger.warning(f"Failed to fetch the newest follows of {did}: {e!s}")
+    return None
@@ -0,0 +1,450 @@
+"""Follow graph partitioned by DID across local shard worker processes.
+
+Each actor's follow list lives on exactly one shard, chosen by a consistent
+hash ring with GRAPH_SHARD_REPLICAS virtual points per shard, so changing the
+number of shards only moves about 1/n of the actors. Every shard worker is a
+separate process serving one partition of the published snapshot, so a graph too
+large for one process is spread over GRAPH_SHARDS processes.
+
+Partitions are written once per snapshot version and ring shape, into the
+version directory, by short-lived writer processes of the first shard group that
+needs them. Shard workers then memory-map them read-only like the snapshot
+itself, so the shard groups started by every API worker process on a host share
+one page-cached copy of each partition instead of holding a private copy each.
+
+The parent talks to each worker over a pipe with a small request protocol:
+    ("follows", actors): follow lists of the given actors held by the shard
+    ("count", actors): how many of the given actors follow each account
+    ("actors", None): actors held by the shard
+    ("stop", None): exit the worker
+Lookups spanning several actors are scattered to all shards involved at once
+and the partial results gathered, so the shards work in parallel and count
+aggregation only ships per-shard totals back to the parent.
+
+ShardedGraphStore implements BaseGraphStore, so callers use it exactly like a
+single-process GraphSnapshot; get_graph_store returns whichever is active. Crawls
+read follow lists through it and the common followers strategy counts its seeds
+with count_follows.
+"""
+
+import bisect
+import fcntl
+import hashlib
+import multiprocessing
+import os
+import shutil
+import threading
+import time
+from collections import Counter
+from collections.abc import Iterable
+from datetime import datetime
+from multiprocessing.connection import Connection
+from pathlib import Path
+
+import numpy as np
+
+from app.core.config import get_settings
+from app.core.logger import setup_logger
+from app.models.graph import FollowCrawlResult
+from app.services.graph.base import BaseGraphStore
+from app.services.graph.snapshot import (
+    CURRENT_FILE,
+    GraphSnapshot,
+    get_graph_snapshot,
+    subgraph_arrays,
+    write_graph_arrays,
+)
+
+
+logger = setup_logger(__name__)
+settings = get_settings()
+
+PARTITIONS_DIR = "partitions"
+
+_lock = threading.Lock()
+_sharded_store: "ShardedGraphStore | None" = None
+
+
+class GraphShardError(Exception):
+    """Raised when a shard worker fails to answer a request."""
+
+
+def _hash(key: str) -> int:
+    """Hash a key to a 64-bit ring position, stable across processes."""
+    return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "big")
+
+
+class HashRing:
+    """Consistent hash ring mapping DIDs (or handles) to shard numbers."""
+
+    def __init__(self, num_shards: int, replicas: int = 64):
+        """Place every shard's virtual points on the ring.
+
+        Args:
+            num_shards: Number of shards
+            replicas: Virtual points per shard, more points spread actors more evenly
+        """
+        if num_shards < 1:
+            raise ValueError("At least one shard is required")
+        self.num_shards = num_shards
+        self.replicas = replicas
+        points = sorted(
+            (_hash(f"shard-{shard}-{replica}"), shard) for shard in range(num_shards) for replica in range(replicas)
+        )
+        self._positions = [position for position, _ in points]
+        self._owners = [shard for _, shard in points]
+
+    def shard_for(self, key: str) -> int:
+        """Get the shard owning a key.
+
+        Args:
+            key: DID or handle
+
+        Returns:
+            Shard number, the owner of the first virtual point clockwise from the key's hash
+        """
+        index = bisect.bisect(self._positions, _hash(key))
+        return self._owners[index % len(self._owners)]
+
+    def partition(self, keys: Iterable[str]) -> dict[int, list[str]]:
+        """Group keys by owning shard.
+
+        Args:
+            keys: DIDs or handles
+
+        Returns:
+            Keys of each shard that owns at least one, in input order
+        """
+        groups: dict[int, list[str]] = {}
+        for key in keys:
+            groups.setdefault(self.shard_for(key), []).append(key)
+        return groups
+
+
+def _partition_path(path: Path, num_shards: int, replicas: int, shard: int) -> Path:
+    """Get the directory of a shard's partition inside a snapshot version directory."""
+    return path / PARTITIONS_DIR / f"{num_shards}x{replicas}" / str(shard)
+
+
+def _write_partition(path: Path, num_shards: int, replicas: int, shard: int) -> None:
+    """Write the actors a shard owns out of a snapshot as a snapshot of their own (partition writer process).
+
+    Runs in a short-lived process, so the memory used to build the partition goes back to
+    the OS instead of staying in a long-lived shard worker's heap.
+
+    Args:
+        path: Snapshot version directory to partition
+        num_shards: Number of shards of the ring
+        replicas: Virtual points per shard of the ring
+        shard: Shard number of the partition
+    """
+    destination = _partition_path(path, num_shards, replicas, shard)
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    # Shard groups of other API worker processes wait for the first one to write the partition
+    with open(destination.parent / f".lock-{shard}", "w") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        if destination.exists():
+            return
+        snapshot = GraphSnapshot(path)
+        ring = HashRing(num_shards, replicas)
+        rows = np.array([row for row, actor in enumerate(snapshot.actors()) if ring.shard_for(actor) == shard])
+        staging = destination.with_name(f".tmp-{shard}-{os.getpid()}")
+        staging.mkdir()
+        try:
+            write_graph_arrays(staging, subgraph_arrays(snapshot, rows), snapshot.manifest.get("kind", "follows"))
+            staging.rename(destination)
+        except Exception:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+
+
+def _handle(partition: GraphSnapshot, operation: str, payload: object) -> object:
+    """Answer one request of the shard protocol from a partition."""
+    if operation == "follows":
+        follows = (partition.get_follows(actor) for actor in payload)
+        return {result.actor: (result.dids, result.updated_at.timestamp()) for result in follows if result}
+    if operation == "count":
+        return partition.count_follows(payload)
+    if operation == "actors":
+        return partition.actors()
+    raise ValueError(f"Unknown operation {operation}")
+
+
+def _serve_shard(connection: Connection, path: Path, num_shards: int, replicas: int, shard: int) -> None:
+    """Map a shard's partition and answer requests until told to stop (shard worker process).
+
+    Args:
+        connection: Pipe end connected to the parent
+        path: Snapshot version directory to partition
+        num_shards: Number of shards of the ring
+        replicas: Virtual points per shard of the ring
+        shard: Shard number of this worker
+    """
+    try:
+        partition = GraphSnapshot(_partition_path(path, num_shards, replicas, shard))
+    except Exception as e:
+        connection.send(("error", f"{type(e).__name__}: {e!s}"))
+        return
+    arrays = (partition.nodes, partition.actor_nodes, partition.indptr, partition.indices, partition.updated_at)
+    connection.send(("ok", {**partition.manifest, "num_bytes": sum(array.nbytes for array in arrays)}))
+
+    while True:
+        try:
+            operation, payload = connection.recv()
+        except EOFError:
+            return
+        if operation == "stop":
+            return
+        try:
+            connection.send(("ok", _handle(partition, operation, payload)))
+        except Exception as e:
+            connection.send(("error", f"{type(e).__name__}: {e!s}"))
+
+
+class ShardedGraphStore(BaseGraphStore):
+    """Read-only follow graph served by DID-sharded worker processes."""
+
+    def __init__(self, path: Path, num_shards: int, replicas: int = 64):
+        """Write any missing partitions, then start the shard workers and wait until each has mapped its own.
+
+        Args:
+            path: Snapshot version directory to partition
+            num_shards: Number of shard worker processes
+            replicas: Virtual points per shard on the hash ring
+
+        Raises:
+            GraphShardError: If a partition cannot be written or a worker fails to map it
+        """
+        self.path = path
+        self.ring = HashRing(num_shards, replicas)
+        # Spawn rather than fork: the parent runs threads (logging, the event loop's executors)
+        context = multiprocessing.get_context("spawn")
+        self._write_partitions(context, path, num_shards, replicas)
+        self._connections: list[Connection] = []
+        self._processes = []
+        self._locks = [threading.Lock() for _ in range(num_shards)]
+        for shard in range(num_shards):
+            parent, child = context.Pipe()
+            process = context.Process(
+                target=_serve_shard,
+                args=(child, path, num_shards, replicas, shard),
+                name=f"graph-shard-{shard}",
+                daemon=True,
+            )
+            process.start()
+            child.close()
+            self._connections.append(parent)
+            self._processes.append(process)
+        try:
+            # Actor, node, edge and array byte counts of each shard's partition
+            self.manifests = [self._receive(shard) for shard in range(num_shards)]
+        except GraphShardError:
+            self.close()
+            raise
+
+    @staticmethod
+    def _write_partitions(
+        context: multiprocessing.context.SpawnContext, path: Path, num_shards: int, replicas: int
+    ) -> None:
+        """Write the partitions no shard group has written yet, one writer process per CPU at a time."""
+        writers = [
+            context.Process(
+                target=_write_partition, args=(path, num_shards, replicas, shard), name=f"graph-shard-writer-{shard}"
+            )
+            for shard in range(num_shards)
+            if not _partition_path(path, num_shards, replicas, shard).exists()
+        ]
+        parallel = os.cpu_count() or 1
+        for start in range(0, len(writers), parallel):
+            batch = writers[start : start + parallel]
+            for writer in batch:
+                writer.start()
+            for writer in batch:
+                writer.join()
+        failed = [writer.name for writer in writers if writer.exitcode != 0]
+        if failed:
+            raise GraphShardError(f"Failed to write graph partitions of {path.name}: {', '.join(failed)}")
+
+    @property
+    def num_shards(self) -> int:
+        """Number of shard worker processes."""
+        return self.ring.num_shards
+
+    @property
+    def is_alive(self) -> bool:
+        """Whether every shard worker process is still running."""
+        return all(process.is_alive() for process in self._processes)
+
+    def _receive(self, shard: int) -> object:
+        """Read one response from a shard, raising its error if it failed."""
+        try:
+            status, result = self._connections[shard].recv()
+        except (EOFError, OSError) as e:
+            raise GraphShardError(f"Graph shard {shard} is not responding: {e!s}") from e
+        if status != "ok":
+            raise GraphShardError(f"Graph shard {shard} failed: {result}")
+        return result
+
+    def _scatter(self, operation: str, payloads: dict[int, object]) -> dict[int, object]:
+        """Send one request to each of several shards, then gather their responses.
+
+        Locks are taken in shard order, so concurrent scatters never deadlock, and
+        all requests are sent before any response is read, so the shards work in parallel.
+        Every shard that was sent a request has its response read before the first error
+        is raised, so no shard is left with a stale response for the next request.
+        """
+        shards = sorted(payloads)
+        for shard in shards:
+            self._locks[shard].acquire()
+        try:
+            error: GraphShardError | None = None
+            sent = []
+            for shard in shards:
+                try:
+                    self._connections[shard].send((operation, payloads[shard]))
+                except OSError as e:
+                    error = GraphShardError(f"Graph shard {shard} is not responding: {e!s}")
+                    break
+                sent.append(shard)
+            results = {}
+            for shard in sent:
+                try:
+                    results[shard] = self._receive(shard)
+                except GraphShardError as e:
+                    error = error or e
+            if error:
+                raise error
+            return results
+        finally:
+            for shard in shards:
+                self._locks[shard].release()
+
+    def get_follows_many(self, actors: Iterable[str]) -> dict[str, FollowCrawlResult]:
+        """Get the follows of several actors with one request per shard involved.
+
+        Args:
+            actors: Handles or DIDs that were crawled
+
+        Returns:
+            FollowCrawlResult of each actor held by a shard
+        """
+        gathered = self._scatter("follows", self.ring.partition(actors))
+        return {
+            actor: FollowCrawlResult(
+                actor=actor, dids=dids, is_complete=True, updated_at=datetime.fromtimestamp(updated_at)
+            )
+            for result in gathered.values()
+            for actor, (dids, updated_at) in result.items()
+        }
+
+    def get_follows(self, actor: str) -> FollowCrawlResult | None:
+        """Get the follows of an actor from the shard that holds it.
+
+        Args:
+            actor: Handle or DID that was crawled
+
+        Returns:
+            FollowCrawlResult with the followed DIDs, or None if no shard holds the actor
+        """
+        return self.get_follows_many([actor]).get(actor)
+
+    def count_follows(self, actors: Iterable[str]) -> Counter[str]:
+        """Count how many of the given actors follow each account.
+
+        Each shard counts the follows of its own actors; only the per-shard totals
+        are sent back and summed.
+
+        Args:
+            actors: Handles or DIDs whose follows are counted
+
+        Returns:
+            Number of the given actors (among those held by the shards) following each account
+        """
+        totals: Counter[str] = Counter()
+        for counts in self._scatter("count", self.ring.partition(actors)).values():
+            totals.update(counts)
+        return totals
+
+    def actors(self) -> list[str]:
+        """List the actors held by all shards.
+
+        Returns:
+            Handles or DIDs of the stored actors
+        """
+        gathered = self._scatter("actors", dict.fromkeys(range(self.num_shards)))
+        return [actor for shard in range(self.num_shards) for actor in gathered[shard]]
+
+    def close(self) -> None:
+        """Stop every shard worker."""
+        for shard, connection in enumerate(self._connections):
+            with self._locks[shard]:
+                try:
+                    connection.send(("stop", None))
+                except (BrokenPipeError, OSError):
+                    pass
+                connection.close()
+        for process in self._processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.kill()
+
+
+def start_graph_shards(directory: Path | None = None) -> ShardedGraphStore | None:
+    """Partition the published snapshot across GRAPH_SHARDS worker processes.
+
+    Args:
+        directory: Snapshot root, defaults to GRAPH_SNAPSHOT_DIR
+
+    Returns:
+        The started store, or None if sharding is disabled or no snapshot has been published
+
+    Raises:
+        GraphShardError: If a partition cannot be written or a worker fails to map it
+    """
+    global _sharded_store
+    directory = Path(directory or settings.GRAPH_SNAPSHOT_DIR)
+    if settings.GRAPH_SHARDS < 1 or not (directory / CURRENT_FILE).exists():
+        return None
+
+    started = time.perf_counter()
+    path = directory / (directory / CURRENT_FILE).read_text().strip()
+    store = ShardedGraphStore(path, settings.GRAPH_SHARDS, settings.GRAPH_SHARD_REPLICAS)
+    with _lock:
+        previous, _sharded_store = _sharded_store, store
+    if previous:
+        previous.close()
+    logger.info(f"Started {store.num_shards} graph shards over {path.name} in {time.perf_counter() - started:.2f}s")
+    return store
+
+
+def close_graph_shards() -> None:
+    """Stop the shard workers started by start_graph_shards, if any."""
+    global _sharded_store
+    with _lock:
+        store, _sharded_store = _sharded_store, None
+    if store:
+        store.close()
+
+
+def get_graph_store() -> BaseGraphStore | None:
+    """Get the follow graph store this worker serves crawls from.
+
+    A sharded store with a worker that exited is stopped and dropped, so later
+    lookups fall back to the snapshot or the crawl store instead of failing.
+
+    Returns:
+        The sharded store when graph shards are running, otherwise the loaded
+        single-process snapshot, or None if neither is available
+    """
+    global _sharded_store
+    store = _sharded_store
+    if store and not store.is_alive:
+        with _lock:
+            is_current = _sharded_store is store
+            if is_current:
+                _sharded_store = None
+        if is_current:
+            logger.error(f"A graph shard worker of {store.path.name} exited, stopping graph shards")
+            store.close()
+        store = None
+    return store or get_graph_snapshot()
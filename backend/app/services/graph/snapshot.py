@@ -0,0 +1,331 @@
+"""Memory-mapped columnar snapshots of the crawled follow graph.
+
+A snapshot is a directory of plain .npy arrays plus a JSON manifest:
+    nodes.npy: sorted fixed-width UTF-8 byte strings, one per actor or followed DID
+    actors.npy: node index of each crawled actor, ascending (int32)
+    indptr.npy: CSR row offsets into indices.npy, one row per actor (int64)
+    indices.npy: node index of each followed account, newest follow first (int32)
+    updated_at.npy: epoch seconds each actor's crawl was last updated (float64)
+    manifest.json: format version, creation time and sizes
+
+Snapshots are written to a new version directory and published by atomically
+replacing the CURRENT pointer file, so readers never see a partial snapshot.
+Loading memory-maps every array read-only: nothing is copied into the process,
+and all workers on a host share one page-cached copy. Offline jobs can load the
+same files with numpy.load(..., mmap_mode="r").
+"""
+
+import contextlib
+import fcntl
+import json
+import os
+import shutil
+import threading
+import time
+from collections import Counter
+from collections.abc import Iterable
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+from app.core.config import get_settings
+from app.core.logger import setup_logger
+from app.models.graph import FollowCrawlResult
+from app.services.graph.base import BaseGraphStore
+from app.services.graph.crawl_store import CrawlStore
+
+
+logger = setup_logger(__name__)
+settings = get_settings()
+
+FORMAT_VERSION = 1
+CURRENT_FILE = "CURRENT"
+LOCK_FILE = ".lock"
+ARRAYS = ("nodes", "actors", "indptr", "indices", "updated_at")
+
+_lock = threading.Lock()
+_snapshot: "GraphSnapshot | None" = None
+
+
+class GraphSnapshot(BaseGraphStore):
+    """Read-only follow graph backed by memory-mapped snapshot arrays."""
+
+    def __init__(self, path: Path):
+        """Memory-map a snapshot directory.
+
+        Args:
+            path: Version directory containing the snapshot arrays and manifest
+        """
+        self.path = path
+        self.manifest = json.loads((path / "manifest.json").read_text())
+        if self.manifest["format_version"] != FORMAT_VERSION:
+            raise ValueError(f"Unsupported snapshot format version {self.manifest['format_version']}")
+        arrays = {name: np.load(path / f"{name}.npy", mmap_mode="r") for name in ARRAYS}
+        self.nodes: np.ndarray = arrays["nodes"]
+        self.actor_nodes: np.ndarray = arrays["actors"]
+        self.indptr: np.ndarray = arrays["indptr"]
+        self.indices: np.ndarray = arrays["indices"]
+        self.updated_at: np.ndarray = arrays["updated_at"]
+
+    def _node_index(self, value: str) -> int | None:
+        """Look up the node index of an actor or DID by binary search."""
+        encoded = value.encode()
+        if len(encoded) > self.nodes.dtype.itemsize:
+            return None
+        index = int(np.searchsorted(self.nodes, encoded))
+        return index if index < len(self.nodes) and self.nodes[index] == encoded else None
+
+    def _actor_row(self, actor: str) -> int | None:
+        """Look up the CSR row of a crawled actor."""
+        node = self._node_index(actor)
+        if node is None:
+            return None
+        row = int(np.searchsorted(self.actor_nodes, node))
+        return row if row < len(self.actor_nodes) and self.actor_nodes[row] == node else None
+
+    def get_follows(self, actor: str) -> FollowCrawlResult | None:
+        """Get the follows of an actor from the snapshot.
+
+        Args:
+            actor: Handle or DID that was crawled
+
+        Returns:
+            FollowCrawlResult with the followed DIDs, or None if the actor is not in the snapshot
+        """
+        row = self._actor_row(actor)
+        if row is None:
+            return None
+        followed = self.nodes[self.indices[self.indptr[row] : self.indptr[row + 1]]]
+        return FollowCrawlResult(
+            actor=actor,
+            dids=np.char.decode(followed, "utf-8").tolist(),
+            is_complete=True,
+            updated_at=datetime.fromtimestamp(float(self.updated_at[row])),
+        )
+
+    def count_follows(self, actors: Iterable[str]) -> Counter[str]:
+        """Count how many of the given actors follow each account, on the node indices.
+
+        Only the followed accounts are decoded, once each, instead of every follow list.
+
+        Args:
+            actors: Handles or DIDs whose follows are counted
+
+        Returns:
+            Number of the given actors (among those in the snapshot) following each account
+        """
+        rows = [row for row in map(self._actor_row, dict.fromkeys(actors)) if row is not None]
+        if not rows:
+            return Counter()
+        followed = np.concatenate([self.indices[self.indptr[row] : self.indptr[row + 1]] for row in rows])
+        nodes, counts = np.unique(followed, return_counts=True)
+        return Counter(dict(zip(np.char.decode(self.nodes[nodes], "utf-8").tolist(), counts.tolist(), strict=True)))
+
+    def actors(self) -> list[str]:
+        """List the actors whose follows are in the snapshot.
+
+        Returns:
+            Handles or DIDs of the crawled actors
+        """
+        return np.char.decode(self.nodes[self.actor_nodes], "utf-8").tolist()
+
+
+def graph_arrays_from_follows(actors: list[str], follows: list[list[str]], updated_at: list[float]) -> dict:
+    """Build the snapshot arrays from per-actor follow lists.
+
+    Args:
+        actors: Crawled actors
+        follows: Followed DIDs of each actor, newest first
+        updated_at: Crawl time of each actor in epoch seconds
+
+    Returns:
+        Dictionary of the arrays named in ARRAYS
+    """
+    actor_array = np.array(actors, dtype=np.str_)
+    followed = np.array([did for dids in follows for did in dids], dtype=np.str_)
+
+    nodes, inverse = np.unique(np.concatenate([actor_array, followed]), return_inverse=True)
+    actor_nodes, indices = inverse[: len(actors)], inverse[len(actors) :]
+    indptr = np.concatenate([[0], np.cumsum([len(dids) for dids in follows])]).astype(np.int64)
+
+    # Store rows in actor node order so lookups can binary search the actor array
+    order = np.argsort(actor_nodes, kind="stable")
+    rows = [indices[indptr[row] : indptr[row + 1]] for row in order]
+    return {
+        "nodes": np.char.encode(nodes, "utf-8"),
+        "actors": actor_nodes[order].astype(np.int32),
+        "indptr": np.concatenate([[0], np.cumsum([len(r) for r in rows])]).astype(np.int64),
+        "indices": (np.concatenate(rows) if rows else np.empty(0)).astype(np.int32),
+        "updated_at": np.array([updated_at[row] for row in order], dtype=np.float64),
+    }
+
+
+def subgraph_arrays(snapshot: GraphSnapshot, rows: np.ndarray) -> dict:
+    """Copy some actors' rows of a snapshot into self-contained arrays, e.g. one shard's partition.
+
+    Only the nodes the selected rows reference are kept, so the result is about
+    as large as the selected share of the graph.
+
+    Args:
+        snapshot: Snapshot to copy from
+        rows: Ascending CSR rows of the actors to keep
+
+    Returns:
+        Dictionary of the arrays named in ARRAYS
+    """
+    rows = np.asarray(rows, dtype=np.int64)
+    starts = snapshot.indptr[rows]
+    lengths = snapshot.indptr[rows + 1] - starts
+    indptr = np.concatenate([[0], np.cumsum(lengths)]).astype(np.int64)
+    # Position of every kept edge in the snapshot: each row's start plus its offset within the row
+    positions = np.repeat(starts - indptr[:-1], lengths) + np.arange(indptr[-1])
+    referenced = np.concatenate([snapshot.actor_nodes[rows], snapshot.indices[positions]])
+
+    # Renumbering through the sorted unique nodes keeps node and actor order
+    kept, inverse = np.unique(referenced, return_inverse=True)
+    return {
+        "nodes": np.array(snapshot.nodes[kept]),
+        "actors": inverse[: len(rows)].astype(np.int32),
+        "indptr": indptr,
+        "indices": inverse[len(rows) :].astype(np.int32),
+        "updated_at": np.array(snapshot.updated_at[rows], dtype=np.float64),
+    }
+
+
+def build_graph_arrays(store: CrawlStore, kind: str = "follows") -> dict:
+    """Build the snapshot arrays from every completed crawl of a kind.
+
+    Args:
+        store: Crawl checkpoint store
+        kind: Crawl kind
+
+    Returns:
+        Dictionary of the arrays named in ARRAYS
+    """
+    jobs = store.list_complete_jobs(kind)
+    return graph_arrays_from_follows(
+        [job.actor for job in jobs],
+        [store.get_dids(job.actor, kind) for job in jobs],
+        [job.updated_at for job in jobs],
+    )
+
+
+def write_graph_arrays(path: Path, arrays: dict, kind: str = "follows") -> dict:
+    """Save snapshot arrays and their manifest to a version directory.
+
+    Args:
+        path: Existing, empty version directory
+        arrays: Dictionary of the arrays named in ARRAYS
+        kind: Crawl kind the arrays were built from
+
+    Returns:
+        The written manifest
+    """
+    for name, array in arrays.items():
+        np.save(path / f"{name}.npy", array)
+
+    manifest = {
+        "format_version": FORMAT_VERSION,
+        "kind": kind,
+        "created_at": time.time(),
+        "num_nodes": len(arrays["nodes"]),
+        "num_actors": len(arrays["actors"]),
+        "num_edges": len(arrays["indices"]),
+    }
+    (path / "manifest.json").write_text(json.dumps(manifest, indent=2))
+    return manifest
+
+
+def _prune(directory: Path, keep: int) -> None:
+    """Delete all but the newest `keep` snapshot versions.
+
+    Workers still mapping a deleted version keep reading it until they reload;
+    the files are only freed once unmapped.
+    """
+    versions = sorted(path for path in directory.iterdir() if path.is_dir() and not path.name.startswith("."))
+    for path in versions[:-keep]:
+        shutil.rmtree(path, ignore_errors=True)
+
+
+def export_snapshot(store: CrawlStore, directory: Path | None = None, kind: str = "follows") -> Path | None:
+    """Write every completed crawl of a kind to a new snapshot and publish it.
+
+    Only one process exports at a time; a concurrent export (e.g. another worker
+    shutting down) is skipped rather than waited for.
+
+    Args:
+        store: Crawl checkpoint store to export
+        directory: Snapshot root, defaults to GRAPH_SNAPSHOT_DIR
+        kind: Crawl kind to export
+
+    Returns:
+        Path of the published version, or None if another export was running
+    """
+    directory = Path(directory or settings.GRAPH_SNAPSHOT_DIR)
+    directory.mkdir(parents=True, exist_ok=True)
+    with open(directory / LOCK_FILE, "w") as lock_file:
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            logger.info(f"Graph snapshot export to {directory} already running, skipping")
+            return None
+
+        started = time.perf_counter()
+        version = datetime.now().strftime("%Y%m%dT%H%M%S%f")
+        staging = directory / f".tmp-{version}"
+        staging.mkdir()
+        try:
+            manifest = write_graph_arrays(staging, build_graph_arrays(store, kind), kind)
+            staging.rename(directory / version)
+        except Exception:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+
+        pointer = directory / f".{CURRENT_FILE}.tmp"
+        pointer.write_text(version)
+        os.replace(pointer, directory / CURRENT_FILE)
+        _prune(directory, settings.GRAPH_SNAPSHOT_KEEP)
+
+    logger.info(
+        f"Exported graph snapshot {version}: {manifest['num_actors']} actors, {manifest['num_edges']} edges "
+        f"in {time.perf_counter() - started:.2f}s"
+    )
+    return directory / version
+
+
+def open_current_snapshot(directory: Path | None = None) -> GraphSnapshot | None:
+    """Memory-map the currently published snapshot.
+
+    Args:
+        directory: Snapshot root, defaults to GRAPH_SNAPSHOT_DIR
+
+    Returns:
+        The snapshot, or None if none has been published
+    """
+    directory = Path(directory or settings.GRAPH_SNAPSHOT_DIR)
+    with contextlib.suppress(FileNotFoundError):
+        return GraphSnapshot(directory / (directory / CURRENT_FILE).read_text().strip())
+    return None
+
+
+def load_graph_snapshot() -> GraphSnapshot | None:
+    """Load (or reload) the published snapshot as this worker's graph snapshot.
+
+    Returns:
+        The loaded snapshot, or None if none has been published
+    """
+    global _snapshot
+    snapshot = open_current_snapshot()
+    with _lock:
+        _snapshot = snapshot
+    return snapshot
+
+
+def get_graph_snapshot() -> GraphSnapshot | None:
+    """Get this worker's loaded graph snapshot.
+
+    Returns:
+        The snapshot loaded at startup, or None if none was loaded
+    """
+    return _snapshot
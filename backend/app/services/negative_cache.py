@@ -0,0 +1,99 @@
+"""Negative cache of profiles that cannot be resolved (deleted, suspended or taken down)."""
+
+from collections.abc import Iterable
+
+from app.core.config import get_settings
+from app.services.state.factory import get_state_backend
+
+
+settings = get_settings()
+
+# XRPC errors that mean the account itself is gone, as opposed to transient failures or
+# request-level errors (expired tokens, malformed params) that are also sent as HTTP 400
+PERMANENT_ERRORS = frozenset({"AccountTakedown", "AccountDeactivated"})
+# getProfile reports a missing account as a generic InvalidRequest with this message
+NOT_FOUND_MESSAGE = "Profile not found"
+
+
+def _key(did: str) -> str:
+    """Build the state backend key for a DID."""
+    return f"negative:{did}"
+
+
+def _xrpc_error(error: Exception) -> tuple[str | None, str | None]:
+    """Get the XRPC error name and message of an atproto request error, if it carries one."""
+    content = getattr(getattr(error, "response", None), "content", None)
+    if isinstance(content, dict):
+        return content.get("error"), content.get("message")
+    return getattr(content, "error", None), getattr(content, "message", None)
+
+
+def permanent_failure_reason(error: Exception) -> str | None:
+    """Check whether a lookup error means the profile will keep failing.
+
+    Args:
+        error: Exception raised by the upstream lookup
+
+    Returns:
+        "NotFound" or the XRPC error name (e.g. "AccountTakedown") for account-level
+        failures, None for anything else
+    """
+    name, message = _xrpc_error(error)
+    if name in PERMANENT_ERRORS:
+        return name
+    if message and message.startswith(NOT_FOUND_MESSAGE):
+        return "NotFound"
+    return None
+
+
+def record_failure(did: str, error: Exception) -> bool:
+    """Remember a failed lookup for NEGATIVE_CACHE_TTL_SECONDS if the failure is permanent.
+
+    Args:
+        did: DID whose lookup failed
+        error: Exception raised by the lookup
+
+    Returns:
+        True if the failure was cached
+    """
+    reason = permanent_failure_reason(error)
+    if reason is None:
+        return False
+    record_unresolvable(did, reason)
+    return True
+
+
+def record_unresolvable(did: str, reason: str) -> None:
+    """Remember for NEGATIVE_CACHE_TTL_SECONDS that a DID cannot be resolved.
+
+    Args:
+        did: DID that could not be resolved
+        reason: Short reason stored as the cached failure, e.g. an XRPC error name
+    """
+    get_state_backend().set(_key(did), reason.encode(), ttl_seconds=settings.NEGATIVE_CACHE_TTL_SECONDS)
+
+
+def get_failure(did: str) -> str | None:
+    """Get the cached failure for a DID.
+
+    Args:
+        did: DID to look up
+
+    Returns:
+        Reason of the cached failure, or None if the DID is not known to fail
+    """
+    reason = get_state_backend().get(_key(did))
+    return reason.decode() if reason else None
+
+
+def filter_known_failures(dids: Iterable[str]) -> list[str]:
+    """Drop DIDs with a cached failure, preserving order.
+
+    Args:
+        dids: Candidate DIDs
+
+    Returns:
+        DIDs that are not known to fail
+    """
+    backend = get_state_backend()
+    return [did for did in dids if backend.get(_key(did)) is None]
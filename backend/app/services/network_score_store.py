@@ -0,0 +1,228 @@
+"""SQLite-backed per-user scoring state of the network strategy.
+
+For each user the store keeps the follow set the scores were computed from, the
+follow list counted for each of those follows, and how many of those follows
+follow each candidate. When the user's follows change only the difference is
+applied: each added follow increments the counts of the accounts it follows, and
+each removed follow decrements exactly the counts its stored follow list
+incremented, so later changes to that list cannot skew the counts. Ranking reads the
+(did, count) index in order, so only the rows touched by a change are re-sorted
+and a refresh costs O(size of the change) instead of O(size of the network).
+"""
+
+import sqlite3
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+
+from app.core.config import get_settings
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS network_state (
+    did TEXT PRIMARY KEY,
+    version INTEGER NOT NULL,
+    built_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS network_follows (
+    did TEXT NOT NULL,
+    follow TEXT NOT NULL,
+    PRIMARY KEY (did, follow)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS network_contributions (
+    did TEXT NOT NULL,
+    follow TEXT NOT NULL,
+    candidate TEXT NOT NULL,
+    PRIMARY KEY (did, follow, candidate)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS network_counts (
+    did TEXT NOT NULL,
+    candidate TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (did, candidate)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS network_counts_rank ON network_counts (did, count DESC, candidate);
+"""
+
+# Bumped when stored state can no longer be updated incrementally; older databases are cleared and rebuilt
+_SCHEMA_VERSION = 1
+_TABLES = ("network_state", "network_follows", "network_contributions", "network_counts")
+
+
+@dataclass(frozen=True)
+class NetworkState:
+    """Follow set a user's candidate counts were computed from.
+
+    Attributes:
+        follows: DIDs whose follow lists are counted
+        version: Incremented on every change, used to detect concurrent updates
+        built_at: Epoch seconds the counts were last rebuilt from scratch
+    """
+
+    follows: set[str]
+    version: int
+    built_at: float
+
+    @property
+    def age_seconds(self) -> float:
+        """Seconds since the counts were last rebuilt from scratch."""
+        return time.time() - self.built_at
+
+
+class NetworkScoreStore:
+    """Persists per-user candidate counts so any worker can update them incrementally."""
+
+    def __init__(self, path: str):
+        """Open (and create if needed) the network score store.
+
+        Args:
+            path: Filesystem path of the SQLite database, or ":memory:"
+        """
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        if self._conn.execute("PRAGMA user_version").fetchone()[0] < _SCHEMA_VERSION:
+            # Earlier versions did not store the counted follow lists, so their counts cannot be decremented exactly
+            for table in _TABLES:
+                self._conn.execute(f"DELETE FROM {table}")
+            self._conn.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+
+    def get_state(self, did: str) -> NetworkState | None:
+        """Get the follow set a user's counts were computed from.
+
+        Args:
+            did: User's decentralized identifier
+
+        Returns:
+            The stored state, or None if the user has never been scored
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT version, built_at FROM network_state WHERE did = ?", (did,)).fetchone()
+            if not row:
+                return None
+            follows = self._conn.execute("SELECT follow FROM network_follows WHERE did = ?", (did,)).fetchall()
+        return NetworkState(follows={follow for (follow,) in follows}, version=row[0], built_at=row[1])
+
+    def _clear(self, did: str) -> None:
+        """Delete all of a user's state; the caller holds the lock and a transaction."""
+        for table in _TABLES:
+            self._conn.execute(f"DELETE FROM {table} WHERE did = ?", (did,))
+
+    def apply(self, did: str, version: int | None, added: dict[str, list[str]], removed: list[str]) -> bool:
+        """Apply a change of follow set to a user's candidate counts.
+
+        The change is only applied if the stored version still matches, so two
+        workers rescoring the same user cannot both apply the same delta.
+
+        Args:
+            did: User's decentralized identifier
+            version: Version the change was computed against, or None to rebuild from scratch
+            added: Follow lists of the follows that were added
+            removed: Follows that were removed, whose stored follow lists are subtracted
+
+        Returns:
+            True if the change was applied, False if the state changed concurrently
+        """
+        deltas: Counter[str] = Counter()
+        contributions = [(follow, candidate) for follow, follows in added.items() for candidate in set(follows)]
+        deltas.update(candidate for _, candidate in contributions)
+        now = time.time()
+
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute("SELECT version, built_at FROM network_state WHERE did = ?", (did,)).fetchone()
+                if version is not None and (not row or row[0] != version):
+                    self._conn.execute("ROLLBACK")
+                    return False
+                if version is None:
+                    self._clear(did)
+                for follow in removed:
+                    deltas.subtract(
+                        candidate
+                        for (candidate,) in self._conn.execute(
+                            "SELECT candidate FROM network_contributions WHERE did = ? AND follow = ?", (did, follow)
+                        )
+                    )
+                self._conn.executemany(
+                    "DELETE FROM network_contributions WHERE did = ? AND follow = ?", ((did, f) for f in removed)
+                )
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO network_contributions (did, follow, candidate) VALUES (?, ?, ?)",
+                    ((did, follow, candidate) for follow, candidate in contributions),
+                )
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO network_follows (did, follow) VALUES (?, ?)", ((did, f) for f in added)
+                )
+                self._conn.executemany(
+                    "DELETE FROM network_follows WHERE did = ? AND follow = ?", ((did, f) for f in removed)
+                )
+                self._conn.executemany(
+                    "INSERT INTO network_counts (did, candidate, count) VALUES (?, ?, ?)"
+                    " ON CONFLICT (did, candidate) DO UPDATE SET count = count + excluded.count",
+                    ((did, candidate, delta) for candidate, delta in deltas.items() if delta),
+                )
+                self._conn.execute("DELETE FROM network_counts WHERE did = ? AND count <= 0", (did,))
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO network_state (did, version, built_at, updated_at) VALUES (?, ?, ?, ?)",
+                    (did, (row[0] + 1) if row else 1, now if version is None else row[1], now),
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return True
+
+    def rank(self, did: str, limit: int, min_count: int = 1, exclude: set[str] | None = None) -> list[tuple[str, int]]:
+        """Get a user's highest-counted candidates.
+
+        Rows are streamed in index order and excluded candidates skipped, so only
+        about `limit` rows are read however many candidates the user has.
+
+        Args:
+            did: User's decentralized identifier
+            limit: Maximum number of candidates
+            min_count: Minimum number of counted follows following a candidate
+            exclude: Candidates to skip, e.g. accounts the user already follows
+
+        Returns:
+            (candidate DID, count) pairs, highest count first
+        """
+        exclude = exclude or set()
+        ranked: list[tuple[str, int]] = []
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT candidate, count FROM network_counts WHERE did = ? AND count >= ?"
+                " ORDER BY count DESC, candidate",
+                (did, min_count),
+            )
+            for candidate, count in rows:
+                if candidate in exclude or candidate == did:
+                    continue
+                ranked.append((candidate, count))
+                if len(ranked) >= limit:
+                    break
+        return ranked
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
+
+
+@lru_cache
+def get_network_score_store() -> NetworkScoreStore:
+    """Get the shared network score store.
+
+    Returns:
+        NetworkScoreStore: Store located at the configured NETWORK_STATE_PATH
+    """
+    return NetworkScoreStore(get_settings().NETWORK_STATE_PATH)
@@ -0,0 +1,130 @@
+"""SQLite-backed store of recommendations computed ahead of time by the precompute job."""
+
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+
+import orjson
+
+from app.core.config import get_settings
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS precomputed (
+    did TEXT NOT NULL,
+    strategy TEXT NOT NULL,
+    scoring TEXT NOT NULL,
+    generated_at REAL NOT NULL,
+    recommendations BLOB NOT NULL,
+    PRIMARY KEY (did, strategy, scoring)
+);
+"""
+
+
+@dataclass(frozen=True)
+class PrecomputedEntry:
+    """Recommendations precomputed for one user and strategy.
+
+    Attributes:
+        did: User's decentralized identifier
+        strategy: Recommendation strategy
+        scoring: Scoring measure value
+        generated_at: Epoch seconds the recommendations were computed
+        recommendations: RecommendedUser-shaped dictionaries in rank order
+    """
+
+    did: str
+    strategy: str
+    scoring: str
+    generated_at: float
+    recommendations: list[dict]
+
+    @property
+    def age_seconds(self) -> float:
+        """Seconds since the recommendations were computed."""
+        return time.time() - self.generated_at
+
+
+class PrecomputedStore:
+    """Persists precomputed recommendations so any worker can serve them."""
+
+    def __init__(self, path: str):
+        """Open (and create if needed) the precomputed store.
+
+        Args:
+            path: Filesystem path of the SQLite database, or ":memory:"
+        """
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def get(self, did: str, strategy: str, scoring: str) -> PrecomputedEntry | None:
+        """Get the precomputed recommendations for a user.
+
+        Args:
+            did: User's decentralized identifier
+            strategy: Recommendation strategy
+            scoring: Scoring measure value
+
+        Returns:
+            The stored entry, or None if none was precomputed
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT generated_at, recommendations FROM precomputed WHERE did = ? AND strategy = ? AND scoring = ?",
+                (did, strategy, scoring),
+            ).fetchone()
+        if not row:
+            return None
+        generated_at, recommendations = row
+        return PrecomputedEntry(did, strategy, scoring, generated_at, orjson.loads(recommendations))
+
+    def put(self, entry: PrecomputedEntry) -> None:
+        """Store (or replace) precomputed recommendations.
+
+        Args:
+            entry: Entry to store
+        """
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO precomputed (did, strategy, scoring, generated_at, recommendations)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (entry.did, entry.strategy, entry.scoring, entry.generated_at, orjson.dumps(entry.recommendations)),
+            )
+
+    def prune(self, max_age_seconds: float) -> int:
+        """Delete entries older than a maximum age.
+
+        Args:
+            max_age_seconds: Age beyond which entries are deleted
+
+        Returns:
+            Number of deleted entries
+        """
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM precomputed WHERE generated_at < ?", (time.time() - max_age_seconds,)
+            )
+        return cursor.rowcount
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
+
+
+@lru_cache
+def get_precomputed_store() -> PrecomputedStore:
+    """Get the shared precomputed recommendations store.
+
+    Returns:
+        PrecomputedStore: Store located at the configured PRECOMPUTE_STORE_PATH
+    """
+    return PrecomputedStore(get_settings().PRECOMPUTE_STORE_PATH)
@@ -1,17 +1,19 @@
 """Base classes and protocols for recommendation services."""
 
 from abc import ABC, abstractmethod
-from typing import Protocol
+from typing import TYPE_CHECKING, Protocol
 
-from atproto import Client, models as bsky_models
+
+if TYPE_CHECKING:
+    from atproto import Client, models as bsky_models
 
 
 class RecommenderProtocol(Protocol):
     """Protocol defining the interface for recommendation strategies."""
 
     async def get_recommendations(
-        self, client: Client, actor: str
-    ) -> list[bsky_models.AppBskyActorDefs.ProfileViewDetailed]:
+        self, client: "Client", actor: str
+    ) -> "list[bsky_models.AppBskyActorDefs.ProfileViewDetailed]":
         """Get recommended accounts for a user.
 
         Args:
@@ -29,8 +31,8 @@ class BaseRecommender(ABC):
 
     @abstractmethod
     async def get_recommendations(
-        self, client: Client, actor: str
-    ) -> list[bsky_models.AppBskyActorDefs.ProfileViewDetailed]:
+        self, client: "Client", actor: str
+    ) -> "list[bsky_models.AppBskyActorDefs.ProfileViewDetailed]":
         """Get recommended accounts for a user.
 
         Args:
@@ -1,41 +1,49 @@
 """Basic recommendation service using Blue Sky's built-in suggestions."""
 
-from atproto import Client, models as bsky_models
+from typing import TYPE_CHECKING
 
+from app.core.config import get_settings
 from app.core.logger import setup_logger
 from app.services.recommenders.base import BaseRecommender
+from app.services.suggestion_pool import get_suggestions
+
+
+if TYPE_CHECKING:
+    from atproto import Client, models as bsky_models
 
 
 logger = setup_logger(__name__)
+settings = get_settings()
 
 
 class BasicRecommender(BaseRecommender):
     """Basic recommendation strategy using Blue Sky's built-in suggestions."""
 
+    def __init__(self, limit: int = settings.SUGGESTION_POOL_MIN_SIZE):
+        """Initialize the BasicRecommender.
+
+        Args:
+            limit: Number of suggestions to return; at least SUGGESTION_POOL_MIN_SIZE are pooled
+        """
+        self.limit = max(limit, settings.SUGGESTION_POOL_MIN_SIZE)
+
     async def get_recommendations(
-        self, client: Client, actor: str
-    ) -> list[bsky_models.AppBskyActorDefs.ProfileViewDetailed]:
+        self, client: "Client", actor: str
+    ) -> "list[bsky_models.AppBskyActorDefs.ProfileViewDetailed]":
         """Get recommended accounts using Blue Sky's suggestion API.
 
+        Suggestions come from the user's cached suggestion pool, which pages
+        further through getSuggestions only when it holds fewer than `limit`.
+
         Args:
             client: Authenticated Blue Sky client
-            actor: The user's handle or DID
+            actor: The user's DID
 
         Returns:
             List of ProfileViewDetailed objects representing recommended accounts
         """
         try:
-            suggestions = client.app.bsky.actor.get_suggestions({"limit": 50}).actors
-            # Convert suggestions to detailed profiles
-            detailed_profiles = []
-            for actor in suggestions:
-                try:
-                    profile = client.app.bsky.actor.get_profile({"actor": actor.did})
-                    detailed_profiles.append(profile)
-                except Exception as e:
-                    logger.warning(f"Failed to fetch profile for {actor.did}: {e!s}")
-                    continue
-            return detailed_profiles
+            return await get_suggestions(client, actor, self.limit)
         except Exception as e:
             logger.error(f"Failed to get suggestions: {e!s}")
             return []
@@ -1,33 +1,58 @@
 """Recommendation service based on common followers analysis."""
 
-from collections import Counter
+import time
+from typing import TYPE_CHECKING
 
-from atproto import Client, models as bsky_models
+import numpy as np
 
+from app.core.config import get_settings
 from app.core.logger import setup_logger
+from app.models.graph import FollowCrawlResult
+from app.models.recommendations import ScoringMeasure
+from app.services.graph.crawler import crawl_follows
+from app.services.graph.sharding import GraphShardError, get_graph_store
 from app.services.recommenders.base import BaseRecommender
+from app.services.recommenders.hydration import hydrate_profiles
+from app.services.recommenders.scoring import build_follow_matrix, order_candidates, select_candidates
+from app.services.recommenders.sketches import SpaceSaving
+from app.services.scheduler import run_job
+
+
+if TYPE_CHECKING:
+    from atproto import Client, models as bsky_models
 
 
 logger = setup_logger(__name__)
+settings = get_settings()
 
 
 class CommonFollowersRecommender(BaseRecommender):
     """Recommender that analyzes common followers among seed accounts."""
 
-    def __init__(self, seed_accounts: list[str], min_common_follows: int = 2):
+    def __init__(
+        self,
+        seed_accounts: list[str],
+        min_common_follows: int = 2,
+        scoring: ScoringMeasure = ScoringMeasure.COUNT,
+        sketch_capacity: int | None = None,
+    ):
         """Initialize the CommonFollowersRecommender.
 
         Args:
             seed_accounts: List of handles or DIDs to analyze for common followers
             min_common_follows: Minimum number of seed accounts that must follow a user
                              for them to be recommended
+            scoring: Similarity measure used to rank candidates
+            sketch_capacity: Candidates tracked by approximate counting, or None to count exactly
         """
         if len(seed_accounts) < 2:
             raise ValueError("At least 2 seed accounts are required")
         self.seed_accounts = seed_accounts
         self.min_common_follows = min_common_follows
+        self.scoring = scoring
+        self.sketch_capacity = sketch_capacity
 
-    async def _get_follows(self, client: Client, actor: str) -> list[bsky_models.AppBskyActorDefs.ProfileView]:
+    async def _get_follows(self, client: "Client", actor: str) -> FollowCrawlResult:
         """Get the list of accounts that an actor follows.
 
         Args:
@@ -35,28 +60,92 @@ class CommonFollowersRecommender(BaseRecommender):
             actor: The user's handle or DID
 
         Returns:
-            List of ProfileView objects representing accounts followed by the actor
+            FollowCrawlResult with the followed DIDs, resumed from any stored checkpoint
         """
-        cursor = None
-        follows = []
+        result = await crawl_follows(client, actor)
+        if not result.is_complete:
+            logger.warning(f"Using partial follows for {actor} ({result.pages_total} pages checkpointed)")
+        return result
+
+    async def _count_in_graph_store(self) -> tuple[list[list[str]], np.ndarray] | None:
+        """Count the seeds' follows inside the graph store, if it holds fresh follows of every seed.
 
-        while True:
-            try:
-                response = client.app.bsky.graph.get_follows(params={"actor": actor, "limit": 100, "cursor": cursor})
-                follows.extend(response.follows)
+        The store counts on its node indices (each graph shard counting its own seeds in
+        parallel), so only the candidates reaching min_common_follows are kept from the
+        seeds' follow lists, whichever counting mode is configured.
 
-                if not response.cursor:
-                    break
-                cursor = response.cursor
-            except Exception as e:
-                logger.error(f"Error fetching follows for {actor}: {e!s}")
-                break
+        Returns:
+            Tuple of (candidate DIDs followed by each seed, full follow count per seed), or None
+            if no graph store is loaded, it lacks fresh follows of a seed or a graph shard failed
+        """
+        graph = get_graph_store()
+        if not graph:
+            return None
+        try:
+            follows = await run_job(None, graph.get_follows_many, self.seed_accounts)
+            oldest = time.time() - settings.CRAWL_MAX_AGE_SECONDS
+            if any(seed not in follows or follows[seed].updated_at.timestamp() < oldest for seed in self.seed_accounts):
+                return None
+            counts = await run_job(None, graph.count_follows, self.seed_accounts)
+        except GraphShardError as e:
+            logger.warning(f"Counting seed follows without the graph shards: {e!s}")
+            return None
+        candidates = {did for did, count in counts.items() if count >= self.min_common_follows}
+        seed_follows = [[did for did in follows[seed].dids if did in candidates] for seed in self.seed_accounts]
+        degrees = np.asarray([len(follows[seed].dids) for seed in self.seed_accounts], dtype=np.int64)
+        return seed_follows, degrees
+
+    async def _get_seed_follows(self, client: "Client") -> tuple[list[list[str]], np.ndarray | None]:
+        """Get the follows of every seed account, reduced to heavy hitters in approximate mode.
+
+        When the graph snapshot (or its shards) holds fresh follows of every seed, the
+        candidates are counted there instead. Otherwise exact mode returns every seed's
+        full follow list, and approximate mode streams the seeds one at a time through a
+        SpaceSaving summary of sketch_capacity candidates, then reads each seed again
+        (from the snapshot or crawl store) keeping only the candidates that may reach
+        min_common_follows. Only one full follow list of a completely crawled seed is held
+        at a time, and the candidates kept are bounded by the capacity instead of growing
+        with every account any seed follows. Partial follow lists are kept from the first
+        pass: reading them again would resume the crawl upstream and count a different
+        list than the summary saw.
 
-        return follows
+        Args:
+            client: Authenticated Blue Sky client
+
+        Returns:
+            Tuple of (followed DIDs per seed, full follow count per seed when reduced, otherwise None)
+        """
+        if counted := await self._count_in_graph_store():
+            return counted
+        if self.sketch_capacity is None:
+            return [(await self._get_follows(client, seed)).dids for seed in self.seed_accounts], None
+
+        sketch = SpaceSaving(self.sketch_capacity)
+        partial_follows: dict[str, list[str]] = {}
+        for seed in self.seed_accounts:
+            result = await self._get_follows(client, seed)
+            sketch.update_all(dict.fromkeys(result.dids))
+            if not result.is_complete:
+                partial_follows[seed] = result.dids
+        heavy_hitters = sketch.frequent(self.min_common_follows)
+        if sketch.min_count >= self.min_common_follows:
+            logger.warning(
+                f"Approximate counting may miss candidates followed by up to "
+                f"{min(sketch.min_count, len(self.seed_accounts))} of {len(self.seed_accounts)} seeds; "
+                f"raise the sketch capacity above {self.sketch_capacity}"
+            )
+
+        seed_follows, degrees = [], []
+        for seed in self.seed_accounts:
+            dids = partial_follows.pop(seed) if seed in partial_follows else (await crawl_follows(client, seed)).dids
+            follows = dict.fromkeys(dids)
+            seed_follows.append([did for did in follows if did in heavy_hitters])
+            degrees.append(len(follows))
+        return seed_follows, np.asarray(degrees, dtype=np.int64)
 
     async def get_recommendations(
-        self, client: Client, actor: str
-    ) -> list[bsky_models.AppBskyActorDefs.ProfileViewDetailed]:
+        self, client: "Client", actor: str
+    ) -> "list[bsky_models.AppBskyActorDefs.ProfileViewDetailed]":
         """Get recommended accounts based on common followers among seed accounts.
 
         Args:
@@ -65,41 +154,31 @@ class CommonFollowersRecommender(BaseRecommender):
 
         Returns:
             List of ProfileViewDetailed objects representing recommended accounts,
-            sorted by number of seed accounts following them
+            sorted by the configured scoring measure
         """
         try:
             # Get current user's follows to exclude them from recommendations
-            user_follows = {f.did for f in await self._get_follows(client, actor)}
+            user_follows = set((await self._get_follows(client, actor)).dids)
 
             # Get follows for each seed account
-            all_follows = []
-            for seed in self.seed_accounts:
-                follows = await self._get_follows(client, seed)
-                all_follows.extend(follow.did for follow in follows)
-
-            # Count how many seed accounts follow each account
-            follow_counts = Counter(all_follows)
-
-            # Filter for accounts followed by minimum number of seed accounts
-            # and not already followed by the user
-            recommended_dids = {
-                did
-                for did, count in follow_counts.items()
-                if count >= self.min_common_follows and did not in user_follows
-            }
-
-            # Fetch detailed profiles for recommended accounts
-            recommendations = []
-            for did in recommended_dids:
-                try:
-                    profile = client.app.bsky.actor.get_profile(params={"actor": did})
-                    recommendations.append(profile)
-                except Exception as e:
-                    logger.warning(f"Failed to fetch profile for {did}: {e!s}")
-                    continue
-
-            # Sort by number of seed accounts following
-            recommendations.sort(key=lambda x: follow_counts[x.did], reverse=True)
+            seed_follows, seed_degrees = await self._get_seed_follows(client)
+
+            # Build the seed x candidate matrix and keep accounts followed by the minimum number
+            # of seed accounts and not already followed by the user
+            follow_matrix = build_follow_matrix(seed_follows, seed_degrees)
+            column_of = select_candidates(follow_matrix, self.min_common_follows, user_follows)
+
+            # Fetch detailed profiles for recommended accounts, skipping known-unresolvable ones
+            recommendations = await hydrate_profiles(client, column_of)
+
+            # Rank by the selected similarity measure
+            columns = np.asarray([column_of[profile.did] for profile in recommendations], dtype=np.int64)
+            follower_counts = np.array(
+                [-1 if profile.followers_count is None else profile.followers_count for profile in recommendations],
+                dtype=np.float64,
+            )
+            order = order_candidates(follow_matrix, self.scoring, columns, follower_counts)
+            recommendations = [recommendations[position] for position in order]
 
             return recommendations
         except Exception as e:
@@ -0,0 +1,61 @@
+"""Recommendation service suggesting accounts similar to the ones the user follows."""
+
+from typing import TYPE_CHECKING
+
+from app.core.config import get_settings
+from app.core.logger import setup_logger
+from app.services.graph.crawler import crawl_follows
+from app.services.graph.embeddings import get_embedding_index
+from app.services.recommenders.base import BaseRecommender
+from app.services.recommenders.hydration import hydrate_profiles
+
+
+if TYPE_CHECKING:
+    from atproto import Client, models as bsky_models
+
+
+logger = setup_logger(__name__)
+settings = get_settings()
+
+
+class EmbeddingRecommender(BaseRecommender):
+    """Recommender searching the follow-graph embedding index for accounts near the user's follows."""
+
+    def __init__(
+        self, max_candidates: int = settings.EMBEDDING_MAX_CANDIDATES, n_probe: int = settings.EMBEDDING_N_PROBE
+    ):
+        """Initialize the EmbeddingRecommender.
+
+        Args:
+            max_candidates: Number of nearest accounts to hydrate
+            n_probe: Number of inverted lists scanned per query, trading latency for recall
+        """
+        self.max_candidates = max_candidates
+        self.n_probe = n_probe
+
+    async def get_recommendations(
+        self, client: "Client", actor: str
+    ) -> "list[bsky_models.AppBskyActorDefs.ProfileViewDetailed]":
+        """Get accounts whose embeddings are closest to the mean of the user's follows.
+
+        Args:
+            client: Authenticated Blue Sky client
+            actor: The user's DID
+
+        Returns:
+            List of ProfileViewDetailed objects representing recommended accounts,
+            most similar first
+        """
+        index = get_embedding_index()
+        if index is None:
+            logger.warning("Embedding index has not been built yet")
+            return []
+        try:
+            follows = await crawl_follows(client, actor)
+            candidates = index.similar(follows.dids, self.max_candidates, self.n_probe, exclude=[actor])
+            if not candidates:
+                logger.info(f"None of the {len(follows.dids)} accounts {actor} follows are embedded")
+            return await hydrate_profiles(client, candidates)
+        except Exception as e:
+            logger.error(f"Failed to get embedding recommendations: {e!s}")
+            return []
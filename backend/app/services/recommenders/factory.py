@@ -0,0 +1,60 @@
+"""Recommender construction shared by the API and the offline precompute job."""
+
+from app.core.config import get_settings
+from app.models.recommendations import ScoringMeasure
+from app.services.recommenders.base import BaseRecommender
+from app.services.recommenders.basic import BasicRecommender
+from app.services.recommenders.common_followers import CommonFollowersRecommender
+from app.services.recommenders.embedding import EmbeddingRecommender
+from app.services.recommenders.follow_back import FollowBackRecommender
+from app.services.recommenders.network import NetworkRecommender
+
+
+settings = get_settings()
+
+STRATEGY_REASONS = {
+    "basic": "Popular in your network",
+    "common_followers": "Common connections",
+    "follow_back": "Follows you",
+    "embedding": "Similar to accounts you follow",
+    "network": "Followed by people you follow",
+}
+
+# Strategies whose results depend on the logged-in account rather than the actor passed in
+# (getSuggestions answers for the session's user), so only the user's own session can compute them
+VIEWER_STRATEGIES = frozenset({"basic"})
+
+
+def create_recommender(
+    strategy: str, scoring: ScoringMeasure = ScoringMeasure.COUNT, limit: int | None = None
+) -> BaseRecommender:
+    """Create the recommender for a strategy.
+
+    Args:
+        strategy: Recommendation strategy ('basic', 'common_followers', 'follow_back', 'embedding' or 'network')
+        scoring: Similarity measure used to rank 'common_followers' candidates
+        limit: Number of recommendations the caller needs, used to size the 'basic' suggestion pool
+
+    Returns:
+        Recommender instance
+
+    Raises:
+        ValueError: If the strategy is unknown
+    """
+    if strategy == "basic":
+        return BasicRecommender(limit or settings.SUGGESTION_POOL_MIN_SIZE)
+    if strategy == "common_followers":
+        # Use the configured seed accounts (popular tech accounts by default)
+        return CommonFollowersRecommender(
+            seed_accounts=settings.common_followers_seed_accounts,
+            min_common_follows=2,
+            scoring=scoring,
+            sketch_capacity=settings.common_followers_sketch_capacity,
+        )
+    if strategy == "follow_back":
+        return FollowBackRecommender()
+    if strategy == "embedding":
+        return EmbeddingRecommender()
+    if strategy == "network":
+        return NetworkRecommender()
+    raise ValueError(f"Invalid recommendation strategy: {strategy}")
@@ -0,0 +1,118 @@
+"""Recommendation service suggesting followers the user has not followed back."""
+
+import asyncio
+from typing import TYPE_CHECKING
+
+from app.core.config import get_settings
+from app.core.logger import setup_logger
+from app.services.graph.crawler import FOLLOWERS, FOLLOWS, crawl_follows, get_cached_follows
+from app.services.graph.incremental import sync_graph_set
+from app.services.negative_cache import filter_known_failures
+from app.services.recommenders.base import BaseRecommender
+from app.services.recommenders.hydration import hydrate_profiles
+from app.services.scheduler import Priority, run_job, scheduling_priority
+
+
+if TYPE_CHECKING:
+    from atproto import Client, models as bsky_models
+
+
+logger = setup_logger(__name__)
+settings = get_settings()
+
+# User DID -> background crawl of the candidates whose follows were not cached, at most one per user
+_warmups: dict[str, asyncio.Task] = {}
+
+
+class FollowBackRecommender(BaseRecommender):
+    """Recommender suggesting followers that are not followed back, ranked by mutual connections."""
+
+    def __init__(self, max_candidates: int = settings.FOLLOW_BACK_MAX_CANDIDATES):
+        """Initialize the FollowBackRecommender.
+
+        Args:
+            max_candidates: Number of most recent unreciprocated followers to rank
+        """
+        self.max_candidates = max_candidates
+
+    async def _crawl_candidates(self, client: "Client", candidates: list[str]) -> None:
+        """Crawl the follows of candidates with bounded concurrency so later requests find them cached."""
+        semaphore = asyncio.Semaphore(settings.FOLLOW_BACK_CRAWL_CONCURRENCY)
+
+        async def crawl(candidate: str) -> None:
+            async with semaphore:
+                await crawl_follows(client, candidate)
+
+        await asyncio.gather(*(crawl(candidate) for candidate in candidates), return_exceptions=True)
+
+    def _warm_up(self, client: "Client", did: str, candidates: list[str]) -> None:
+        """Start crawling the candidates as background jobs unless a crawl for the user is still running."""
+        if not candidates or (did in _warmups and not _warmups[did].done()):
+            return
+        with scheduling_priority(Priority.BACKGROUND):
+            task = asyncio.create_task(self._crawl_candidates(client, candidates))
+        _warmups[did] = task
+        task.add_done_callback(lambda done: _warmups.get(did) is done and _warmups.pop(did))
+
+    async def _count_mutuals(
+        self, client: "Client", did: str, candidates: list[str], user_follows: set[str]
+    ) -> list[int]:
+        """Count, for each candidate, the accounts it follows that the user also follows.
+
+        Only follows already in the graph snapshot or the crawl store are counted, so
+        the request never waits on a candidate crawl; candidates without them count
+        zero and are crawled as background jobs for the user's next request.
+
+        Args:
+            client: Authenticated Blue Sky client
+            did: The user's DID
+            candidates: Candidate DIDs
+            user_follows: DIDs the user follows
+
+        Returns:
+            Mutual connection count per candidate, in candidate order
+        """
+        cached = await get_cached_follows(client, candidates)
+        self._warm_up(client, did, [candidate for candidate in candidates if candidate not in cached])
+        return [len(user_follows.intersection(cached.get(candidate, ()))) for candidate in candidates]
+
+    async def get_recommendations(
+        self, client: "Client", actor: str
+    ) -> "list[bsky_models.AppBskyActorDefs.ProfileViewDetailed]":
+        """Get followers of the user that they do not follow back.
+
+        The user's follower and follow sets are synced incrementally against their
+        stored copies, so repeat requests only read the newest pages of each list.
+        Mutual connections are counted from cached follows only (see _count_mutuals).
+
+        Args:
+            client: Authenticated Blue Sky client
+            actor: The user's DID
+
+        Returns:
+            List of ProfileViewDetailed objects representing recommended accounts,
+            sorted by mutual connections, then by most recent follow
+        """
+        try:
+            profile = await run_job(None, client.app.bsky.actor.get_profile, {"actor": actor})
+            followers, follows = await asyncio.gather(
+                sync_graph_set(client, actor, FOLLOWERS, profile.followers_count),
+                sync_graph_set(client, actor, FOLLOWS, profile.follows_count),
+            )
+            logger.info(
+                f"Synced graph of {actor}: +{len(followers.added)} followers, +{len(follows.added)} follows "
+                f"in {followers.pages_fetched + follows.pages_fetched} pages"
+            )
+
+            # Newest unreciprocated followers first, skipping known-unresolvable accounts
+            user_follows = set(follows.dids)
+            candidates = [did for did in followers.dids if did not in user_follows and did != profile.did]
+            candidates = await asyncio.to_thread(filter_known_failures, candidates[: self.max_candidates])
+
+            counts = await self._count_mutuals(client, profile.did, candidates, user_follows)
+            mutuals = dict(zip(candidates, counts, strict=True))
+            recommendations = await hydrate_profiles(client, candidates)
+            return sorted(recommendations, key=lambda recommended: -mutuals[recommended.did])
+        except Exception as e:
+            logger.error(f"Failed to get follow-back recommendations: {e!s}")
+            return []
@@ -0,0 +1,89 @@
+"""Profile hydration shared by recommendation strategies."""
+
+from collections.abc import Iterable
+from typing import TYPE_CHECKING
+
+from app.core.logger import setup_logger
+from app.services.negative_cache import filter_known_failures, record_failure, record_unresolvable
+from app.services.scheduler import run_job
+
+
+if TYPE_CHECKING:
+    from atproto import Client, models as bsky_models
+
+
+logger = setup_logger(__name__)
+
+# Maximum number of actors accepted by app.bsky.actor.getProfiles
+GET_PROFILES_BATCH_SIZE = 25
+
+
+def _hydrate_profiles(client: "Client", dids: list[str]) -> "list[bsky_models.AppBskyActorDefs.ProfileViewDetailed]":
+    """Fetch profiles one by one, skipping and negative-caching permanent failures (blocking)."""
+    profiles = []
+    for did in filter_known_failures(dids):
+        try:
+            profiles.append(client.app.bsky.actor.get_profile(params={"actor": did}))
+        except Exception as e:
+            is_cached = record_failure(did, e)
+            logger.warning(f"Failed to fetch profile for {did}: {e!s}{' (negative-cached)' if is_cached else ''}")
+    return profiles
+
+
+def _hydrate_profiles_batched(
+    client: "Client", dids: list[str]
+) -> "list[bsky_models.AppBskyActorDefs.ProfileViewDetailed]":
+    """Fetch profiles GET_PROFILES_BATCH_SIZE at a time, skipping and negative-caching omitted accounts (blocking)."""
+    dids = filter_known_failures(dids)
+    profiles = {}
+    for start in range(0, len(dids), GET_PROFILES_BATCH_SIZE):
+        batch = dids[start : start + GET_PROFILES_BATCH_SIZE]
+        try:
+            response = client.app.bsky.actor.get_profiles(params={"actors": batch})
+        except Exception as e:
+            logger.warning(f"Failed to fetch a batch of {len(batch)} profiles: {e!s}")
+            continue
+        profiles.update((profile.did, profile) for profile in response.profiles)
+        # getProfiles silently leaves out deleted, suspended and taken-down accounts
+        for did in batch:
+            if did not in profiles:
+                record_unresolvable(did, "NotFound")
+    return [profiles[did] for did in dids if did in profiles]
+
+
+async def hydrate_profiles(
+    client: "Client", dids: Iterable[str]
+) -> "list[bsky_models.AppBskyActorDefs.ProfileViewDetailed]":
+    """Fetch detailed profiles, skipping DIDs in the negative cache.
+
+    Permanent failures (deleted, suspended or taken-down accounts) are added to the
+    negative cache, so they are logged once and skipped by later requests. The
+    negative cache checks and blocking lookups (which may back off on upstream rate
+    limits) run as a scheduler job.
+
+    Args:
+        client: Authenticated Blue Sky client
+        dids: DIDs to hydrate, in the desired order
+
+    Returns:
+        Profiles that could be fetched, in input order
+    """
+    return await run_job(None, _hydrate_profiles, client, list(dids))
+
+
+async def hydrate_profiles_batched(
+    client: "Client", dids: Iterable[str]
+) -> "list[bsky_models.AppBskyActorDefs.ProfileViewDetailed]":
+    """Fetch detailed profiles with batched getProfiles calls, skipping DIDs in the negative cache.
+
+    Uses one upstream request per GET_PROFILES_BATCH_SIZE profiles instead of one
+    per profile. Accounts the batch leaves out are added to the negative cache.
+
+    Args:
+        client: Authenticated Blue Sky client
+        dids: DIDs to hydrate, in the desired order
+
+    Returns:
+        Profiles that could be fetched, in input order
+    """
+    return await run_job(None, _hydrate_profiles_batched, client, list(dids))
@@ -0,0 +1,115 @@
+"""Recommendation service suggesting accounts followed by many of the accounts the user follows."""
+
+import asyncio
+from typing import TYPE_CHECKING
+
+from app.core.config import get_settings
+from app.core.logger import setup_logger
+from app.services.graph.crawler import FOLLOWS, crawl_follows
+from app.services.graph.incremental import sync_graph_set
+from app.services.network_score_store import NetworkScoreStore, get_network_score_store
+from app.services.recommenders.base import BaseRecommender
+from app.services.recommenders.hydration import hydrate_profiles
+from app.services.scheduler import run_job
+
+
+if TYPE_CHECKING:
+    from atproto import Client, models as bsky_models
+
+
+logger = setup_logger(__name__)
+settings = get_settings()
+
+
+class NetworkRecommender(BaseRecommender):
+    """Recommender counting, for each candidate, how many of the user's follows follow it.
+
+    Counts are kept per user in the network score store and updated with the
+    difference between the stored and current follow sets, so following a few
+    recommended accounts only crawls and counts those few accounts, and an
+    unfollow subtracts the follow list stored when it was counted. Counts are
+    rebuilt from scratch once they are older than CRAWL_MAX_AGE_SECONDS, which
+    also picks up changes to the follow lists of accounts the user follows.
+    """
+
+    def __init__(
+        self,
+        max_follows: int = settings.NETWORK_MAX_FOLLOWS,
+        min_count: int = settings.NETWORK_MIN_COUNT,
+        max_candidates: int = settings.NETWORK_MAX_CANDIDATES,
+        store: NetworkScoreStore | None = None,
+    ):
+        """Initialize the NetworkRecommender.
+
+        Args:
+            max_follows: Most recent follows of the user whose follow lists are counted
+            min_count: Minimum number of counted follows that must follow a candidate
+            max_candidates: Number of highest-counted candidates to hydrate
+            store: Store of per-user counts, defaults to the shared store
+        """
+        self.max_follows = max_follows
+        self.min_count = min_count
+        self.max_candidates = max_candidates
+        self.store = store or get_network_score_store()
+
+    async def _follow_lists(self, client: "Client", actors: list[str]) -> dict[str, list[str]]:
+        """Crawl the follow lists of several accounts with bounded concurrency."""
+        semaphore = asyncio.Semaphore(settings.NETWORK_CRAWL_CONCURRENCY)
+
+        async def crawl(actor: str) -> list[str]:
+            async with semaphore:
+                return (await crawl_follows(client, actor)).dids
+
+        return dict(zip(actors, await asyncio.gather(*(crawl(actor) for actor in actors)), strict=True))
+
+    async def rescore(self, client: "Client", did: str, follows: list[str]) -> tuple[int, int, bool]:
+        """Bring a user's stored candidate counts in line with their current follows.
+
+        Args:
+            client: Authenticated Blue Sky client
+            did: The user's DID
+            follows: DIDs the user follows, newest first
+
+        Returns:
+            Tuple of (follows added, follows removed, whether the counts were rebuilt from scratch)
+        """
+        state = await asyncio.to_thread(self.store.get_state, did)
+        rebuild = state is None or state.age_seconds > settings.CRAWL_MAX_AGE_SECONDS
+        previous = set() if rebuild else state.follows
+
+        current = follows[: self.max_follows]
+        added = [follow for follow in current if follow not in previous]
+        removed = list(previous.difference(current))
+        lists = await self._follow_lists(client, added)
+
+        applied = await asyncio.to_thread(self.store.apply, did, None if rebuild else state.version, lists, removed)
+        if not applied:
+            logger.info(f"Counts of {did} were updated concurrently, keeping the newer state")
+        return len(added), len(removed), rebuild
+
+    async def get_recommendations(
+        self, client: "Client", actor: str
+    ) -> "list[bsky_models.AppBskyActorDefs.ProfileViewDetailed]":
+        """Get accounts followed by the most accounts the user follows.
+
+        Args:
+            client: Authenticated Blue Sky client
+            actor: The user's DID
+
+        Returns:
+            List of ProfileViewDetailed objects representing recommended accounts,
+            sorted by how many of the user's follows follow them
+        """
+        try:
+            profile = await run_job(None, client.app.bsky.actor.get_profile, {"actor": actor})
+            follows = await sync_graph_set(client, profile.did, FOLLOWS, profile.follows_count)
+            added, removed, rebuild = await self.rescore(client, profile.did, follows.dids)
+            logger.info(f"Rescored {profile.did}: +{added} -{removed} follows" + (" (rebuilt)" if rebuild else ""))
+
+            ranked = await asyncio.to_thread(
+                self.store.rank, profile.did, self.max_candidates, self.min_count, set(follows.dids)
+            )
+            return await hydrate_profiles(client, [candidate for candidate, _ in ranked])
+        except Exception as e:
+            logger.error(f"Failed to get network recommendations: {e!s}")
+            return []
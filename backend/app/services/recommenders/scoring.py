@@ -0,0 +1,174 @@
+"""Vectorized similarity scoring over the seed x candidate follow matrix.
+
+The compute stages of the common followers strategy are pure functions of
+their inputs, so they can be benchmarked without any network I/O:
+    counting: build_follow_matrix and FollowMatrix.common_counts, or SpaceSaving
+        (see sketches.py) followed by build_follow_matrix over the heavy hitters
+    filtering: select_candidates
+    ranking: order_candidates (score_candidates, then rank_candidates)
+"""
+
+from collections.abc import Collection, Sequence
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from app.models.recommendations import ScoringMeasure
+
+
+if TYPE_CHECKING:
+    from scipy import sparse
+
+
+@dataclass(frozen=True)
+class FollowMatrix:
+    """Sparse seed x candidate adjacency built from crawled follow lists.
+
+    Attributes:
+        candidates: DID of each column, in column order
+        matrix: CSR matrix with a 1 where seed (row) follows candidate (column)
+        degrees: Accounts each seed follows, when the matrix only keeps some of them as candidates
+    """
+
+    candidates: list[str]
+    matrix: "sparse.csr_matrix"
+    degrees: np.ndarray | None = None
+
+    @property
+    def seed_degrees(self) -> np.ndarray:
+        """Number of distinct accounts each seed follows."""
+        return np.diff(self.matrix.indptr) if self.degrees is None else self.degrees
+
+    @property
+    def common_counts(self) -> np.ndarray:
+        """Number of seeds following each candidate."""
+        return np.bincount(self.matrix.indices, minlength=len(self.candidates))
+
+
+def build_follow_matrix(seed_follows: Sequence[Sequence[str]], seed_degrees: np.ndarray | None = None) -> FollowMatrix:
+    """Build the seed x candidate follow matrix.
+
+    Args:
+        seed_follows: Followed DIDs for each seed account, one sequence per seed
+        seed_degrees: Accounts each seed follows, when seed_follows were reduced to some candidates
+
+    Returns:
+        FollowMatrix with duplicate edges collapsed
+    """
+    from scipy import sparse
+
+    column_of: dict[str, int] = {}
+    indptr = np.zeros(len(seed_follows) + 1, dtype=np.int64)
+    columns: list[int] = []
+    for row, follows in enumerate(seed_follows):
+        columns.extend(column_of.setdefault(did, len(column_of)) for did in follows)
+        indptr[row + 1] = len(columns)
+
+    indices = np.fromiter(columns, dtype=np.int32, count=len(columns))
+    data = np.ones(len(columns), dtype=np.float32)
+    matrix = sparse.csr_matrix((data, indices, indptr), shape=(len(seed_follows), len(column_of)))
+    matrix.sum_duplicates()
+    matrix.data[:] = 1.0
+    return FollowMatrix(candidates=list(column_of), matrix=matrix, degrees=seed_degrees)
+
+
+def select_candidates(follow_matrix: FollowMatrix, min_common_follows: int, exclude: Collection[str]) -> dict[str, int]:
+    """Select candidates followed by enough seeds that are not excluded.
+
+    Args:
+        follow_matrix: Seed x candidate follow matrix
+        min_common_follows: Minimum number of seeds that must follow a candidate
+        exclude: DIDs that may not be selected, such as accounts the user already follows
+
+    Returns:
+        Column index of each selected candidate DID, in column order
+    """
+    candidates = follow_matrix.candidates
+    return {
+        candidates[column]: column
+        for column in np.flatnonzero(follow_matrix.common_counts >= min_common_follows).tolist()
+        if candidates[column] not in exclude
+    }
+
+
+def score_candidates(
+    follow_matrix: FollowMatrix,
+    measure: ScoringMeasure,
+    columns: np.ndarray | None = None,
+    follower_counts: np.ndarray | None = None,
+) -> np.ndarray:
+    """Score candidates with the selected similarity measure.
+
+    Measures, for a candidate c followed by the seed set S(c) out of n seeds:
+        count: |S(c)|
+        adamic_adar: sum over s in S(c) of 1 / log(deg(s)), so seeds that follow
+            fewer accounts carry more signal
+        jaccard: |S(c)| / |seeds U followers(c)|, using the follower count of c
+            (falls back to |S(c)| / n when unknown)
+        popularity: |S(c)| / log2(2 + followers(c)), damping mega-accounts
+
+    Args:
+        follow_matrix: Seed x candidate follow matrix
+        measure: Similarity measure to compute
+        columns: Candidate column indices to score, defaults to all candidates
+        follower_counts: Follower count per scored candidate; negative values mean unknown
+
+    Returns:
+        Float64 score per scored candidate, aligned with `columns`
+    """
+    matrix = follow_matrix.matrix if columns is None else follow_matrix.matrix[:, columns]
+    counts = np.asarray(matrix.sum(axis=0), dtype=np.float64).ravel()
+
+    if measure is ScoringMeasure.COUNT:
+        return counts
+
+    if measure is ScoringMeasure.ADAMIC_ADAR:
+        weights = 1.0 / np.log(np.maximum(follow_matrix.seed_degrees, 2).astype(np.float64))
+        return np.asarray(matrix.T @ weights, dtype=np.float64).ravel()
+
+    followers = np.zeros_like(counts) if follower_counts is None else np.asarray(follower_counts, dtype=np.float64)
+    followers = np.where(followers < 0, 0.0, followers)
+
+    if measure is ScoringMeasure.JACCARD:
+        num_seeds = follow_matrix.matrix.shape[0]
+        # Unknown follower counts fall back to the seed set as the union; known ones are clamped
+        # to |S(c)| in case the profile count is stale
+        union = np.where(followers > 0, np.maximum(num_seeds + followers - counts, counts), num_seeds)
+        return np.divide(counts, union, out=np.zeros_like(counts), where=union > 0)
+
+    return counts / np.log2(2.0 + followers)
+
+
+def rank_candidates(scores: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    """Order candidates by score, breaking ties by common seed count.
+
+    Args:
+        scores: Score per candidate
+        counts: Common seed count per candidate
+
+    Returns:
+        Candidate positions sorted best first
+    """
+    return np.lexsort((-counts, -scores))
+
+
+def order_candidates(
+    follow_matrix: FollowMatrix,
+    measure: ScoringMeasure,
+    columns: np.ndarray,
+    follower_counts: np.ndarray | None = None,
+) -> np.ndarray:
+    """Score candidates with the selected measure and order them best first.
+
+    Args:
+        follow_matrix: Seed x candidate follow matrix
+        measure: Similarity measure to rank by
+        columns: Candidate column indices to rank
+        follower_counts: Follower count per ranked candidate; negative values mean unknown
+
+    Returns:
+        Positions into `columns` sorted best first
+    """
+    scores = score_candidates(follow_matrix, measure, columns, follower_counts)
+    return rank_candidates(scores, follow_matrix.common_counts[columns])
@@ -0,0 +1,124 @@
+"""Fixed-memory heavy-hitter counting for large seed sets.
+
+SpaceSaving (Metwally et al., 2005) monitors at most `capacity` items. An
+unmonitored item replaces the item with the lowest count and inherits that
+count (plus one) as an overestimate. Over a stream of N updates:
+    - every estimated count overestimates the true count by at most its
+      recorded error, and every error is at most min_count <= N / capacity;
+    - every item whose true count exceeds min_count is monitored, so no
+      candidate followed by more than min_count seeds can be missed.
+
+Candidates found this way can be recounted exactly on a second pass over the
+stream, so the only approximation left is the possible omission of candidates
+with true count <= min_count. When min_count is below min_common_follows the
+result is identical to exact counting.
+"""
+
+from collections.abc import Hashable, Iterable
+
+
+class SpaceSaving:
+    """Space-Saving summary with O(1) updates, tracking the most frequent items of a stream."""
+
+    def __init__(self, capacity: int):
+        """Initialize an empty summary.
+
+        Args:
+            capacity: Maximum number of monitored items, which bounds memory use
+        """
+        if capacity < 1:
+            raise ValueError("Capacity must be positive")
+        self.capacity = capacity
+        self.total = 0
+        self._counts: dict[Hashable, int] = {}
+        self._errors: dict[Hashable, int] = {}
+        # Count -> monitored items with that count
+        self._buckets: dict[int, dict[Hashable, None]] = {}
+        self._min_count = 0
+
+    def __len__(self) -> int:
+        """Number of monitored items."""
+        return len(self._counts)
+
+    @property
+    def min_count(self) -> int:
+        """Upper bound on the true count of any unmonitored item and on every estimate's error."""
+        return self._min_count if len(self._counts) >= self.capacity else 0
+
+    def _move(self, item: Hashable, count: int) -> None:
+        """Move a monitored item from its bucket to the bucket of `count`."""
+        old = self._counts.get(item)
+        if old is not None:
+            bucket = self._buckets[old]
+            del bucket[item]
+            if not bucket:
+                del self._buckets[old]
+                if old == self._min_count:
+                    self._min_count = count
+        self._counts[item] = count
+        self._buckets.setdefault(count, {})[item] = None
+        if count < self._min_count or len(self._counts) == 1:
+            self._min_count = count
+
+    def update(self, item: Hashable) -> None:
+        """Count one occurrence of an item.
+
+        Args:
+            item: Item seen in the stream
+        """
+        self.total += 1
+        count = self._counts.get(item)
+        if count is not None:
+            self._move(item, count + 1)
+            return
+        if len(self._counts) < self.capacity:
+            self._errors[item] = 0
+            self._move(item, 1)
+            return
+
+        # Evict an item with the lowest count (any tie-break keeps the guarantees); the newcomer
+        # inherits its count as error
+        bucket = self._buckets[self._min_count]
+        evicted, _ = bucket.popitem()
+        del self._counts[evicted], self._errors[evicted]
+        error = self._min_count
+        if not bucket:
+            del self._buckets[error]
+            self._min_count = error + 1
+        self._errors[item] = error
+        self._move(item, error + 1)
+
+    def update_all(self, items: Iterable[Hashable]) -> None:
+        """Count one occurrence of each item.
+
+        Args:
+            items: Items seen in the stream
+        """
+        for item in items:
+            self.update(item)
+
+    def estimate(self, item: Hashable) -> tuple[int, int]:
+        """Get the estimated count of an item and its maximum overestimate.
+
+        Args:
+            item: Item to look up
+
+        Returns:
+            Tuple of (estimated count, error), so the true count lies in [count - error, count];
+            (0, min_count) for unmonitored items
+        """
+        if item not in self._counts:
+            return 0, self.min_count
+        return self._counts[item], self._errors[item]
+
+    def frequent(self, threshold: int) -> dict[Hashable, int]:
+        """Get every item that may occur at least `threshold` times.
+
+        Args:
+            threshold: Minimum true count of interest
+
+        Returns:
+            Estimated count of each monitored item whose estimate reaches the threshold,
+            a superset of the items whose true count does if min_count < threshold
+        """
+        return {item: count for item, count in self._counts.items() if count >= threshold}
@@ -0,0 +1,63 @@
+"""Shared cache of serialized recommendation responses."""
+
+import orjson
+
+from app.core.config import get_settings
+from app.services.state.factory import get_state_backend
+
+
+settings = get_settings()
+
+
+def build_result_key(did: str, *parts: str) -> str:
+    """Build the cache key for a user's recommendation response.
+
+    Args:
+        did: User's decentralized identifier
+        parts: Request parameters that change the response (strategy, scoring, limit, ...)
+
+    Returns:
+        State backend key
+    """
+    return ":".join(("results", did, *parts))
+
+
+def get_cached_response(key: str) -> tuple[str, bytes] | None:
+    """Get a cached response.
+
+    Args:
+        key: Key built with build_result_key
+
+    Returns:
+        Tuple of (ETag, JSON body), or None on a miss
+    """
+    entry = get_state_backend().get(key)
+    if not entry:
+        return None
+    etag, _, body = entry.partition(b"\n")
+    return etag.decode(), body
+
+
+def cache_response(key: str, etag: str, body: bytes) -> None:
+    """Cache a serialized response for RESULT_CACHE_TTL_SECONDS.
+
+    Args:
+        key: Key built with build_result_key
+        etag: ETag of the response
+        body: JSON body of the response
+    """
+    if settings.RESULT_CACHE_TTL_SECONDS <= 0:
+        return
+    get_state_backend().set(key, etag.encode() + b"\n" + body, ttl_seconds=settings.RESULT_CACHE_TTL_SECONDS)
+
+
+def response_dids(body: bytes) -> list[str]:
+    """Get the recommended DIDs of a cached response.
+
+    Args:
+        body: JSON body of the response
+
+    Returns:
+        DIDs of the recommendations, in rank order
+    """
+    return [item["did"] for item in orjson.loads(body)["recommendations"]]
@@ -0,0 +1,245 @@
+"""Priority scheduler for blocking crawl and hydration jobs.
+
+Every upstream crawl page, follows crawl and profile hydration runs as a job on
+a dedicated pool of SCHEDULER_WORKERS worker threads instead of its own
+asyncio.to_thread call. The pool is owned by the scheduler rather than borrowed
+from the loop's default executor, which is smaller on small hosts and shared
+with every other to_thread call, so a job counted as running really runs.
+
+Jobs carry a priority class: work done for a user waiting on a response is
+INTERACTIVE, everything else (warmup, prefetch, precompute, refreshes) is
+BACKGROUND.
+
+Queued interactive jobs always start before queued background jobs, and
+background jobs may never occupy the last SCHEDULER_INTERACTIVE_RESERVED
+workers, so an interactive job never waits behind a wall of background work.
+Running jobs are not interrupted. Jobs with the same key share one execution:
+a caller asking for a job that is already queued or running awaits the same
+result, and an interactive caller promotes a queued background job.
+
+The priority of a caller is taken from a context variable, so setting it once
+in the request handler covers every crawl and hydration the recommender makes,
+including those in tasks it spawns.
+"""
+
+import asyncio
+import contextlib
+import heapq
+import itertools
+import time
+import weakref
+from collections.abc import Callable, Hashable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Any, TypeVar
+
+from app.core.config import get_settings
+from app.models.metrics import PriorityMetrics, SchedulerMetrics
+
+
+T = TypeVar("T")
+
+
+class Priority(IntEnum):
+    """Scheduling class of a job, lower values run first."""
+
+    INTERACTIVE = 0
+    BACKGROUND = 1
+
+
+_priority: ContextVar[Priority] = ContextVar("scheduler_priority", default=Priority.BACKGROUND)
+_schedulers: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, JobScheduler]" = weakref.WeakKeyDictionary()
+
+
+@contextlib.contextmanager
+def scheduling_priority(priority: Priority) -> Iterator[None]:
+    """Run the jobs submitted inside the block (and in tasks created inside it) with a priority.
+
+    Args:
+        priority: Priority class of the jobs
+    """
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+@dataclass(eq=False)
+class _Job:
+    """A blocking call waiting for or holding a worker."""
+
+    key: Hashable | None
+    fn: Callable[..., Any]
+    args: tuple
+    priority: Priority
+    future: asyncio.Future
+    enqueued_at: float = field(default_factory=time.perf_counter)
+    is_started: bool = False
+
+
+class JobScheduler:
+    """Runs blocking jobs on a bounded set of worker threads in priority order."""
+
+    def __init__(self, workers: int, interactive_reserved: int):
+        """Initialize the scheduler.
+
+        Args:
+            workers: Jobs allowed to run at once
+            interactive_reserved: Workers background jobs may not use
+        """
+        self.workers = workers
+        self.interactive_reserved = min(interactive_reserved, workers - 1)
+        self._heap: list[tuple[int, int, _Job]] = []
+        self._sequence = itertools.count()
+        self._jobs: dict[Hashable, _Job] = {}
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="scheduler")
+        self._metrics = SchedulerMetrics(
+            workers=workers,
+            interactive_reserved=self.interactive_reserved,
+            priorities={priority.name.lower(): PriorityMetrics() for priority in Priority},
+        )
+
+    def _stats(self, priority: Priority) -> PriorityMetrics:
+        """Get the counters of a priority class."""
+        return self._metrics.priorities[priority.name.lower()]
+
+    def _can_start(self, priority: Priority) -> bool:
+        """Check whether a job of a priority class may take a worker now."""
+        running = sum(stats.running for stats in self._metrics.priorities.values())
+        if running >= self.workers:
+            return False
+        background = self._stats(Priority.BACKGROUND).running
+        return priority == Priority.INTERACTIVE or background < self.workers - self.interactive_reserved
+
+    def _push(self, job: _Job) -> None:
+        """Queue a job under its current priority."""
+        heapq.heappush(self._heap, (job.priority, next(self._sequence), job))
+
+    def _dispatch(self) -> None:
+        """Start queued jobs, highest priority first, while workers are available."""
+        while self._heap:
+            priority, _, job = self._heap[0]
+            if job.is_started or priority != job.priority:
+                # Stale entry of a job that was promoted or already started
+                heapq.heappop(self._heap)
+                continue
+            if not self._can_start(job.priority):
+                return
+            heapq.heappop(self._heap)
+            job.is_started = True
+            stats = self._stats(job.priority)
+            stats.queued -= 1
+            stats.running += 1
+            stats.wait_seconds_total += time.perf_counter() - job.enqueued_at
+            asyncio.get_running_loop().create_task(self._execute(job))
+
+    async def _execute(self, job: _Job) -> None:
+        """Run a job in a worker thread and publish its outcome."""
+        try:
+            result = await asyncio.get_running_loop().run_in_executor(self._executor, job.fn, *job.args)
+        except Exception as e:
+            job.future.set_exception(e)
+        else:
+            job.future.set_result(result)
+        finally:
+            stats = self._stats(job.priority)
+            stats.running -= 1
+            stats.completed_total += 1
+            if job.key is not None:
+                self._jobs.pop(job.key, None)
+            self._dispatch()
+
+    async def run(
+        self, key: Hashable | None, fn: Callable[..., T], *args: object, priority: Priority | None = None
+    ) -> T:
+        """Run a blocking call as a scheduled job and wait for its result.
+
+        Args:
+            key: Identity of the job for deduplication, or None to always run it
+            fn: Blocking callable
+            args: Positional arguments of the callable
+            priority: Priority class, defaults to the caller's scheduling priority
+
+        Returns:
+            The callable's return value
+
+        Raises:
+            Exception: Whatever the callable raised
+        """
+        priority = _priority.get() if priority is None else priority
+        job = self._jobs.get(key) if key is not None else None
+        if job:
+            self._metrics.deduplicated_total += 1
+            if priority < job.priority and not job.is_started:
+                self._stats(job.priority).queued -= 1
+                self._stats(priority).queued += 1
+                job.priority = priority
+                self._metrics.promoted_total += 1
+                self._push(job)
+                self._dispatch()
+            return await asyncio.shield(job.future)
+
+        future = asyncio.get_running_loop().create_future()
+        # Callers may all be cancelled; mark the outcome as retrieved so it is not reported as lost
+        future.add_done_callback(lambda done: done.cancelled() or done.exception())
+        job = _Job(key=key, fn=fn, args=args, priority=priority, future=future)
+        if key is not None:
+            self._jobs[key] = job
+        stats = self._stats(priority)
+        stats.submitted_total += 1
+        stats.queued += 1
+        self._push(job)
+        self._dispatch()
+        return await asyncio.shield(future)
+
+    def close(self) -> None:
+        """Stop the worker threads once the jobs they are running finish."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def metrics(self) -> SchedulerMetrics:
+        """Snapshot the scheduler's state and counters.
+
+        Returns:
+            SchedulerMetrics for this scheduler
+        """
+        return self._metrics.model_copy(deep=True)
+
+
+def get_scheduler() -> JobScheduler:
+    """Get the scheduler of the running event loop.
+
+    Each event loop gets its own scheduler, since queued jobs and their futures
+    belong to the loop they were submitted on.
+
+    Returns:
+        JobScheduler configured from the SCHEDULER_* settings
+    """
+    loop = asyncio.get_running_loop()
+    if loop not in _schedulers:
+        settings = get_settings()
+        _schedulers[loop] = JobScheduler(settings.SCHEDULER_WORKERS, settings.SCHEDULER_INTERACTIVE_RESERVED)
+    return _schedulers[loop]
+
+
+def close_scheduler() -> None:
+    """Stop the worker threads of the running event loop's scheduler, if it has one."""
+    scheduler = _schedulers.pop(asyncio.get_running_loop(), None)
+    if scheduler:
+        scheduler.close()
+
+
+async def run_job(key: Hashable | None, fn: Callable[..., T], *args: object) -> T:
+    """Run a blocking call on the running loop's scheduler with the caller's priority.
+
+    Args:
+        key: Identity of the job for deduplication, or None to always run it
+        fn: Blocking callable
+        args: Positional arguments of the callable
+
+    Returns:
+        The callable's return value
+    """
+    return await get_scheduler().run(key, fn, *args)
@@ -0,0 +1,119 @@
+"""Base classes and protocols for shared state backends."""
+
+from abc import ABC, abstractmethod
+from typing import Protocol
+
+
+class StateBackendProtocol(Protocol):
+    """Protocol defining the interface for key-value state shared between workers."""
+
+    def get(self, key: str) -> bytes | None:
+        """Get the value stored under a key.
+
+        Args:
+            key: Namespaced key (e.g. "sessions:did:plc:...")
+
+        Returns:
+            The stored value, or None if missing or expired
+        """
+        ...
+
+    def set(self, key: str, value: bytes, ttl_seconds: float | None = None) -> None:
+        """Store a value under a key.
+
+        Args:
+            key: Namespaced key
+            value: Value to store
+            ttl_seconds: Time to live, or None to keep the value until deleted
+        """
+        ...
+
+    def delete(self, key: str) -> None:
+        """Delete a key if present.
+
+        Args:
+            key: Namespaced key
+        """
+        ...
+
+    def keys(self, prefix: str) -> list[str]:
+        """List live keys starting with a prefix.
+
+        Args:
+            prefix: Key prefix, usually a namespace such as "sessions:"
+
+        Returns:
+            Matching keys that have not expired
+        """
+        ...
+
+    def purge_expired(self) -> int:
+        """Delete expired entries.
+
+        Returns:
+            Number of deleted entries
+        """
+        ...
+
+
+class BaseStateBackend(ABC):
+    """Abstract base class for state backends."""
+
+    @abstractmethod
+    def get(self, key: str) -> bytes | None:
+        """Get the value stored under a key.
+
+        Args:
+            key: Namespaced key
+
+        Returns:
+            The stored value, or None if missing or expired
+        """
+        pass
+
+    @abstractmethod
+    def set(self, key: str, value: bytes, ttl_seconds: float | None = None) -> None:
+        """Store a value under a key.
+
+        Args:
+            key: Namespaced key
+            value: Value to store
+            ttl_seconds: Time to live, or None to keep the value until deleted
+        """
+        pass
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """Delete a key if present.
+
+        Args:
+            key: Namespaced key
+        """
+        pass
+
+    @abstractmethod
+    def keys(self, prefix: str) -> list[str]:
+        """List live keys starting with a prefix.
+
+        Args:
+            prefix: Key prefix
+
+        Returns:
+            Matching keys that have not expired
+        """
+        pass
+
+    @abstractmethod
+    def purge_expired(self) -> int:
+        """Delete expired entries.
+
+        Expired entries are otherwise only dropped when their key is read again.
+
+        Returns:
+            Number of deleted entries
+        """
+        pass
+
+    def close(self) -> None:
+        """Release resources held by the backend."""
+        return None
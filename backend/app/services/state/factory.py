@@ -0,0 +1,51 @@
+"""Factory for the configured shared state backend."""
+
+import asyncio
+from functools import lru_cache
+
+from app.core.config import get_settings
+from app.core.logger import setup_logger
+from app.services.state.base import BaseStateBackend
+from app.services.state.memory import MemoryStateBackend
+from app.services.state.shared_memory import SharedMemoryStateBackend
+from app.services.state.sqlite import SqliteStateBackend
+
+
+logger = setup_logger(__name__)
+
+
+@lru_cache
+def get_state_backend() -> BaseStateBackend:
+    """Get the state backend selected by STATE_BACKEND.
+
+    Returns:
+        BaseStateBackend: "memory" (per worker), "sqlite" or "shared_memory" (shared by all workers)
+
+    Raises:
+        ValueError: If STATE_BACKEND names an unknown backend
+    """
+    settings = get_settings()
+    if settings.STATE_BACKEND == "memory":
+        return MemoryStateBackend()
+    if settings.STATE_BACKEND == "sqlite":
+        return SqliteStateBackend(settings.STATE_SQLITE_PATH)
+    if settings.STATE_BACKEND == "shared_memory":
+        return SharedMemoryStateBackend(settings.STATE_SHM_DIR)
+    raise ValueError(f"Invalid state backend: {settings.STATE_BACKEND}")
+
+
+async def run_state_purger() -> None:
+    """Periodically delete expired entries from the state backend, off the event loop.
+
+    Cached results, negative lookups, suggestion pools and graph sets are otherwise only
+    dropped when their key is read again, so the store would grow without bound.
+    """
+    settings = get_settings()
+    while True:
+        await asyncio.sleep(settings.STATE_PURGE_INTERVAL_SECONDS)
+        try:
+            purged = await asyncio.to_thread(get_state_backend().purge_expired)
+            if purged:
+                logger.info(f"Purged {purged} expired state entries")
+        except Exception as e:
+            logger.error(f"Failed to purge expired state entries: {e!s}")
@@ -0,0 +1,87 @@
+"""In-process state backend, private to a single worker."""
+
+import threading
+import time
+
+from app.services.state.base import BaseStateBackend
+
+
+class MemoryStateBackend(BaseStateBackend):
+    """State backend holding values in a process-local dictionary."""
+
+    def __init__(self):
+        """Initialize an empty store."""
+        self._lock = threading.Lock()
+        self._entries: dict[str, tuple[bytes, float | None]] = {}
+
+    def get(self, key: str) -> bytes | None:
+        """Get the value stored under a key.
+
+        Args:
+            key: Namespaced key
+
+        Returns:
+            The stored value, or None if missing or expired
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if not entry:
+                return None
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.time():
+                del self._entries[key]
+                return None
+            return value
+
+    def set(self, key: str, value: bytes, ttl_seconds: float | None = None) -> None:
+        """Store a value under a key.
+
+        Args:
+            key: Namespaced key
+            value: Value to store
+            ttl_seconds: Time to live, or None to keep the value until deleted
+        """
+        expires_at = None if ttl_seconds is None else time.time() + ttl_seconds
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+
+    def delete(self, key: str) -> None:
+        """Delete a key if present.
+
+        Args:
+            key: Namespaced key
+        """
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def keys(self, prefix: str) -> list[str]:
+        """List live keys starting with a prefix.
+
+        Args:
+            prefix: Key prefix
+
+        Returns:
+            Matching keys that have not expired
+        """
+        now = time.time()
+        with self._lock:
+            return [
+                key
+                for key, (_, expires_at) in self._entries.items()
+                if key.startswith(prefix) and (expires_at is None or expires_at > now)
+            ]
+
+    def purge_expired(self) -> int:
+        """Delete expired entries.
+
+        Returns:
+            Number of deleted entries
+        """
+        now = time.time()
+        with self._lock:
+            expired = [
+                key for key, (_, expires_at) in self._entries.items() if expires_at is not None and expires_at <= now
+            ]
+            for key in expired:
+                del self._entries[key]
+        return len(expired)
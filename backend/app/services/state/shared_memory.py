@@ -0,0 +1,149 @@
+"""Shared-memory state backend for workers on one host, backed by a tmpfs directory."""
+
+import hashlib
+import os
+import struct
+import tempfile
+import time
+from pathlib import Path
+
+from app.services.state.base import BaseStateBackend
+
+
+# expires_at (0.0 = never), key length
+_HEADER = struct.Struct("<dI")
+# Temporary files older than this were left behind by a writer that died before renaming them
+_STALE_TEMP_SECONDS = 300.0
+
+
+class SharedMemoryStateBackend(BaseStateBackend):
+    """State backend storing one file per key in a RAM-backed directory such as /dev/shm.
+
+    Writes go to a temporary file that is atomically renamed over the entry, so
+    readers in other workers never see partial values and no lock is needed.
+    """
+
+    def __init__(self, directory: str):
+        """Create the backing directory if needed.
+
+        Args:
+            directory: Directory on a tmpfs mount shared by all workers
+        """
+        self._directory = Path(directory)
+        self._directory.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, key: str) -> Path:
+        """Map a key to its entry file."""
+        return self._directory / hashlib.sha1(key.encode()).hexdigest()
+
+    @staticmethod
+    def _read(path: Path) -> tuple[str, bytes, float] | None:
+        """Read an entry file, returning (key, value, expires_at) or None if unreadable."""
+        try:
+            data = path.read_bytes()
+        except FileNotFoundError:
+            return None
+        if len(data) < _HEADER.size:
+            return None
+        expires_at, key_length = _HEADER.unpack_from(data)
+        key_end = _HEADER.size + key_length
+        return data[_HEADER.size : key_end].decode(), data[key_end:], expires_at
+
+    @staticmethod
+    def _is_expired(expires_at: float) -> bool:
+        """Check whether an entry has expired."""
+        return expires_at != 0.0 and expires_at <= time.time()
+
+    def get(self, key: str) -> bytes | None:
+        """Get the value stored under a key.
+
+        Args:
+            key: Namespaced key
+
+        Returns:
+            The stored value, or None if missing or expired
+        """
+        path = self._path(key)
+        entry = self._read(path)
+        if not entry:
+            return None
+        stored_key, value, expires_at = entry
+        if stored_key != key:
+            return None
+        if self._is_expired(expires_at):
+            path.unlink(missing_ok=True)
+            return None
+        return value
+
+    def set(self, key: str, value: bytes, ttl_seconds: float | None = None) -> None:
+        """Store a value under a key.
+
+        Args:
+            key: Namespaced key
+            value: Value to store
+            ttl_seconds: Time to live, or None to keep the value until deleted
+        """
+        expires_at = 0.0 if ttl_seconds is None else time.time() + ttl_seconds
+        encoded_key = key.encode()
+        fd, temp_path = tempfile.mkstemp(dir=self._directory, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as temp_file:
+                temp_file.write(_HEADER.pack(expires_at, len(encoded_key)))
+                temp_file.write(encoded_key)
+                temp_file.write(value)
+            os.replace(temp_path, self._path(key))
+        except BaseException:
+            Path(temp_path).unlink(missing_ok=True)
+            raise
+
+    def delete(self, key: str) -> None:
+        """Delete a key if present.
+
+        Args:
+            key: Namespaced key
+        """
+        self._path(key).unlink(missing_ok=True)
+
+    def keys(self, prefix: str) -> list[str]:
+        """List live keys starting with a prefix.
+
+        Scans every entry, so this is meant for startup and maintenance rather than request paths.
+
+        Args:
+            prefix: Key prefix
+
+        Returns:
+            Matching keys that have not expired
+        """
+        matching = []
+        for path in self._directory.iterdir():
+            if path.name.startswith(".tmp-"):
+                continue
+            entry = self._read(path)
+            if entry and entry[0].startswith(prefix) and not self._is_expired(entry[2]):
+                matching.append(entry[0])
+        return matching
+
+    def purge_expired(self) -> int:
+        """Delete expired entries and temporary files left behind by interrupted writes.
+
+        An entry rewritten by another worker between the read and the unlink may be
+        deleted too, which only costs that worker a cache miss.
+
+        Returns:
+            Number of deleted entries
+        """
+        purged = 0
+        for path in self._directory.iterdir():
+            if path.name.startswith(".tmp-"):
+                try:
+                    if path.stat().st_mtime < time.time() - _STALE_TEMP_SECONDS:
+                        path.unlink(missing_ok=True)
+                except FileNotFoundError:
+                    pass
+                continue
+            entry = self._read(path)
+            if entry and self._is_expired(entry[2]):
+                path.unlink(missing_ok=True)
+                purged += 1
+        return purged
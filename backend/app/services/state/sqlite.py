@@ -0,0 +1,109 @@
+"""SQLite state backend shared by every worker on the host through one database file."""
+
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from app.services.state.base import BaseStateBackend
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS state (
+    key TEXT PRIMARY KEY,
+    value BLOB NOT NULL,
+    expires_at REAL
+);
+CREATE INDEX IF NOT EXISTS state_expires_at ON state (expires_at);
+"""
+
+
+class SqliteStateBackend(BaseStateBackend):
+    """State backend persisted in a WAL-mode SQLite database."""
+
+    def __init__(self, path: str):
+        """Open (and create if needed) the state database.
+
+        Args:
+            path: Filesystem path of the SQLite database
+        """
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=30.0)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def get(self, key: str) -> bytes | None:
+        """Get the value stored under a key.
+
+        Args:
+            key: Namespaced key
+
+        Returns:
+            The stored value, or None if missing or expired
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM state WHERE key = ? AND (expires_at IS NULL OR expires_at > ?)",
+                (key, time.time()),
+            ).fetchone()
+        return row[0] if row else None
+
+    def set(self, key: str, value: bytes, ttl_seconds: float | None = None) -> None:
+        """Store a value under a key.
+
+        Args:
+            key: Namespaced key
+            value: Value to store
+            ttl_seconds: Time to live, or None to keep the value until deleted
+        """
+        expires_at = None if ttl_seconds is None else time.time() + ttl_seconds
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO state (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, value, expires_at),
+            )
+
+    def delete(self, key: str) -> None:
+        """Delete a key if present.
+
+        Args:
+            key: Namespaced key
+        """
+        with self._lock:
+            self._conn.execute("DELETE FROM state WHERE key = ?", (key,))
+
+    def keys(self, prefix: str) -> list[str]:
+        """List live keys starting with a prefix.
+
+        Args:
+            prefix: Key prefix
+
+        Returns:
+            Matching keys that have not expired
+        """
+        upper_bound = prefix + "\U0010ffff"
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key FROM state WHERE key >= ? AND key < ? AND (expires_at IS NULL OR expires_at > ?)",
+                (prefix, upper_bound, time.time()),
+            ).fetchall()
+        return [key for (key,) in rows]
+
+    def purge_expired(self) -> int:
+        """Delete expired entries.
+
+        Returns:
+            Number of deleted entries
+        """
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM state WHERE expires_at IS NOT NULL AND expires_at <= ?", (time.time(),)
+            )
+        return cursor.rowcount
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
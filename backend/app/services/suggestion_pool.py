@@ -0,0 +1,160 @@
+"""Per-user pool of hydrated Blue Sky suggestions, paged in lazily and cached in the state backend."""
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+import orjson
+
+from app.core.config import get_settings
+from app.core.logger import setup_logger
+from app.services.graph.incremental import get_newest_follows
+from app.services.negative_cache import filter_known_failures
+from app.services.recommenders.hydration import hydrate_profiles_batched
+from app.services.scheduler import run_job
+from app.services.state.factory import get_state_backend
+
+
+if TYPE_CHECKING:
+    from atproto import Client, models as bsky_models
+
+
+logger = setup_logger(__name__)
+settings = get_settings()
+
+
+@dataclass
+class SuggestionPool:
+    """Suggestions fetched so far for one user.
+
+    Attributes:
+        profiles: Hydrated ProfileViewDetailed dictionaries, in suggestion order
+        cursor: getSuggestions cursor of the next page, None before the first page
+        is_exhausted: Whether upstream has no further suggestions
+        created_at: Epoch seconds the first page was fetched
+        pending: Suggested DIDs a failed getProfiles batch left unhydrated, retried on the next call
+        checked_at: Epoch seconds the pool was last checked against the user's newest follows,
+            None if it has not been since its first page was fetched
+    """
+
+    profiles: list[dict]
+    cursor: str | None
+    is_exhausted: bool
+    created_at: float
+    pending: list[str] = field(default_factory=list)
+    checked_at: float | None = None
+
+
+def _key(did: str) -> str:
+    """Build the state backend key holding a user's pool."""
+    return f"suggestions:{did}"
+
+
+def _load(did: str) -> SuggestionPool | None:
+    """Load a user's cached pool, or None if absent or expired."""
+    entry = get_state_backend().get(_key(did))
+    return SuggestionPool(**orjson.loads(entry)) if entry else None
+
+
+def _save(did: str, pool: SuggestionPool) -> None:
+    """Cache a pool until SUGGESTION_POOL_TTL_SECONDS after its first page was fetched."""
+    ttl_seconds = settings.SUGGESTION_POOL_TTL_SECONDS - (time.time() - pool.created_at)
+    if ttl_seconds > 0:
+        get_state_backend().set(_key(did), orjson.dumps(pool.__dict__), ttl_seconds=ttl_seconds)
+
+
+async def _hydrate_into(client: "Client", pool: SuggestionPool, dids: list[str]) -> bool:
+    """Append the hydrated profiles of suggested DIDs to the pool, keeping the ones a failed batch left out.
+
+    Returns:
+        False if a getProfiles batch failed and left suggestions pending
+    """
+    profiles = await hydrate_profiles_batched(client, dids)
+    pool.profiles.extend(profile.model_dump(mode="json", by_alias=True, exclude_none=True) for profile in profiles)
+    hydrated = {profile.did for profile in profiles}
+    # Accounts getProfiles leaves out for good are negative-cached; the rest were in a batch that failed
+    pending = await asyncio.to_thread(filter_known_failures, [did for did in dids if did not in hydrated])
+    pool.pending.extend(pending)
+    return not pending
+
+
+async def _extend(client: "Client", pool: SuggestionPool) -> bool:
+    """Fetch the next page of suggestions and append the profiles that are new to the pool.
+
+    Returns:
+        False if hydrating the page failed
+    """
+    params = {"limit": settings.SUGGESTION_PAGE_SIZE, "cursor": pool.cursor}
+    response = await run_job(None, client.app.bsky.actor.get_suggestions, params)
+    known = {profile["did"] for profile in pool.profiles}.union(pool.pending)
+    dids = [actor.did for actor in response.actors if actor.did not in known]
+    is_hydrated = await _hydrate_into(client, pool, dids)
+    pool.cursor = response.cursor
+    pool.is_exhausted = not response.cursor or not response.actors
+    return is_hydrated
+
+
+async def _drop_followed(client: "Client", did: str, pool: SuggestionPool) -> bool:
+    """Drop accounts the user followed since the pool was last checked, at most every CRAWL_VIEWER_MAX_AGE_SECONDS.
+
+    Returns:
+        True if the pool was checked and needs saving
+    """
+    now = time.time()
+    if now - (pool.checked_at or pool.created_at) <= settings.CRAWL_VIEWER_MAX_AGE_SECONDS:
+        return False
+    followed = await get_newest_follows(client, did)
+    if followed is None:
+        return False
+    pool.profiles = [profile for profile in pool.profiles if profile["did"] not in followed]
+    pool.pending = [pending for pending in pool.pending if pending not in followed]
+    pool.checked_at = now
+    return True
+
+
+async def get_suggestions(
+    client: "Client", did: str, limit: int
+) -> "list[bsky_models.AppBskyActorDefs.ProfileViewDetailed]":
+    """Get a user's first `limit` suggestions, paging in more only when the pool is too small.
+
+    A cached pool is checked against the newest page of the user's follows once it is
+    older than CRAWL_VIEWER_MAX_AGE_SECONDS (and again every time that passes), so an
+    account followed from the suggestions stops being suggested within that time at the
+    cost of one follows page per check. Paging stops at the first page whose hydration
+    fails, leaving its suggestions pending for the next call.
+
+    Args:
+        client: The user's authenticated Blue Sky client
+        did: The user's DID
+        limit: Number of suggestions needed
+
+    Returns:
+        Hydrated suggestions in upstream order (suggestions whose hydration had to be
+        retried come later), fewer than `limit` if upstream runs out, hydration fails or
+        SUGGESTION_POOL_MAX_PAGES pages were fetched by this call
+    """
+    from atproto import models as bsky_models
+
+    pool = _load(did)
+    is_checked = bool(pool) and await _drop_followed(client, did, pool)
+    pool = pool or SuggestionPool(profiles=[], cursor=None, is_exhausted=False, created_at=time.time())
+
+    retried = bool(pool.pending) and len(pool.profiles) < limit
+    is_hydrated = True
+    if retried:
+        dids, pool.pending = pool.pending, []
+        is_hydrated = await _hydrate_into(client, pool, dids)
+    pages = 0
+    while (
+        is_hydrated
+        and len(pool.profiles) < limit
+        and not pool.is_exhausted
+        and pages < settings.SUGGESTION_POOL_MAX_PAGES
+    ):
+        is_hydrated = await _extend(client, pool)
+        pages += 1
+    if pages or retried or is_checked:
+        _save(did, pool)
+        logger.info(f"Suggestion pool of {did} extended by {pages} pages to {len(pool.profiles)} profiles")
+    return [bsky_models.AppBskyActorDefs.ProfileViewDetailed.model_validate(p) for p in pool.profiles[:limit]]
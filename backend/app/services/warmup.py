@@ -0,0 +1,131 @@
+"""Startup warmup that moves cold-start costs off the request path."""
+
+import asyncio
+import importlib
+import time
+from collections.abc import Awaitable, Callable
+
+from app.bluesky.auth import BlueskyAuthManager, get_service_client
+from app.core.config import get_settings
+from app.core.logger import setup_logger
+from app.models.readiness import ReadinessResponse, WarmupPhase
+from app.services.graph.crawl_store import get_crawl_store
+from app.services.graph.crawler import crawl_follows
+from app.services.graph.sharding import start_graph_shards
+from app.services.graph.snapshot import load_graph_snapshot
+from app.services.state.factory import get_state_backend
+
+
+logger = setup_logger(__name__)
+settings = get_settings()
+
+# Imported lazily by the app, so the first request would otherwise pay for them
+HEAVY_MODULES = ("atproto", "scipy.sparse")
+
+_phases: dict[str, WarmupPhase] = {}
+_started_at: float | None = None
+
+
+def _import_heavy_modules() -> str:
+    """Import modules that the request path imports on first use."""
+    for module in HEAVY_MODULES:
+        importlib.import_module(module)
+    return f"imported {', '.join(HEAVY_MODULES)}"
+
+
+def _open_stores() -> str:
+    """Open the shared state backend and crawl checkpoint store."""
+    backend = get_state_backend()
+    get_crawl_store()
+    return f"opened {type(backend).__name__} and crawl store"
+
+
+def _load_graph_snapshot() -> str:
+    """Memory-map the published graph snapshot so crawls can be served from it."""
+    snapshot = load_graph_snapshot()
+    if not snapshot:
+        return "no snapshot published"
+    manifest = snapshot.manifest
+    return f"mapped {snapshot.path.name}: {manifest['num_actors']} actors, {manifest['num_edges']} edges"
+
+
+def _start_graph_shards() -> str:
+    """Partition the published graph snapshot across the graph shard worker processes."""
+    if settings.GRAPH_SHARDS < 1:
+        return "disabled"
+    store = start_graph_shards()
+    if not store:
+        return "no snapshot published"
+    edges = sum(manifest["num_edges"] for manifest in store.manifests)
+    return f"started {store.num_shards} shards over {store.path.name}: {edges} edges"
+
+
+async def _restore_sessions() -> str:
+    """Restore persisted user sessions into this worker's client cache."""
+    session_keys = get_state_backend().keys("sessions:")[: settings.WARMUP_MAX_SESSIONS]
+    restored = 0
+    for key in session_keys:
+        did = key.removeprefix("sessions:")
+        if await asyncio.to_thread(BlueskyAuthManager.get_client, did):
+            restored += 1
+    return f"restored {restored}/{len(session_keys)} sessions"
+
+
+async def _preload_seed_graphs() -> str:
+    """Crawl (or resume) the configured seed graphs with the service account."""
+    if not settings.WARMUP_PRELOAD_SEEDS:
+        return "disabled"
+    client = await asyncio.to_thread(get_service_client)
+    results = [await crawl_follows(client, seed) for seed in settings.common_followers_seed_accounts]
+    complete = sum(result.is_complete for result in results)
+    fetched = sum(result.pages_fetched for result in results)
+    return f"{complete}/{len(results)} seed graphs complete, {fetched} pages fetched"
+
+
+async def _run_phase(name: str, step: Callable[[], Awaitable[str]]) -> None:
+    """Run a warmup phase, recording its duration and outcome without raising."""
+    _phases[name] = WarmupPhase(name=name)
+    started = time.perf_counter()
+    try:
+        detail = await step()
+    except Exception as e:
+        detail = f"failed: {e!s}"
+        logger.warning(f"Warmup phase {name} failed: {e!s}")
+    duration_ms = (time.perf_counter() - started) * 1e3
+    _phases[name] = WarmupPhase(name=name, is_complete=True, duration_ms=duration_ms, detail=detail)
+    logger.info(f"Warmup phase {name} finished in {duration_ms:.0f} ms: {detail}")
+
+
+WARMUP_PHASES: tuple[tuple[str, Callable[[], Awaitable[str]]], ...] = (
+    ("imports", lambda: asyncio.to_thread(_import_heavy_modules)),
+    ("stores", lambda: asyncio.to_thread(_open_stores)),
+    ("graph_snapshot", lambda: asyncio.to_thread(_load_graph_snapshot)),
+    ("graph_shards", lambda: asyncio.to_thread(_start_graph_shards)),
+    ("sessions", _restore_sessions),
+    ("seed_graphs", _preload_seed_graphs),
+)
+
+
+async def run_warmup() -> None:
+    """Run every warmup phase in order.
+
+    Phases that fail are reported but do not block readiness; the request path
+    falls back to doing the same work lazily.
+    """
+    global _started_at
+    _started_at = time.perf_counter()
+    _phases.clear()
+    for name, step in WARMUP_PHASES:
+        await _run_phase(name, step)
+
+
+def get_readiness() -> ReadinessResponse:
+    """Get the current warmup progress.
+
+    Returns:
+        ReadinessResponse that is ready once every phase has finished
+    """
+    phases = list(_phases.values())
+    elapsed_ms = 0.0 if _started_at is None else (time.perf_counter() - _started_at) * 1e3
+    is_ready = len(phases) == len(WARMUP_PHASES) and all(phase.is_complete for phase in phases)
+    return ReadinessResponse(is_ready=is_ready, elapsed_ms=elapsed_ms, phases=phases)
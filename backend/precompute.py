@@ -0,0 +1,173 @@
+"""Script to precompute recommendations in bulk for a list of users.
+
+Results are written to the precomputed store (PRECOMPUTE_STORE_PATH), from which
+GET /recommendations/ serves them while they are younger than
+PRECOMPUTE_MAX_AGE_SECONDS.
+
+Example:
+    python precompute.py --file active_users.txt --strategies basic common_followers --workers 8
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from app.bluesky.auth import BlueskyAuthManager, get_service_client
+from app.core.config import get_settings
+from app.core.logger import setup_logger
+from app.core.responses import recommendation_items
+from app.models.recommendations import ScoringMeasure
+from app.services.precomputed_store import PrecomputedEntry, get_precomputed_store
+from app.services.recommenders.factory import STRATEGY_REASONS, VIEWER_STRATEGIES, create_recommender
+
+
+if TYPE_CHECKING:
+    from atproto import Client
+
+
+logger = setup_logger(__name__)
+settings = get_settings()
+
+
+async def get_client_for(did: str, strategy: str) -> "Client | None":
+    """Get the user's own session if one is stored, otherwise the service client.
+
+    The service client only stands in for strategies parameterised by the actor;
+    viewer-dependent strategies would compute the service account's results.
+
+    Args:
+        did: User's decentralized identifier
+        strategy: Recommendation strategy the client is used for
+
+    Returns:
+        Authenticated client, or None if the strategy needs the user's own session and none is stored
+    """
+    client = await asyncio.to_thread(BlueskyAuthManager.get_client, did)
+    if client or strategy in VIEWER_STRATEGIES:
+        return client
+    return await asyncio.to_thread(get_service_client)
+
+
+async def precompute_one(did: str, strategy: str, scoring: ScoringMeasure, max_results: int) -> int | None:
+    """Compute and store one user's recommendations for one strategy.
+
+    Args:
+        did: User's decentralized identifier
+        strategy: Recommendation strategy
+        scoring: Similarity measure used to rank 'common_followers' candidates
+        max_results: Number of ranked recommendations to store
+
+    Returns:
+        Number of recommendations stored, or None if skipped because the user has no stored session
+    """
+    client = await get_client_for(did, strategy)
+    if not client:
+        return None
+    generated_at = time.time()
+    profiles = await create_recommender(strategy, scoring, max_results).get_recommendations(client, did)
+    if not profiles:
+        return 0
+    entry = PrecomputedEntry(
+        did=did,
+        strategy=strategy,
+        scoring=scoring.value,
+        generated_at=generated_at,
+        recommendations=recommendation_items(profiles[:max_results], STRATEGY_REASONS[strategy]),
+    )
+    await asyncio.to_thread(get_precomputed_store().put, entry)
+    return len(entry.recommendations)
+
+
+async def run(
+    dids: list[str], strategies: list[str], scoring: ScoringMeasure, workers: int, max_results: int
+) -> tuple[int, int]:
+    """Precompute every (user, strategy) pair with a pool of workers.
+
+    Args:
+        dids: Users to precompute
+        strategies: Strategies to precompute for each user
+        scoring: Similarity measure used to rank 'common_followers' candidates
+        workers: Number of concurrent workers
+        max_results: Number of ranked recommendations to store per entry
+
+    Returns:
+        Tuple of (pairs that failed or produced no recommendations, pairs skipped for lack of a user session)
+    """
+    queue: asyncio.Queue[tuple[str, str]] = asyncio.Queue()
+    for did in dids:
+        for strategy in strategies:
+            queue.put_nowait((did, strategy))
+    total = queue.qsize()
+    completed = failed = skipped = 0
+
+    async def worker() -> None:
+        nonlocal completed, failed, skipped
+        while not queue.empty():
+            did, strategy = queue.get_nowait()
+            started = time.perf_counter()
+            try:
+                stored = await precompute_one(did, strategy, scoring, max_results)
+            except Exception as e:
+                stored = 0
+                logger.error(f"Failed to precompute {strategy} for {did}: {e!s}")
+            completed += 1
+            if stored is None:
+                skipped += 1
+                logger.info(f"[{completed}/{total}] {did} {strategy}: skipped, no stored session")
+                continue
+            if not stored:
+                failed += 1
+            elapsed = time.perf_counter() - started
+            logger.info(f"[{completed}/{total}] {did} {strategy}: {stored} recommendations in {elapsed:.1f}s")
+
+    await asyncio.gather(*(worker() for _ in range(max(1, workers))))
+    return failed, skipped
+
+
+def read_dids(args: argparse.Namespace) -> list[str]:
+    """Collect DIDs from the command line and the DID file, without duplicates."""
+    dids = list(args.dids)
+    if args.file:
+        lines = Path(args.file).read_text().splitlines()
+        dids.extend(line.strip() for line in lines if line.strip() and not line.startswith("#"))
+    return list(dict.fromkeys(dids))
+
+
+def main() -> None:
+    """Precompute recommendations for the given users."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("dids", nargs="*", help="User DIDs to precompute")
+    parser.add_argument("--file", help="File with one DID per line ('#' starts a comment)")
+    parser.add_argument("--strategies", nargs="+", default=list(STRATEGY_REASONS), choices=list(STRATEGY_REASONS))
+    parser.add_argument("--scoring", type=ScoringMeasure, default=ScoringMeasure.COUNT)
+    parser.add_argument("--workers", type=int, default=settings.PRECOMPUTE_WORKERS)
+    parser.add_argument("--max-results", type=int, default=settings.PRECOMPUTE_MAX_RESULTS)
+    parser.add_argument("--prune", action="store_true", help="Delete entries older than PRECOMPUTE_MAX_AGE_SECONDS")
+    args = parser.parse_args()
+
+    if args.prune:
+        pruned = get_precomputed_store().prune(settings.PRECOMPUTE_MAX_AGE_SECONDS)
+        logger.info(f"Pruned {pruned} stale precomputed entries")
+
+    dids = read_dids(args)
+    if not dids:
+        if not args.prune:
+            parser.error("no DIDs given")
+        return
+
+    started = time.perf_counter()
+    failed, skipped = asyncio.run(run(dids, args.strategies, args.scoring, args.workers, args.max_results))
+    total = len(dids) * len(args.strategies)
+    logger.info(
+        f"Precomputed {total - failed - skipped}/{total} entries ({skipped} skipped without a user session) "
+        f"in {time.perf_counter() - started:.1f}s"
+    )
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+"""Benchmark script for the compute stages of the common followers strategy on synthetic graphs.
+
+Generates power-law seed follow graphs of each size and measures, without any
+network I/O, the time and tracemalloc peak of:
+    count: building the seed x candidate matrix and counting common seeds
+    count_approximate: SpaceSaving over the seed follows, then the matrix of its heavy hitters
+    filter: selecting candidates above min_common_follows that the user does not follow
+    rank_<measure>: scoring and ordering the selected candidates with each measure
+
+Results are compared against a stored baseline; a stage slower or larger than
+its baseline by more than the tolerance is reported as a regression and the
+script exits with status 1. Timings are machine dependent, so refresh the
+baseline with --save-baseline when moving to different hardware.
+
+Example:
+    PYTHONPATH=. python scripts/benchmark_common_followers.py --sizes 10000,100000,1000000
+"""
+
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable
+from pathlib import Path
+
+import numpy as np
+
+from app.core.logger import setup_logger
+from app.models.recommendations import ScoringMeasure
+from app.services.recommenders.scoring import FollowMatrix, build_follow_matrix, order_candidates, select_candidates
+from app.services.recommenders.sketches import SpaceSaving
+from scripts.common.synthetic_graph import make_seed_follows
+
+
+# Add the project root to Python path
+project_root = str(Path(__file__).parent.parent)
+sys.path.append(project_root)
+
+logger = setup_logger(__name__)
+
+DEFAULT_SIZES = "10000,100000,1000000,10000000"
+DEFAULT_BASELINE = Path(__file__).parent / "baselines" / "common_followers.json"
+EDGES_PER_SEED = 10_000
+MIN_SEEDS = 50
+MIN_COMMON_FOLLOWS = 2
+USER_FOLLOWS = 1_000
+SKETCH_CAPACITY = 100_000
+TOP_CANDIDATES = 1_000
+MIB = 1024 * 1024
+# Absolute increases below these are noise, whatever the relative change
+MIN_REGRESSION = {"ms": 1.0, "peak_mib": 0.5}
+
+
+def measure(stage: Callable[[], object], repeats: int) -> dict[str, float]:
+    """Time a stage and trace its peak memory.
+
+    The best of `repeats` untraced runs is reported as its time, then one more run
+    under tracemalloc gives the peak, so tracing overhead does not skew timings.
+
+    Args:
+        stage: Zero-argument function running the stage
+        repeats: Number of timed runs
+
+    Returns:
+        Dictionary of best milliseconds and peak MiB
+    """
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        stage()
+        timings.append(time.perf_counter() - started)
+
+    tracemalloc.start()
+    stage()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"ms": round(min(timings) * 1e3, 3), "peak_mib": round(peak / MIB, 3)}
+
+
+def count_approximately(seed_follows: list[list[str]], capacity: int) -> tuple[FollowMatrix, int]:
+    """Count common seeds the way approximate mode of CommonFollowersRecommender does.
+
+    Args:
+        seed_follows: Followed DIDs for each seed account
+        capacity: SpaceSaving capacity
+
+    Returns:
+        Tuple of (follow matrix of the heavy hitters, the sketch's min_count error bound)
+    """
+    sketch = SpaceSaving(capacity)
+    for follows in seed_follows:
+        sketch.update_all(follows)
+    heavy_hitters = sketch.frequent(MIN_COMMON_FOLLOWS)
+    reduced = [[did for did in follows if did in heavy_hitters] for follows in seed_follows]
+    degrees = np.array([len(follows) for follows in seed_follows], dtype=np.int64)
+    return build_follow_matrix(reduced, degrees), sketch.min_count
+
+
+def top_recall(exact: FollowMatrix, approximate: FollowMatrix) -> float:
+    """Share of the TOP_CANDIDATES most-followed candidates whose approximate count is exact."""
+    exact_counts = exact.common_counts
+    top = np.argsort(-exact_counts, kind="stable")[:TOP_CANDIDATES]
+    approximate_counts = dict(zip(approximate.candidates, approximate.common_counts.tolist(), strict=True))
+    matches = sum(approximate_counts.get(exact.candidates[column], 0) == exact_counts[column] for column in top)
+    return matches / len(top)
+
+
+def benchmark_size(num_edges: int, repeats: int) -> dict[str, dict[str, float]]:
+    """Measure every stage on one synthetic graph.
+
+    Args:
+        num_edges: Follow edges across all seeds
+        repeats: Number of timed runs per stage
+
+    Returns:
+        Measurements keyed by stage
+    """
+    num_seeds = max(MIN_SEEDS, num_edges // EDGES_PER_SEED)
+    seed_follows = make_seed_follows(num_edges, num_seeds=num_seeds)
+    rng = np.random.default_rng(1)
+
+    follow_matrix = build_follow_matrix(seed_follows)
+    picks = rng.choice(len(follow_matrix.candidates), size=min(USER_FOLLOWS, len(follow_matrix.candidates)))
+    user_follows = {follow_matrix.candidates[pick] for pick in picks}
+    column_of = select_candidates(follow_matrix, MIN_COMMON_FOLLOWS, user_follows)
+    columns = np.fromiter(column_of.values(), dtype=np.int64, count=len(column_of))
+    follower_counts = rng.pareto(1.1, len(columns)) * 1_000
+
+    results = {
+        "count": measure(lambda: build_follow_matrix(seed_follows).common_counts, repeats),
+        "count_approximate": measure(lambda: count_approximately(seed_follows, SKETCH_CAPACITY), repeats),
+        "filter": measure(lambda: select_candidates(follow_matrix, MIN_COMMON_FOLLOWS, user_follows), repeats),
+    }
+    for scoring in ScoringMeasure:
+        results[f"rank_{scoring.value}"] = measure(
+            lambda s=scoring: order_candidates(follow_matrix, s, columns, follower_counts), repeats
+        )
+
+    approximate_matrix, error_bound = count_approximately(seed_follows, SKETCH_CAPACITY)
+    logger.info(
+        f"{num_edges:>10,} edges, {num_seeds} seeds, {len(follow_matrix.candidates):,} candidates, "
+        f"{len(columns):,} selected; approximate counting with capacity {SKETCH_CAPACITY:,}: "
+        f"error bound {error_bound}, top-{TOP_CANDIDATES} recall {top_recall(follow_matrix, approximate_matrix):.3f}"
+    )
+    for stage, result in results.items():
+        logger.info(f"{'':>10} {stage:>18}: {result['ms']:9.2f} ms, peak {result['peak_mib']:8.2f} MiB")
+    return results
+
+
+def find_regressions(
+    results: dict[str, dict[str, dict[str, float]]], baseline: dict[str, dict[str, dict[str, float]]], tolerance: float
+) -> list[str]:
+    """Compare results with a baseline.
+
+    Args:
+        results: Measurements keyed by edge count, then stage
+        baseline: Stored measurements in the same layout
+        tolerance: Allowed relative increase, e.g. 0.25 for 25%
+
+    Returns:
+        Description of every measurement above its baseline by more than the tolerance
+        and by more than the MIN_REGRESSION noise floor
+    """
+    regressions = []
+    for size, stages in results.items():
+        for stage, result in stages.items():
+            expected = baseline.get(size, {}).get(stage)
+            if not expected:
+                continue
+            for metric, value in result.items():
+                limit = max(expected[metric] * (1 + tolerance), expected[metric] + MIN_REGRESSION[metric])
+                if value > limit:
+                    regressions.append(f"{size} edges {stage} {metric}: {value:.2f} vs baseline {expected[metric]:.2f}")
+    return regressions
+
+
+def main() -> None:
+    """Benchmark the compute stages at each graph size and check for regressions."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help="Comma-separated edge counts of the synthetic graphs")
+    parser.add_argument("--repeats", type=int, default=3, help="Timed runs per stage")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE, help="Baseline JSON file")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative increase over the baseline")
+    parser.add_argument("--save-baseline", action="store_true", help="Write the results as the new baseline")
+    args = parser.parse_args()
+
+    try:
+        results = {size: benchmark_size(int(size), args.repeats) for size in args.sizes.split(",")}
+
+        if args.save_baseline:
+            baseline = json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+            baseline.update(results)
+            args.baseline.parent.mkdir(parents=True, exist_ok=True)
+            args.baseline.write_text(json.dumps(baseline, indent=2) + "\n")
+            logger.info(f"Baseline written to {args.baseline}")
+            return
+
+        if not args.baseline.exists():
+            logger.warning(f"No baseline at {args.baseline}, run with --save-baseline to create one")
+            return
+        regressions = find_regressions(results, json.loads(args.baseline.read_text()), args.tolerance)
+        if regressions:
+            raise ValueError(f"{len(regressions)} regressions: " + "; ".join(regressions))
+        logger.info(f"No regressions beyond {args.tolerance:.0%} of the baseline")
+    except Exception as e:
+        logger.error(f"Common followers benchmark failed: {e!s}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
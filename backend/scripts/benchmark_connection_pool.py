@@ -0,0 +1,82 @@
+"""Benchmark script comparing per-client HTTP transports with the shared upstream connection pool."""
+
+import argparse
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from atproto import Client
+from atproto_client.request import Request
+
+from app.bluesky.http_pool import close_http_client
+from app.bluesky.upstream import UpstreamRequest
+from app.core.logger import setup_logger
+from scripts.common.fake_pds import FakePdsConfig, FakePdsServer
+
+
+# Add the project root to Python path
+project_root = str(Path(__file__).parent.parent)
+sys.path.append(project_root)
+
+logger = setup_logger(__name__)
+
+FAKE_PDS_PORT = 8102
+
+
+def run_sessions(server: FakePdsServer, request_factory: type, sessions: int, requests: int, workers: int) -> float:
+    """Log in many sessions and issue graph reads from each, as per-user clients would.
+
+    Args:
+        server: Running fake PDS
+        request_factory: atproto request layer class used by every client
+        sessions: Number of user sessions
+        requests: Graph reads per session
+        workers: Concurrent worker threads
+
+    Returns:
+        Elapsed wall-clock seconds
+    """
+
+    def run_session(index: int) -> None:
+        client = Client(base_url=server.url, request=request_factory())
+        client.login(login=f"user{index}.test", password="unused")
+        for offset in range(requests):
+            client.app.bsky.graph.get_follows({"actor": f"user{(index + offset) % sessions}.test", "limit": 10})
+
+    server.stats.requests.clear()
+    server.stats.connections.clear()
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(run_session, range(sessions)))
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    """Compare connection counts and latency with and without the shared pool."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sessions", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=10, help="Graph reads per session")
+    parser.add_argument("--workers", type=int, default=16)
+    args = parser.parse_args()
+
+    config = FakePdsConfig(num_accounts=max(args.sessions, 1_000), deleted_fraction=0.0)
+    server = FakePdsServer(config, port=FAKE_PDS_PORT).start()
+    try:
+        for name, request_factory in (("per-client", Request), ("shared pool", UpstreamRequest)):
+            elapsed = run_sessions(server, request_factory, args.sessions, args.requests, args.workers)
+            total = sum(server.stats.requests.values())
+            logger.info(
+                f"{name:>11}: {total} requests over {len(server.stats.connections)} connections "
+                f"in {elapsed:.2f}s ({total / elapsed:.0f} req/s)"
+            )
+    except Exception as e:
+        logger.error(f"Connection pool benchmark failed: {e!s}")
+        sys.exit(1)
+    finally:
+        close_http_client()
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
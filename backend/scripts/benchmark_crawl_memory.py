@@ -0,0 +1,128 @@
+"""Benchmark script measuring peak memory of a large follow crawl per projection.
+
+Crawls a seed account with ~100k follows from a fake PDS running in a separate
+process (so its allocations are not traced) and compares tracemalloc peaks of:
+    models: accumulating ProfileView models from client.app.bsky.graph.get_follows
+    did: streaming iter_graph_pages projected to DIDs
+    compact: streaming iter_graph_pages projected to CompactProfile tuples
+"""
+
+import argparse
+import asyncio
+import subprocess
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable
+from pathlib import Path
+
+import httpx
+from atproto import Client
+
+from app.bluesky.http_pool import close_http_client
+from app.bluesky.upstream import UpstreamRequest
+from app.core.logger import setup_logger
+from app.models.graph import FollowProjection
+from app.services.graph.crawler import FOLLOWS, iter_graph_pages
+
+
+# Add the project root to Python path
+project_root = str(Path(__file__).parent.parent)
+sys.path.append(project_root)
+
+logger = setup_logger(__name__)
+
+FAKE_PDS_PORT = 8105
+SEED_ACTOR = "seed0.test"
+MIB = 1024 * 1024
+
+
+def crawl_models(client: Client, actor: str) -> list:
+    """Crawl follows the pre-streaming way, keeping every ProfileView model."""
+    follows, cursor = [], None
+    while True:
+        response = client.app.bsky.graph.get_follows(params={"actor": actor, "limit": 100, "cursor": cursor})
+        follows.extend(response.follows)
+        cursor = response.cursor
+        if not cursor:
+            return follows
+
+
+async def crawl_projected(client: Client, actor: str, projection: FollowProjection) -> list:
+    """Crawl follows by streaming projected pages."""
+    follows = []
+    async for page, _ in iter_graph_pages(client, actor, FOLLOWS, projection):
+        follows.extend(page)
+    return follows
+
+
+def measure(name: str, crawl: Callable[[], list]) -> dict[str, float]:
+    """Run one crawl under tracemalloc.
+
+    Args:
+        name: Label for the log line
+        crawl: Zero-argument function running the crawl and returning its result
+
+    Returns:
+        Dictionary of follows, peak and retained MiB and elapsed seconds
+    """
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = crawl()
+    elapsed = time.perf_counter() - started
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    logger.info(
+        f"{name:>8}: {len(result)} follows, peak {peak / MIB:.1f} MiB, "
+        f"retained {retained / MIB:.1f} MiB, {elapsed:.1f}s"
+    )
+    return {"follows": len(result), "peak_mib": peak / MIB, "retained_mib": retained / MIB, "seconds": elapsed}
+
+
+def wait_for_fake_pds(url: str, timeout: float = 120.0) -> None:
+    """Wait until the fake PDS subprocess accepts requests."""
+    started = time.perf_counter()
+    while time.perf_counter() - started < timeout:
+        try:
+            httpx.get(f"{url}/_stats")
+            return
+        except httpx.TransportError:
+            time.sleep(0.2)
+    raise TimeoutError("Fake PDS did not start")
+
+
+def main() -> None:
+    """Compare crawl memory across projections."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--follows", type=int, default=100_000, help="Follows of the crawled seed account")
+    args = parser.parse_args()
+
+    url = f"http://127.0.0.1:{FAKE_PDS_PORT}"
+    command = [sys.executable, "-m", "scripts.common.fake_pds", "--port", str(FAKE_PDS_PORT)]
+    command += ["--accounts", str(int(args.follows * 1.5)), "--mean-follows", "2", "--seed-follows", str(args.follows)]
+    fake_pds = subprocess.Popen(command, cwd=project_root, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        wait_for_fake_pds(url)
+        client = Client(base_url=f"{url}/xrpc", request=UpstreamRequest())
+        client.login(login=SEED_ACTOR, password="unused")
+
+        results = {"models": measure("models", lambda: crawl_models(client, SEED_ACTOR))}
+        for projection in FollowProjection:
+            results[projection.value] = measure(
+                projection.value, lambda p=projection: asyncio.run(crawl_projected(client, SEED_ACTOR, p))
+            )
+
+        baseline = results["models"]["peak_mib"]
+        for name, result in list(results.items())[1:]:
+            logger.info(f"{name:>8}: peak {baseline / max(result['peak_mib'], 1e-9):.1f}x lower than models")
+    except Exception as e:
+        logger.error(f"Crawl memory benchmark failed: {e!s}")
+        sys.exit(1)
+    finally:
+        close_http_client()
+        fake_pds.terminate()
+        fake_pds.wait()
+
+
+if __name__ == "__main__":
+    main()
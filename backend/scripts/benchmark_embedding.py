@@ -0,0 +1,87 @@
+"""Benchmark script for follow-graph embeddings and IVF nearest-neighbour search.
+
+Builds the embedding index from synthetic follow graphs of growing size and
+compares IVF queries against an exact scan of every vector: query latency
+should grow sublinearly with the number of accounts while recall@k stays high.
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+from app.core.config import get_settings
+from app.core.logger import setup_logger
+from app.services.graph.embeddings import EmbeddingIndex, build_embedding_index
+from app.services.graph.snapshot import graph_arrays_from_follows
+from scripts.common.synthetic_graph import make_seed_follows
+
+
+# Add the project root to Python path
+project_root = str(Path(__file__).parent.parent)
+sys.path.append(project_root)
+
+logger = setup_logger(__name__)
+settings = get_settings()
+
+NUM_ACTORS = 2_000
+GRAPH_SIZES = (20_000, 80_000, 320_000)
+EDGES_PER_ACCOUNT = 5
+NUM_QUERIES = 200
+TOP_K = 50
+
+
+def exact_search(index: EmbeddingIndex, follows: list[str], k: int) -> np.ndarray:
+    """Find the true nearest neighbours of a user's follows by scanning every vector."""
+    rows = index.lookup(follows)
+    query = index.vectors[rows].mean(axis=0)
+    query /= max(float(np.linalg.norm(query)), 1e-12)
+    scores = index.vectors @ query
+    scores[rows] = -np.inf
+    return np.argsort(-scores)[:k]
+
+
+def benchmark_size(num_accounts: int, rng: np.random.Generator) -> None:
+    """Build the index over one synthetic graph and time exact and approximate queries."""
+    follows = make_seed_follows(num_accounts * EDGES_PER_ACCOUNT, num_seeds=NUM_ACTORS, num_accounts=num_accounts)
+    actors = [f"actor{i}.test" for i in range(NUM_ACTORS)]
+    arrays = graph_arrays_from_follows(actors, follows, [time.time()] * NUM_ACTORS)
+
+    started = time.perf_counter()
+    index = build_embedding_index(arrays)
+    build_seconds = time.perf_counter() - started
+
+    queries = [follows[i] for i in rng.choice(NUM_ACTORS, size=NUM_QUERIES, replace=False)]
+    started = time.perf_counter()
+    exact = [exact_search(index, query, TOP_K) for query in queries]
+    exact_ms = (time.perf_counter() - started) * 1e3 / NUM_QUERIES
+
+    started = time.perf_counter()
+    approximate = [index.similar(query, TOP_K, settings.EMBEDDING_N_PROBE) for query in queries]
+    ivf_ms = (time.perf_counter() - started) * 1e3 / NUM_QUERIES
+
+    hits = sum(
+        len(set(np.char.decode(index.dids[truth], "utf-8")).intersection(found))
+        for truth, found in zip(exact, approximate, strict=True)
+    )
+    recall = hits / sum(len(truth) for truth in exact)
+    logger.info(
+        f"{len(index.dids):>8,} accounts: built in {build_seconds:.1f}s ({index.ann.n_lists} lists), "
+        f"exact {exact_ms:.2f} ms/query, IVF {ivf_ms:.2f} ms/query, recall@{TOP_K} {recall:.3f}"
+    )
+
+
+def main() -> None:
+    """Benchmark embedding index builds and queries across graph sizes."""
+    try:
+        rng = np.random.default_rng(0)
+        for num_accounts in GRAPH_SIZES:
+            benchmark_size(num_accounts, rng)
+    except Exception as e:
+        logger.error(f"Embedding benchmark failed: {e!s}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""Benchmark script for the DID-sharded graph service on one Linux host.
+
+Writes a synthetic power-law follow graph as a snapshot, then for each shard
+count starts the shard workers and measures:
+    startup: time until every worker has written and mapped its partition
+    attach: startup of a second shard group, as another API worker process would
+        start, mapping the partitions already written
+    partition: array bytes of the largest shard's partition, against the whole graph's
+    pss: proportional memory of the workers of both groups (from /proc), split into
+        anonymous memory (interpreter and heap, private to each worker) and mapped
+        files, where each shared page-cached partition page counts once across groups
+    lookups: single-actor get_follows calls per second from CLIENT_THREADS threads
+    count: latency of counting the follows of COUNT_BATCH actors (scatter/gather)
+The single-process memory-mapped snapshot is measured the same way as a
+reference. Parallel speedups are bounded by the host's CPU count, which is logged.
+
+Example:
+    PYTHONPATH=. python scripts/benchmark_graph_shards.py --actors 50000 --shards 1,2,4
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+from app.core.logger import setup_logger
+from app.services.graph.base import BaseGraphStore
+from app.services.graph.sharding import HashRing, ShardedGraphStore
+from app.services.graph.snapshot import GraphSnapshot, write_graph_arrays
+from scripts.common.synthetic_graph import make_graph_arrays
+
+
+# Add the project root to Python path
+project_root = str(Path(__file__).parent.parent)
+sys.path.append(project_root)
+
+logger = setup_logger(__name__)
+
+CLIENT_THREADS = 8
+NUM_LOOKUPS = 4_000
+COUNT_BATCH = 500
+MIB = 1024 * 1024
+
+
+def pss_mib(pid: int) -> tuple[float, float]:
+    """Read the proportional set size of a process from /proc, sharing shared pages among their mappers.
+
+    Returns:
+        Tuple of (anonymous PSS, file-backed PSS) in MiB
+    """
+    fields = dict(line.split(":", 1) for line in Path(f"/proc/{pid}/smaps_rollup").read_text().splitlines()[1:])
+    return int(fields["Pss_Anon"].split()[0]) / 1024, int(fields["Pss_File"].split()[0]) / 1024
+
+
+def measure_queries(store: BaseGraphStore, actors: list[str]) -> tuple[float, float]:
+    """Measure lookup throughput and count aggregation latency.
+
+    Args:
+        store: Graph store to query
+        actors: Actors to draw queries from
+
+    Returns:
+        Tuple of (lookups per second, count latency in milliseconds)
+    """
+    rng = np.random.default_rng(0)
+    queries = [actors[index] for index in rng.integers(0, len(actors), NUM_LOOKUPS)]
+    started = time.perf_counter()
+    with ThreadPoolExecutor(CLIENT_THREADS) as executor:
+        list(executor.map(store.get_follows, queries))
+    lookups_per_second = NUM_LOOKUPS / (time.perf_counter() - started)
+
+    batch = [actors[index] for index in rng.choice(len(actors), COUNT_BATCH, replace=False)]
+    store.count_follows(batch)
+    started = time.perf_counter()
+    store.count_follows(batch)
+    return lookups_per_second, (time.perf_counter() - started) * 1e3
+
+
+def main() -> None:
+    """Compare the single-process snapshot with the sharded graph service at several shard counts."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--actors", type=int, default=50_000, help="Actors whose follows are in the graph")
+    parser.add_argument("--mean-follows", type=int, default=100, help="Mean follows per actor")
+    parser.add_argument("--shards", default="1,2,4", help="Comma-separated shard counts")
+    args = parser.parse_args()
+
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory)
+            arrays = make_graph_arrays(args.actors, args.mean_follows)
+            write_graph_arrays(path, arrays)
+            graph_mib = sum(array.nbytes for array in arrays.values()) / MIB
+            logger.info(
+                f"Graph of {args.actors:,} actors, {len(arrays['indices']):,} edges, {len(arrays['nodes']):,} nodes "
+                f"({graph_mib:.1f} MiB of arrays) on {os.cpu_count()} CPUs"
+            )
+            del arrays
+
+            snapshot = GraphSnapshot(path)
+            actors = snapshot.actors()
+            lookups, count_ms = measure_queries(snapshot, actors)
+            logger.info(f"{'mmap':>8}: {lookups:8.0f} lookups/s, count {count_ms:7.1f} ms")
+
+            for num_shards in (int(value) for value in args.shards.split(",")):
+                started = time.perf_counter()
+                store = ShardedGraphStore(path, num_shards)
+                startup = time.perf_counter() - started
+                started = time.perf_counter()
+                second = ShardedGraphStore(path, num_shards)
+                attach = time.perf_counter() - started
+                try:
+                    lookups, count_ms = measure_queries(store, actors)
+                    measure_queries(second, actors)
+                    pss = [pss_mib(process.pid) for process in store._processes + second._processes]
+                    anon, mapped = sum(value[0] for value in pss), sum(value[1] for value in pss)
+                    max_partition = max(manifest["num_bytes"] for manifest in store.manifests) / MIB
+                    rebalance = ""
+                    if num_shards > 1:
+                        smaller = HashRing(num_shards - 1)
+                        moved = sum(smaller.shard_for(a) != store.ring.shard_for(a) for a in actors) / len(actors)
+                        rebalance = f", {moved:.0%} of actors moved from {num_shards - 1} shards"
+                    logger.info(
+                        f"{num_shards:>2} shards: {lookups:8.0f} lookups/s, count {count_ms:7.1f} ms, "
+                        f"startup {startup:.2f}s (attach {attach:.2f}s), largest partition {max_partition:.1f} MiB, "
+                        f"2 groups PSS {anon:.0f} MiB anon + {mapped:.0f} MiB mapped{rebalance}"
+                    )
+                finally:
+                    store.close()
+                    second.close()
+    except Exception as e:
+        logger.error(f"Graph shard benchmark failed: {e!s}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Benchmark script comparing blocking stream logging with the queued, rate-limited logging pipeline."""
+
+import logging
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from app.core.logger import TEXT_FORMAT, setup_logger
+
+
+# Add the project root to Python path
+project_root = str(Path(__file__).parent.parent)
+sys.path.append(project_root)
+
+logger = setup_logger(__name__)
+
+NUM_RECORDS = 20_000
+
+
+def time_warnings(target: logging.Logger) -> float:
+    """Log a burst of hot-path warnings from one call site and return the time spent in the caller."""
+    started = time.perf_counter()
+    for i in range(NUM_RECORDS):
+        target.warning(f"Failed to fetch profile for did:plc:{i:024d}: Profile not found")
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    """Time a warning burst through a synchronous file handler and through the queued pipeline."""
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            blocking = logging.getLogger("benchmark.blocking")
+            handler = logging.FileHandler(Path(directory) / "blocking.log")
+            handler.setFormatter(logging.Formatter(TEXT_FORMAT))
+            blocking.addHandler(handler)
+            blocking.propagate = False
+            blocking_seconds = time_warnings(blocking)
+            handler.close()
+
+        # Past the burst allowance, the queued logger only reports how many records it suppressed
+        queued = setup_logger("benchmark.queued")
+        queued_seconds = time_warnings(queued)
+
+        logger.info(
+            f"{NUM_RECORDS:,} warnings: blocking file handler {blocking_seconds * 1e6 / NUM_RECORDS:.2f} us/record, "
+            f"queued and rate limited {queued_seconds * 1e6 / NUM_RECORDS:.2f} us/record"
+        )
+    except Exception as e:
+        logger.error(f"Logging benchmark failed: {e!s}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
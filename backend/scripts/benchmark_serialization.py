@@ -0,0 +1,110 @@
+"""Benchmark script comparing recommendation response serialization paths."""
+
+import json
+import sys
+import timeit
+from collections.abc import Callable
+from datetime import datetime
+from pathlib import Path
+
+from atproto import models as bsky_models
+from fastapi.encoders import jsonable_encoder
+
+from app.core.logger import setup_logger
+from app.core.responses import compute_etag, serialize_recommendations
+from app.models.recommendations import RecommendationsResponse, RecommendedUser
+
+
+# Add the project root to Python path
+project_root = str(Path(__file__).parent.parent)
+sys.path.append(project_root)
+
+logger = setup_logger(__name__)
+
+SIZES = [10, 100, 1_000]
+REASON = "Common connections"
+GENERATED_AT = datetime(2024, 11, 20, 12, 30, 15, 250000)
+
+
+def make_profiles(count: int) -> list[bsky_models.AppBskyActorDefs.ProfileViewDetailed]:
+    """Build synthetic hydrated profiles.
+
+    Args:
+        count: Number of profiles to build
+
+    Returns:
+        List of ProfileViewDetailed objects
+    """
+    return [
+        bsky_models.AppBskyActorDefs.ProfileViewDetailed(
+            did=f"did:plc:{i:024d}",
+            handle=f"user{i}.bsky.social",
+            display_name=f"User {i}",
+            avatar=f"https://cdn.bsky.app/img/avatar/plain/did:plc:{i:024d}/bafkrei{i:040d}@jpeg",
+            description="Synthetic profile used for serialization benchmarks",
+            followers_count=1_000 + i,
+            follows_count=100 + i,
+        )
+        for i in range(count)
+    ]
+
+
+def serialize_with_models(profiles: list[bsky_models.AppBskyActorDefs.ProfileViewDetailed]) -> bytes:
+    """Serialize the way the router did before: RecommendedUser models and the default JSON encoder.
+
+    Args:
+        profiles: Ranked profiles
+
+    Returns:
+        UTF-8 encoded JSON body
+    """
+    response = RecommendationsResponse(
+        recommendations=[
+            RecommendedUser(
+                did=profile.did,
+                handle=profile.handle,
+                display_name=profile.display_name,
+                avatar_url=profile.avatar,
+                follower_count=profile.followers_count or -1,
+                following_count=profile.follows_count or -1,
+                reason=REASON,
+            )
+            for profile in profiles
+        ],
+        generated_at=GENERATED_AT,
+    )
+    return json.dumps(jsonable_encoder(response)).encode()
+
+
+def time_call(func: Callable[[], object], repeat: int = 5) -> float:
+    """Time a zero-argument callable.
+
+    Args:
+        func: Callable to time
+        repeat: Number of timing rounds
+
+    Returns:
+        Best per-call time in microseconds
+    """
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number * 1e6
+
+
+def main() -> None:
+    """Run the serialization benchmark and log a comparison table."""
+    logger.info(f"{'size':>6} {'models+json (us)':>18} {'orjson (us)':>12} {'etag only (us)':>15} {'speedup':>8}")
+    for size in SIZES:
+        profiles = make_profiles(size)
+        fast_payload = serialize_recommendations(profiles, REASON, GENERATED_AT)
+        if json.loads(serialize_with_models(profiles)) != json.loads(fast_payload):
+            raise ValueError("Serialization paths produced different payloads")
+
+        baseline = time_call(lambda profiles=profiles: serialize_with_models(profiles))
+        fast = time_call(lambda profiles=profiles: serialize_recommendations(profiles, REASON, GENERATED_AT))
+        etag = time_call(lambda profiles=profiles: compute_etag("common_followers", REASON, *(p.did for p in profiles)))
+        logger.info(f"{size:>6} {baseline:>18.1f} {fast:>12.1f} {etag:>15.1f} {baseline / fast:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
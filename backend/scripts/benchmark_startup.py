@@ -0,0 +1,127 @@
+"""Benchmark script measuring import time and time to first fast response after startup."""
+
+import os
+import re
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import httpx
+from dotenv import load_dotenv
+
+from app.core.logger import setup_logger
+
+
+# Add the project root to Python path
+project_root = str(Path(__file__).parent.parent)
+sys.path.append(project_root)
+
+# Load environment variables
+load_dotenv()
+
+logger = setup_logger(__name__)
+
+STARTUP_TIMEOUT_SECONDS = 120.0
+POLL_INTERVAL_SECONDS = 0.01
+TOP_IMPORTS = 10
+
+
+def measure_import_time() -> list[tuple[str, float]]:
+    """Import app.main in a fresh interpreter with -X importtime.
+
+    Returns:
+        List of (module, cumulative milliseconds) for the slowest top-level imports, app.main first
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        cwd=project_root,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    timings = []
+    for line in result.stderr.splitlines():
+        match = re.match(r"import time:\s+\d+ \|\s+(\d+) \|( *)(\S+)", line)
+        # Only direct imports of app.main (indent of three spaces) and app.main itself
+        if match and len(match.group(2)) <= 3:
+            timings.append((match.group(3), int(match.group(1)) / 1e3))
+    timings.sort(key=lambda timing: timing[1], reverse=True)
+    return timings[: TOP_IMPORTS + 1]
+
+
+def get_free_port() -> int:
+    """Find a free local TCP port.
+
+    Returns:
+        Port number
+    """
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_for_ok(client: httpx.Client, url: str, started: float) -> float:
+    """Poll a URL until it returns 200.
+
+    Args:
+        client: HTTP client
+        url: URL to poll
+        started: perf_counter value of process launch
+
+    Returns:
+        Seconds from launch until the first 200 response
+    """
+    while time.perf_counter() - started < STARTUP_TIMEOUT_SECONDS:
+        try:
+            if client.get(url).status_code == 200:
+                return time.perf_counter() - started
+        except httpx.TransportError:
+            pass
+        time.sleep(POLL_INTERVAL_SECONDS)
+    raise TimeoutError(f"{url} did not become ready within {STARTUP_TIMEOUT_SECONDS}s")
+
+
+def measure_time_to_first_response() -> dict[str, float]:
+    """Launch the app under uvicorn and time /health and /ready.
+
+    Returns:
+        Seconds from process launch until /health and /ready first return 200
+    """
+    port = get_free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=project_root,
+        env={**os.environ, "PYTHONPATH": project_root},
+    )
+    try:
+        with httpx.Client(timeout=5.0) as client:
+            health = wait_for_ok(client, f"{base_url}/health", started)
+            ready = wait_for_ok(client, f"{base_url}/ready", started)
+            phases = client.get(f"{base_url}/ready").json()["phases"]
+    finally:
+        process.terminate()
+        process.wait()
+
+    for phase in phases:
+        logger.info(f"  warmup {phase['name']:>12}: {phase['duration_ms']:8.1f} ms  {phase['detail']}")
+    return {"health": health, "ready": ready}
+
+
+def main() -> None:
+    """Report import time and time to first fast response."""
+    logger.info("=== Import time (cumulative) ===")
+    for module, milliseconds in measure_import_time():
+        logger.info(f"  {module:<40} {milliseconds:8.1f} ms")
+
+    logger.info("=== Time to first response after launch ===")
+    timings = measure_time_to_first_response()
+    logger.info(f"  /health: {timings['health'] * 1e3:8.1f} ms")
+    logger.info(f"  /ready:  {timings['ready'] * 1e3:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,412 @@
+"""Fake Blue Sky PDS/AppView serving a synthetic follow graph for local testing.
+
+Implements the XRPC endpoints the app uses (session creation, profiles, follows,
+followers and suggestions) on top of a deterministic power-law graph. It can emit
+Bluesky-style rate-limit headers and 429s, inject 5xx errors and latency, and
+counts requests per endpoint so callers can measure upstream-call amplification.
+"""
+
+import argparse
+import asyncio
+import random
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+
+import numpy as np
+import uvicorn
+from fastapi import FastAPI, Request, Response
+from fastapi.responses import JSONResponse
+from jose import jwt
+
+
+SESSION_SECRET = "fake-pds-secret"
+SESSION_TTL_SECONDS = 2 * 60 * 60
+
+
+class XrpcResponse(JSONResponse):
+    """JSON response with the exact content type atproto clients parse."""
+
+    media_type = "application/json; charset=utf-8"
+
+
+@dataclass
+class FakePdsConfig:
+    """Shape and behaviour of the fake PDS.
+
+    Attributes:
+        num_accounts: Number of accounts in the synthetic graph
+        mean_follows: Mean out-degree of ordinary accounts
+        num_seeds: Number of large "seed" accounts (handles seed0.test, seed1.test, ...)
+        seed_follows: Out-degree of each seed account
+        deleted_fraction: Fraction of accounts whose profile lookups fail as deleted
+        rate_limit: Requests allowed per window across all clients, 0 for unlimited
+        rate_window_seconds: Length of the rate-limit window
+        error_rate: Probability of answering a request with a 502
+        latency_seconds: Artificial latency added to every request
+        random_seed: Seed for graph generation
+    """
+
+    num_accounts: int = 20_000
+    mean_follows: int = 150
+    num_seeds: int = 3
+    seed_follows: int = 5_000
+    deleted_fraction: float = 0.01
+    rate_limit: int = 0
+    rate_window_seconds: float = 60.0
+    error_rate: float = 0.0
+    latency_seconds: float = 0.0
+    random_seed: int = 0
+
+
+@dataclass
+class FakePdsStats:
+    """Request counters of the fake PDS."""
+
+    requests: Counter = field(default_factory=Counter)
+    connections: set[tuple[str, int]] = field(default_factory=set)
+    throttled: int = 0
+    injected_errors: int = 0
+
+
+class SyntheticGraph:
+    """Deterministic power-law follow graph stored as CSR arrays."""
+
+    def __init__(self, config: FakePdsConfig):
+        """Generate the graph.
+
+        Args:
+            config: Fake PDS configuration
+        """
+        rng = np.random.default_rng(config.random_seed)
+        num_accounts = config.num_accounts
+        popularity = 1.0 / np.arange(1, num_accounts + 1) ** 1.1
+        popularity /= popularity.sum()
+
+        degrees = np.minimum((rng.pareto(2.0, num_accounts) + 0.5) * config.mean_follows, num_accounts - 1)
+        degrees = degrees.astype(np.int64)
+        degrees[: config.num_seeds] = min(config.seed_follows, num_accounts - 1)
+
+        sources = np.repeat(np.arange(num_accounts), degrees)
+        targets = rng.choice(num_accounts, size=int(degrees.sum()), p=popularity)
+        # Seeds follow exactly seed_follows distinct accounts: popular picks topped up uniformly
+        for seed in range(config.num_seeds):
+            start, end = int(degrees[:seed].sum()), int(degrees[: seed + 1].sum())
+            picked = np.unique(targets[start:end])
+            picked = picked[picked != seed]
+            others = np.setdiff1d(np.arange(num_accounts), np.append(picked, seed))
+            targets[start:end] = np.concatenate([picked, rng.permutation(others)[: end - start - len(picked)]])
+        keep = sources != targets
+        edges = np.unique(np.stack([sources[keep], targets[keep]], axis=1), axis=0)
+        # Newest follows first, like the real API
+        rng.shuffle(edges)
+        edges = edges[np.argsort(edges[:, 0], kind="stable")]
+
+        self.follows_indptr = np.concatenate([[0], np.cumsum(np.bincount(edges[:, 0], minlength=num_accounts))])
+        self.follows = edges[:, 1]
+        by_target = np.argsort(edges[:, 1], kind="stable")
+        self.followers_indptr = np.concatenate([[0], np.cumsum(np.bincount(edges[:, 1], minlength=num_accounts))])
+        self.followers = edges[by_target, 0]
+        self.is_deleted = rng.random(num_accounts) < config.deleted_fraction
+        self.is_deleted[: config.num_seeds] = False
+        self.num_seeds = config.num_seeds
+        self.num_accounts = num_accounts
+
+    def did(self, index: int) -> str:
+        """DID of an account."""
+        return f"did:plc:fake{index:012d}"
+
+    def handle(self, index: int) -> str:
+        """Handle of an account."""
+        return f"seed{index}.test" if index < self.num_seeds else f"user{index}.test"
+
+    def resolve(self, actor: str) -> int | None:
+        """Resolve a handle or DID to an account index."""
+        if actor.startswith("did:plc:fake"):
+            index = int(actor.removeprefix("did:plc:fake"))
+        elif actor.startswith(("seed", "user")) and actor.endswith(".test"):
+            index = int(actor.removesuffix(".test")[4:])
+        else:
+            return None
+        return index if 0 <= index < self.num_accounts else None
+
+    def follows_of(self, index: int) -> np.ndarray:
+        """Accounts followed by an account, newest first."""
+        return self.follows[self.follows_indptr[index] : self.follows_indptr[index + 1]]
+
+    def followers_of(self, index: int) -> np.ndarray:
+        """Followers of an account."""
+        return self.followers[self.followers_indptr[index] : self.followers_indptr[index + 1]]
+
+    def profile_view(self, index: int) -> dict:
+        """ProfileView JSON of an account."""
+        return {
+            "did": self.did(index),
+            "handle": self.handle(index),
+            "displayName": f"Fake User {index}",
+            "avatar": f"https://cdn.example.test/avatar/{index}.jpg",
+            "description": "Synthetic account served by the fake PDS",
+            "labels": [],
+        }
+
+    def profile_view_detailed(self, index: int) -> dict:
+        """ProfileViewDetailed JSON of an account."""
+        return {
+            **self.profile_view(index),
+            "followersCount": len(self.followers_of(index)),
+            "followsCount": len(self.follows_of(index)),
+            "postsCount": index % 500,
+        }
+
+
+def _xrpc_error(status_code: int, error: str, message: str) -> XrpcResponse:
+    """Build an XRPC error response."""
+    return XrpcResponse({"error": error, "message": message}, status_code=status_code)
+
+
+def _page(items: np.ndarray, cursor: str | None, limit: int) -> tuple[np.ndarray, str | None]:
+    """Slice a cursor page out of an index array."""
+    offset = int(cursor or 0)
+    end = offset + max(1, min(limit, 100))
+    return items[offset:end], (str(end) if end < len(items) else None)
+
+
+class _RateLimitWindow:
+    """Fixed-window request budget shared by every client of the fake PDS."""
+
+    def __init__(self, config: FakePdsConfig):
+        self._config = config
+        self._lock = threading.Lock()
+        self._started_at = time.time()
+        self._used = 0
+
+    def consume(self) -> tuple[dict[str, str], bool]:
+        """Consume one unit of budget, returning (rate-limit headers, whether the request is throttled)."""
+        limit, window = self._config.rate_limit, self._config.rate_window_seconds
+        if not limit:
+            return {}, False
+        with self._lock:
+            now = time.time()
+            if now - self._started_at >= window:
+                self._started_at, self._used = now, 0
+            self._used += 1
+            remaining = max(limit - self._used, 0)
+            reset_at = int(self._started_at + window)
+            is_throttled = self._used > limit
+        headers = {
+            "RateLimit-Limit": str(limit),
+            "RateLimit-Remaining": str(remaining),
+            "RateLimit-Reset": str(reset_at),
+            "RateLimit-Policy": f"{limit};w={int(window)}",
+        }
+        return headers, is_throttled
+
+
+def _add_upstream_behaviour(app: FastAPI, config: FakePdsConfig, stats: FakePdsStats) -> None:
+    """Add request counting, latency, rate limiting and error injection to XRPC routes."""
+    rate_limit_window = _RateLimitWindow(config)
+
+    @app.middleware("http")
+    async def upstream_behaviour(request: Request, call_next):  # noqa: ANN001, ANN202
+        if not request.url.path.startswith("/xrpc/"):
+            return await call_next(request)
+        stats.requests[request.url.path.removeprefix("/xrpc/")] += 1
+        if request.client:
+            stats.connections.add((request.client.host, request.client.port))
+        if config.latency_seconds:
+            await asyncio.sleep(config.latency_seconds)
+        headers, is_throttled = rate_limit_window.consume()
+        if is_throttled:
+            stats.throttled += 1
+            response = _xrpc_error(429, "RateLimitExceeded", "Rate Limit Exceeded")
+        elif config.error_rate and random.random() < config.error_rate:
+            stats.injected_errors += 1
+            response = _xrpc_error(502, "UpstreamFailure", "Injected failure")
+        else:
+            response = await call_next(request)
+        response.headers.update(headers)
+        return response
+
+
+def _add_session_routes(app: FastAPI, graph: SyntheticGraph) -> None:
+    """Add session creation and refresh. Any password is accepted."""
+
+    def session_response(identifier: str) -> XrpcResponse:
+        index = graph.resolve(identifier)
+        if index is None:
+            index = sum(identifier.encode()) % graph.num_accounts
+        now = int(time.time())
+        claims = {"sub": graph.did(index), "iat": now, "exp": now + SESSION_TTL_SECONDS, "scope": "com.atproto.access"}
+        return XrpcResponse(
+            {
+                "accessJwt": jwt.encode(claims, SESSION_SECRET),
+                "refreshJwt": jwt.encode({**claims, "scope": "com.atproto.refresh"}, SESSION_SECRET),
+                "handle": graph.handle(index),
+                "did": graph.did(index),
+            }
+        )
+
+    @app.post("/xrpc/com.atproto.server.createSession")
+    async def create_session(request: Request) -> Response:
+        body = await request.json()
+        return session_response(body.get("identifier", ""))
+
+    @app.post("/xrpc/com.atproto.server.refreshSession")
+    async def refresh_session(request: Request) -> Response:
+        token = request.headers.get("authorization", "").removeprefix("Bearer ")
+        return session_response(jwt.get_unverified_claims(token)["sub"])
+
+
+def _add_actor_routes(app: FastAPI, graph: SyntheticGraph) -> None:
+    """Add profile and suggestion routes."""
+    # Most-followed accounts are suggested first
+    popular = np.argsort(-np.diff(graph.followers_indptr), kind="stable")
+
+    @app.get("/xrpc/app.bsky.actor.getProfile")
+    async def get_profile(actor: str) -> Response:
+        index = graph.resolve(actor)
+        if index is None or graph.is_deleted[index]:
+            return _xrpc_error(400, "InvalidRequest", "Profile not found")
+        return XrpcResponse(graph.profile_view_detailed(index))
+
+    @app.get("/xrpc/app.bsky.actor.getProfiles")
+    async def get_profiles(request: Request) -> Response:
+        indexes = [graph.resolve(actor) for actor in request.query_params.getlist("actors")]
+        profiles = [graph.profile_view_detailed(i) for i in indexes if i is not None and not graph.is_deleted[i]]
+        return XrpcResponse({"profiles": profiles})
+
+    @app.get("/xrpc/app.bsky.actor.getSuggestions")
+    async def get_suggestions(limit: int = 50, cursor: str | None = None) -> Response:
+        page, next_cursor = _page(popular, cursor, limit)
+        return XrpcResponse({"actors": [graph.profile_view(int(i)) for i in page], "cursor": next_cursor})
+
+
+def _add_graph_routes(app: FastAPI, graph: SyntheticGraph) -> None:
+    """Add paginated follows and followers routes."""
+
+    def graph_page(actor: str, key: str, items: np.ndarray | None, limit: int, cursor: str | None) -> Response:
+        index = graph.resolve(actor)
+        if index is None:
+            return _xrpc_error(400, "InvalidRequest", "Profile not found")
+        page, next_cursor = _page(items if items is not None else np.empty(0), cursor, limit)
+        return XrpcResponse(
+            {
+                "subject": graph.profile_view(index),
+                key: [graph.profile_view(int(i)) for i in page],
+                "cursor": next_cursor,
+            }
+        )
+
+    @app.get("/xrpc/app.bsky.graph.getFollows")
+    async def get_follows(actor: str, limit: int = 50, cursor: str | None = None) -> Response:
+        index = graph.resolve(actor)
+        return graph_page(actor, "follows", None if index is None else graph.follows_of(index), limit, cursor)
+
+    @app.get("/xrpc/app.bsky.graph.getFollowers")
+    async def get_followers(actor: str, limit: int = 50, cursor: str | None = None) -> Response:
+        index = graph.resolve(actor)
+        return graph_page(actor, "followers", None if index is None else graph.followers_of(index), limit, cursor)
+
+
+def _add_stats_routes(app: FastAPI, stats: FakePdsStats) -> None:
+    """Add routes exposing and resetting the request counters."""
+
+    @app.get("/_stats")
+    async def get_stats() -> dict:
+        return {
+            "requests": dict(stats.requests),
+            "total": sum(stats.requests.values()),
+            "connections": len(stats.connections),
+            "throttled": stats.throttled,
+            "injected_errors": stats.injected_errors,
+        }
+
+    @app.post("/_stats/reset")
+    async def reset_stats() -> dict:
+        stats.requests.clear()
+        stats.connections.clear()
+        stats.throttled = stats.injected_errors = 0
+        return {"status": "reset"}
+
+
+def create_fake_pds(config: FakePdsConfig | None = None) -> tuple[FastAPI, FakePdsStats]:
+    """Create the fake PDS application.
+
+    Args:
+        config: Graph shape and failure injection settings
+
+    Returns:
+        Tuple of (ASGI app, live request statistics)
+    """
+    config = config or FakePdsConfig()
+    graph = SyntheticGraph(config)
+    stats = FakePdsStats()
+    app = FastAPI(title="Fake Blue Sky PDS")
+    _add_upstream_behaviour(app, config, stats)
+    _add_session_routes(app, graph)
+    _add_actor_routes(app, graph)
+    _add_graph_routes(app, graph)
+    _add_stats_routes(app, stats)
+    return app, stats
+
+
+class FakePdsServer:
+    """Runs the fake PDS under uvicorn in a background thread."""
+
+    def __init__(self, config: FakePdsConfig | None = None, port: int = 8100):
+        """Build the app and server.
+
+        Args:
+            config: Fake PDS configuration
+            port: Local port to listen on
+        """
+        self.app, self.stats = create_fake_pds(config)
+        self.url = f"http://127.0.0.1:{port}"
+        self._server = uvicorn.Server(uvicorn.Config(self.app, host="127.0.0.1", port=port, log_level="warning"))
+        self._thread = threading.Thread(target=self._server.run, daemon=True)
+
+    def start(self) -> "FakePdsServer":
+        """Start serving and wait until the socket is bound.
+
+        Returns:
+            The running server
+        """
+        self._thread.start()
+        while not self._server.started:
+            time.sleep(0.01)
+        return self
+
+    def stop(self) -> None:
+        """Stop serving."""
+        self._server.should_exit = True
+        self._thread.join()
+
+
+def main() -> None:
+    """Serve the fake PDS from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--accounts", type=int, default=FakePdsConfig.num_accounts)
+    parser.add_argument("--mean-follows", type=int, default=FakePdsConfig.mean_follows)
+    parser.add_argument("--seed-follows", type=int, default=FakePdsConfig.seed_follows)
+    parser.add_argument("--rate-limit", type=int, default=0, help="Requests per window, 0 for unlimited")
+    parser.add_argument("--rate-window", type=float, default=FakePdsConfig.rate_window_seconds)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--latency", type=float, default=0.0, help="Added latency in seconds")
+    args = parser.parse_args()
+    config = FakePdsConfig(
+        num_accounts=args.accounts,
+        mean_follows=args.mean_follows,
+        seed_follows=args.seed_follows,
+        rate_limit=args.rate_limit,
+        rate_window_seconds=args.rate_window,
+        error_rate=args.error_rate,
+        latency_seconds=args.latency,
+    )
+    app, _ = create_fake_pds(config)
+    uvicorn.run(app, host="127.0.0.1", port=args.port, log_level="info")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Synthetic power-law follow graphs for benchmark scripts."""
+
+import time
+
+import numpy as np
+
+
+def make_did(index: int) -> str:
+    """Build a deterministic synthetic DID.
+
+    Args:
+        index: Account index
+
+    Returns:
+        DID string
+    """
+    return f"did:plc:{index:024d}"
+
+
+def make_seed_follows(
+    num_edges: int,
+    num_seeds: int = 50,
+    num_accounts: int | None = None,
+    exponent: float = 1.2,
+    seed: int = 0,
+) -> list[list[str]]:
+    """Generate follow lists whose targets follow a Zipf-like popularity distribution.
+
+    Args:
+        num_edges: Total number of follow edges across all seeds
+        num_seeds: Number of seed accounts
+        num_accounts: Size of the followable account pool, defaults to num_edges // 4
+        exponent: Power-law exponent of account popularity
+        seed: Random seed
+
+    Returns:
+        Followed DIDs per seed, without duplicates within a seed
+    """
+    rng = np.random.default_rng(seed)
+    num_accounts = num_accounts or max(num_edges // 4, 1)
+    weights = 1.0 / np.arange(1, num_accounts + 1) ** exponent
+    weights /= weights.sum()
+
+    # Seed out-degrees are heavy-tailed too
+    degrees = rng.pareto(1.5, num_seeds) + 1.0
+    degrees = np.maximum((degrees / degrees.sum() * num_edges).astype(np.int64), 1)
+    degrees = np.minimum(degrees, num_accounts)
+
+    dids = [make_did(index) for index in range(num_accounts)]
+    follows = []
+    for degree in degrees:
+        targets = rng.choice(num_accounts, size=int(degree), replace=False, p=weights)
+        follows.append([dids[target] for target in targets])
+    return follows
+
+
+def make_graph_arrays(
+    num_actors: int,
+    mean_follows: int,
+    num_accounts: int | None = None,
+    exponent: float = 1.2,
+    seed: int = 0,
+) -> dict[str, np.ndarray]:
+    """Generate a power-law follow graph directly as graph snapshot arrays.
+
+    Actor i is account i, and synthetic DIDs sort in index order, so no string
+    sorting is needed even for graphs with millions of edges.
+
+    Args:
+        num_actors: Number of accounts whose follows are included
+        mean_follows: Mean out-degree of the actors before repeated follows are dropped
+        num_accounts: Size of the followable account pool, defaults to 10 * num_actors
+        exponent: Power-law exponent of account popularity
+        seed: Random seed
+
+    Returns:
+        Dictionary of the arrays written by app.services.graph.snapshot.write_graph_arrays
+    """
+    rng = np.random.default_rng(seed)
+    num_accounts = max(num_accounts or num_actors * 10, num_actors)
+    weights = 1.0 / np.arange(1, num_accounts + 1) ** exponent
+    weights /= weights.sum()
+
+    degrees = rng.pareto(1.5, num_actors) + 1.0
+    degrees = np.minimum((degrees / degrees.mean() * mean_follows).astype(np.int64) + 1, num_accounts)
+    rows = np.repeat(np.arange(num_actors, dtype=np.int64), degrees)
+    targets = rng.choice(num_accounts, size=len(rows), p=weights)
+    # Drop repeated follows within a row; unique pairs come back sorted by row
+    pairs = np.unique(rows * num_accounts + targets)
+    rows, targets = pairs // num_accounts, pairs % num_accounts
+
+    return {
+        "nodes": np.array([make_did(index).encode() for index in range(num_accounts)]),
+        "actors": np.arange(num_actors, dtype=np.int32),
+        "indptr": np.concatenate([[0], np.cumsum(np.bincount(rows, minlength=num_actors))]).astype(np.int64),
+        "indices": targets.astype(np.int32),
+        "updated_at": np.full(num_actors, time.time()),
+    }
@@ -0,0 +1,79 @@
+"""Command-line tool to export, inspect and query memory-mapped follow graph snapshots."""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+from app.core.config import get_settings
+from app.core.logger import setup_logger
+from app.services.graph.crawl_store import CrawlStore
+from app.services.graph.snapshot import export_snapshot, open_current_snapshot
+
+
+# Add the project root to Python path
+project_root = str(Path(__file__).parent.parent)
+sys.path.append(project_root)
+
+logger = setup_logger(__name__)
+settings = get_settings()
+
+
+def export(args: argparse.Namespace) -> None:
+    """Export the crawl store to a new snapshot version."""
+    path = export_snapshot(CrawlStore(args.store), args.dir)
+    if path is None:
+        raise RuntimeError("Another export is running")
+    logger.info(f"Published {path}")
+
+
+def info(args: argparse.Namespace) -> None:
+    """Log the manifest of the current snapshot."""
+    started = time.perf_counter()
+    snapshot = open_current_snapshot(args.dir)
+    if snapshot is None:
+        raise RuntimeError(f"No snapshot published in {args.dir}")
+    logger.info(f"Mapped {snapshot.path} in {(time.perf_counter() - started) * 1e3:.1f} ms")
+    for key, value in snapshot.manifest.items():
+        logger.info(f"{key}: {value}")
+
+
+def follows(args: argparse.Namespace) -> None:
+    """Log the follows of an actor stored in the current snapshot."""
+    snapshot = open_current_snapshot(args.dir)
+    result = snapshot.get_follows(args.actor) if snapshot else None
+    if result is None:
+        raise RuntimeError(f"{args.actor} is not in the snapshot")
+    logger.info(f"{args.actor} follows {len(result.dids)} accounts (crawled {result.updated_at:%Y-%m-%d %H:%M})")
+    for did in result.dids[: args.limit]:
+        logger.info(did)
+
+
+def main() -> None:
+    """Run a snapshot subcommand."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--dir", type=Path, default=Path(settings.GRAPH_SNAPSHOT_DIR), help="Snapshot root directory")
+    subparsers = parser.add_subparsers(required=True)
+
+    export_parser = subparsers.add_parser("export", help="Export the crawl store to a new snapshot")
+    export_parser.add_argument("--store", default=settings.CRAWL_STORE_PATH, help="Crawl store SQLite path")
+    export_parser.set_defaults(command=export)
+
+    info_parser = subparsers.add_parser("info", help="Show the current snapshot manifest")
+    info_parser.set_defaults(command=info)
+
+    follows_parser = subparsers.add_parser("follows", help="List an actor's follows from the current snapshot")
+    follows_parser.add_argument("actor")
+    follows_parser.add_argument("--limit", type=int, default=20)
+    follows_parser.set_defaults(command=follows)
+
+    args = parser.parse_args()
+    try:
+        args.command(args)
+    except Exception as e:
+        logger.error(f"Graph snapshot command failed: {e!s}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,310 @@
+"""Async load-testing harness driving the API against a local fake PDS.
+
+Starts the fake PDS in-process and the API under uvicorn in a subprocess wired to
+it through BLUESKY_API_URL. Logs in a pool of synthetic users through /auth/login,
+then sends open-loop traffic to /recommendations/ at a target rate for each
+strategy. Latency percentiles, error rates and upstream-call amplification
+(fake PDS requests per API request) are logged and written as JSON so runs can be
+compared.
+
+Example:
+    PYTHONPATH=. python scripts/load_test.py --rps 20 --duration 30 --output results.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+
+import httpx
+import numpy as np
+
+from app.core.logger import setup_logger
+from scripts.common.fake_pds import FakePdsConfig, FakePdsServer
+
+
+# Add the project root to Python path
+project_root = str(Path(__file__).parent.parent)
+sys.path.append(project_root)
+
+logger = setup_logger(__name__)
+
+FAKE_PDS_PORT = 8103
+API_PORT = 8104
+READY_TIMEOUT_SECONDS = 120.0
+REQUEST_TIMEOUT_SECONDS = 60.0
+
+
+@dataclass
+class PhaseResult:
+    """Measurements of one load phase (login or a recommendation strategy)."""
+
+    name: str
+    target_rps: float
+    duration_seconds: float
+    requests: int = 0
+    errors: int = 0
+    status_codes: dict[str, int] = field(default_factory=dict)
+    latency_ms: dict[str, float] = field(default_factory=dict)
+    achieved_rps: float = 0.0
+    error_rate: float = 0.0
+    upstream_requests: int = 0
+    upstream_amplification: float = 0.0
+    upstream_by_endpoint: dict[str, int] = field(default_factory=dict)
+
+
+def summarize_latencies(latencies: list[float]) -> dict[str, float]:
+    """Summarize request latencies in milliseconds.
+
+    Args:
+        latencies: Latency of each request in seconds
+
+    Returns:
+        Dictionary of mean, p50, p95, p99 and max latency in milliseconds
+    """
+    if not latencies:
+        return {}
+    values = np.asarray(latencies) * 1000
+    p50, p95, p99 = np.percentile(values, [50, 95, 99])
+    return {
+        "mean": round(float(values.mean()), 2),
+        "p50": round(float(p50), 2),
+        "p95": round(float(p95), 2),
+        "p99": round(float(p99), 2),
+        "max": round(float(values.max()), 2),
+    }
+
+
+async def run_phase(
+    api: httpx.AsyncClient,
+    pds: httpx.AsyncClient,
+    name: str,
+    send: Callable[[httpx.AsyncClient, int], Awaitable[httpx.Response]],
+    rps: float,
+    duration: float,
+) -> PhaseResult:
+    """Send open-loop traffic at a fixed rate and measure it.
+
+    Requests are started on a fixed schedule whether or not earlier ones have
+    finished, so a slow server shows up as latency rather than a lower send rate.
+
+    Args:
+        api: Client for the API under test
+        pds: Client for the fake PDS stats endpoints
+        name: Phase name used in the report
+        send: Coroutine function issuing one request and returning the response
+        rps: Target requests per second
+        duration: Phase duration in seconds
+
+    Returns:
+        PhaseResult with latency, error and amplification figures
+    """
+    await pds.post("/_stats/reset")
+    result = PhaseResult(name=name, target_rps=rps, duration_seconds=duration)
+    latencies: list[float] = []
+    status_codes: dict[str, int] = {}
+
+    async def timed(index: int) -> None:
+        started = time.perf_counter()
+        try:
+            response = await send(api, index)
+            key = str(response.status_code)
+        except httpx.HTTPError as e:
+            key = type(e).__name__
+        latencies.append(time.perf_counter() - started)
+        status_codes[key] = status_codes.get(key, 0) + 1
+
+    started = time.perf_counter()
+    tasks = []
+    for index in range(int(rps * duration)):
+        delay = started + index / rps - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(timed(index)))
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - started
+
+    upstream = (await pds.get("/_stats")).json()
+    result.requests = len(latencies)
+    result.status_codes = status_codes
+    result.errors = sum(count for key, count in status_codes.items() if not key.startswith(("2", "3")))
+    result.latency_ms = summarize_latencies(latencies)
+    result.achieved_rps = round(result.requests / elapsed, 2)
+    result.error_rate = round(result.errors / max(result.requests, 1), 4)
+    result.upstream_requests = upstream["total"]
+    result.upstream_amplification = round(upstream["total"] / max(result.requests, 1), 2)
+    result.upstream_by_endpoint = upstream["requests"]
+    return result
+
+
+def start_api(pds_url: str, args: argparse.Namespace, data_dir: str) -> subprocess.Popen:
+    """Start the API under uvicorn, wired to the fake PDS.
+
+    Args:
+        pds_url: Base URL of the fake PDS
+        args: Parsed command-line arguments
+        data_dir: Directory for the crawl store and other local state
+
+    Returns:
+        The uvicorn process
+    """
+    env = {
+        **os.environ,
+        "BLUESKY_API_URL": f"{pds_url}/xrpc",
+        "BLUESKY_IDENTIFIER": "seed0.test",
+        "BLUESKY_PASSWORD": "unused",
+        "COMMON_FOLLOWERS_SEED_ACCOUNTS": ",".join(f"seed{i}.test" for i in range(args.seeds)),
+        "CRAWL_STORE_PATH": str(Path(data_dir) / "crawls.sqlite3"),
+        "NETWORK_STATE_PATH": str(Path(data_dir) / "network_scores.sqlite3"),
+        "PRECOMPUTE_STORE_PATH": str(Path(data_dir) / "precomputed.sqlite3"),
+        "GRAPH_SNAPSHOT_DIR": str(Path(data_dir) / "graph_snapshots"),
+        "STATE_BACKEND": "memory",
+        "RESULT_CACHE_TTL_SECONDS": str(args.result_cache_ttl),
+        "JWT_SECRET_KEY": os.environ.get("JWT_SECRET_KEY", "load-test-secret"),
+        "CORS_ORIGINS": os.environ.get("CORS_ORIGINS", "http://localhost"),
+        "API_V1_STR": os.environ.get("API_V1_STR", "/api/v1"),
+    }
+    command = [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(API_PORT), "--log-level", "warning"]
+    command += ["--workers", str(args.workers)] if args.workers > 1 else []
+    return subprocess.Popen(command, cwd=project_root, env=env)
+
+
+async def wait_until_ready(api: httpx.AsyncClient) -> float:
+    """Poll /ready until startup warmup has finished.
+
+    Args:
+        api: Client for the API under test
+
+    Returns:
+        Seconds waited
+
+    Raises:
+        TimeoutError: If the API is not ready within READY_TIMEOUT_SECONDS
+    """
+    started = time.perf_counter()
+    while time.perf_counter() - started < READY_TIMEOUT_SECONDS:
+        try:
+            if (await api.get("/ready")).status_code == 200:
+                return time.perf_counter() - started
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.2)
+    raise TimeoutError("API did not become ready")
+
+
+async def run_load_test(args: argparse.Namespace, pds_url: str) -> dict:
+    """Run the login phase and one phase per strategy against a running API.
+
+    Args:
+        args: Parsed command-line arguments
+        pds_url: Base URL of the fake PDS
+
+    Returns:
+        Machine-readable report
+    """
+    started_at = datetime.now()
+    limits = httpx.Limits(max_connections=args.connections, max_keepalive_connections=args.connections)
+    api = httpx.AsyncClient(base_url=f"http://127.0.0.1:{API_PORT}", timeout=REQUEST_TIMEOUT_SECONDS, limits=limits)
+    pds = httpx.AsyncClient(base_url=pds_url)
+    async with api, pds:
+        ready_seconds = await wait_until_ready(api)
+        logger.info(f"API ready after {ready_seconds:.1f}s")
+
+        users = [f"user{args.seeds + i}.test" for i in range(args.users)]
+        tokens: dict[int, str] = {}
+
+        async def login(client: httpx.AsyncClient, index: int) -> httpx.Response:
+            user = users[index % len(users)]
+            response = await client.post("/auth/login", json={"identifier": user, "password": "unused"})
+            if response.status_code == 200:
+                tokens[index % len(users)] = response.json()["access_jwt"]
+            return response
+
+        login_duration = max(len(users) / args.login_rps, 1.0)
+        phases = [await run_phase(api, pds, "login", login, args.login_rps, login_duration)]
+        if not tokens:
+            raise ValueError("No user could log in")
+        logged_in = list(tokens.values())
+
+        for strategy in args.strategies:
+
+            async def recommend(client: httpx.AsyncClient, index: int, strategy: str = strategy) -> httpx.Response:
+                token = random.choice(logged_in)
+                return await client.get(
+                    "/recommendations/",
+                    params={"strategy": strategy, "limit": 10},
+                    headers={"Authorization": f"Bearer {token}"},
+                )
+
+            phases.append(await run_phase(api, pds, strategy, recommend, args.rps, args.duration))
+
+    return {
+        "started_at": started_at.isoformat(),
+        "config": {key: value for key, value in vars(args).items() if key != "output"},
+        "api_ready_seconds": round(ready_seconds, 2),
+        "phases": [asdict(phase) for phase in phases],
+    }
+
+
+def main() -> None:
+    """Run the load test and write the report."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rps", type=float, default=10.0, help="Target recommendation requests per second")
+    parser.add_argument("--duration", type=float, default=20.0, help="Seconds of traffic per strategy")
+    parser.add_argument("--strategies", nargs="+", default=["basic", "common_followers"])
+    parser.add_argument("--users", type=int, default=50, help="Distinct synthetic users to log in")
+    parser.add_argument("--login-rps", type=float, default=10.0)
+    parser.add_argument("--seeds", type=int, default=3, help="Seed accounts for common_followers")
+    parser.add_argument("--accounts", type=int, default=20_000, help="Accounts in the synthetic graph")
+    parser.add_argument("--upstream-latency", type=float, default=0.02, help="Added fake PDS latency in seconds")
+    parser.add_argument("--upstream-rate-limit", type=int, default=0, help="Fake PDS requests per window, 0 for none")
+    parser.add_argument("--upstream-error-rate", type=float, default=0.0)
+    parser.add_argument("--result-cache-ttl", type=int, default=0, help="RESULT_CACHE_TTL_SECONDS for the API")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--connections", type=int, default=100, help="Maximum concurrent client connections")
+    parser.add_argument("--output", type=Path, default=Path("data/load_test_results.json"))
+    args = parser.parse_args()
+
+    config = FakePdsConfig(
+        num_accounts=args.accounts,
+        num_seeds=args.seeds,
+        latency_seconds=args.upstream_latency,
+        rate_limit=args.upstream_rate_limit,
+        error_rate=args.upstream_error_rate,
+        deleted_fraction=0.0,
+    )
+    server = FakePdsServer(config, port=FAKE_PDS_PORT).start()
+    with tempfile.TemporaryDirectory() as data_dir:
+        api_process = start_api(server.url, args, data_dir)
+        try:
+            report = asyncio.run(run_load_test(args, server.url))
+            for phase in report["phases"]:
+                logger.info(
+                    f"{phase['name']:>16}: {phase['requests']} req at {phase['achieved_rps']} rps, "
+                    f"p50 {phase['latency_ms'].get('p50')}ms p95 {phase['latency_ms'].get('p95')}ms "
+                    f"p99 {phase['latency_ms'].get('p99')}ms, errors {phase['error_rate']:.1%}, "
+                    f"upstream x{phase['upstream_amplification']}"
+                )
+            args.output.parent.mkdir(parents=True, exist_ok=True)
+            args.output.write_text(json.dumps(report, indent=2))
+            logger.info(f"Results written to {args.output}")
+        except Exception as e:
+            logger.error(f"Load test failed: {e!s}")
+            sys.exit(1)
+        finally:
+            api_process.terminate()
+            api_process.wait()
+            server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Test script for per-strategy admission control: concurrency limits, fair queueing, rejections and timeouts."""
+
+import asyncio
+import sys
+from pathlib import Path
+
+from app.core.admission import AdmissionRejectedError, StrategyGate
+from app.core.logger import setup_logger
+
+
+# Add the project root to Python path
+project_root = str(Path(__file__).parent.parent)
+sys.path.append(project_root)
+
+logger = setup_logger(__name__)
+
+
+async def request(gate: StrategyGate, user: str, seconds: float, admitted: list[str], peak: list[int]) -> str:
+    """Run one simulated request through a gate and report how it ended."""
+    try:
+        async with gate.admit(user):
+            admitted.append(user)
+            peak[0] = max(peak[0], gate.active)
+            await asyncio.sleep(seconds)
+        return "ok"
+    except AdmissionRejectedError as e:
+        return f"429 Retry-After {e.retry_after}"
+
+
+async def test_fair_queueing() -> None:
+    """Check the concurrency limit, round-robin hand-over and per-user queue cap."""
+    gate = StrategyGate("common_followers", max_concurrency=2, max_queue=8, max_queued_per_user=2, timeout=5.0)
+    admitted: list[str] = []
+    peak = [0]
+    tasks = []
+    # One user bursts five requests before two others arrive
+    for user in ["a", "a", "a", "a", "a", "b", "c"]:
+        tasks.append(asyncio.create_task(request(gate, user, 0.1, admitted, peak)))
+        await asyncio.sleep(0)
+    outcomes = await asyncio.gather(*tasks)
+
+    logger.info(f"Admission order {admitted}, outcomes {outcomes}, peak concurrency {peak[0]}")
+    if peak[0] > 2:
+        raise ValueError(f"Concurrency limit exceeded: {peak[0]} active")
+    if not outcomes[4].startswith("429"):
+        raise ValueError("A user's third queued request was not rejected")
+    if admitted != ["a", "a", "a", "b", "c", "a"]:
+        raise ValueError(f"Freed slots were not handed out round-robin: {admitted}")
+
+
+async def test_queue_full_and_timeout() -> None:
+    """Check fast rejection when the queue is full and rejection after the wait timeout."""
+    gate = StrategyGate("common_followers", max_concurrency=1, max_queue=2, max_queued_per_user=2, timeout=0.2)
+    admitted: list[str] = []
+    peak = [0]
+    tasks = []
+    for user in ["a", "b", "c", "d"]:
+        tasks.append(asyncio.create_task(request(gate, user, 0.5, admitted, peak)))
+        await asyncio.sleep(0)
+    outcomes = await asyncio.gather(*tasks)
+
+    metrics = gate.metrics()
+    logger.info(f"Outcomes {outcomes}, metrics {metrics.model_dump()}")
+    if outcomes[0] != "ok" or not all(outcome.startswith("429") for outcome in outcomes[1:]):
+        raise ValueError("Expected one admitted request and three rejections")
+    if (metrics.rejected_total, metrics.timed_out_total, metrics.queue_depth_max) != (1, 2, 2):
+        raise ValueError("Rejection, timeout and queue depth metrics are wrong")
+    if metrics.active or metrics.queue_depth:
+        raise ValueError("Gate did not return to idle")
+
+
+async def main() -> None:
+    """Run admission control tests."""
+    try:
+        await test_fair_queueing()
+        await test_queue_full_and_timeout()
+        logger.info("Admission control tests successful")
+    except Exception as e:
+        logger.error(f"Admission control tests failed: {e!s}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,107 @@
+"""Test script for the follow-back recommender and incremental follower/follow syncs against a fake PDS."""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import orjson
+from atproto import Client
+
+from app.bluesky.upstream import UpstreamRequest
+from app.core.logger import setup_logger
+from app.services.graph.crawler import FOLLOWERS, FOLLOWS, crawl_follows
+from app.services.graph.incremental import sync_graph_set
+from app.services.recommenders import follow_back
+from app.services.recommenders.follow_back import FollowBackRecommender
+from app.services.state.factory import get_state_backend
+from scripts.common.fake_pds import FakePdsConfig, FakePdsServer
+
+
+# Add the project root to Python path
+project_root = str(Path(__file__).parent.parent)
+sys.path.append(project_root)
+
+logger = setup_logger(__name__)
+
+FAKE_PDS_PORT = 8106
+ACTOR = "user50.test"
+
+
+def rewrite_stored_set(kind: str, did: str, dids: list[str], count: int) -> None:
+    """Overwrite a stored set to simulate the state left by an earlier sync."""
+    key = f"graph_sets:{kind}:{did}"
+    entry = orjson.loads(get_state_backend().get(key))
+    get_state_backend().set(key, orjson.dumps({**entry, "dids": dids, "count": count}))
+
+
+async def test_recommendations(client: Client, did: str, server: FakePdsServer) -> None:
+    """Check that recommendations are unreciprocated followers sorted by mutual connections."""
+    recommender = FollowBackRecommender()
+    first = await recommender.get_recommendations(client, did)
+    followers = set((await sync_graph_set(client, did, FOLLOWERS)).dids)
+    follows = set((await sync_graph_set(client, did, FOLLOWS)).dids)
+    if not first:
+        raise ValueError("No follow-back recommendations returned")
+    for profile in first:
+        if profile.did not in followers or profile.did in follows:
+            raise ValueError(f"{profile.handle} is not an unreciprocated follower")
+
+    # The first request ranks without crawling candidates, which are crawled in the background
+    await asyncio.gather(*follow_back._warmups.values())
+    server.stats.requests.clear()
+    recommendations = await recommender.get_recommendations(client, did)
+    pages = server.stats.requests["app.bsky.graph.getFollows"]
+    if pages > 1:
+        raise ValueError(f"Ranking with warmed-up candidates fetched {pages} follow pages")
+
+    mutuals = [len(follows.intersection((await crawl_follows(client, p.did)).dids)) for p in recommendations]
+    if mutuals != sorted(mutuals, reverse=True) or not any(mutuals):
+        raise ValueError(f"Recommendations are not ranked by mutual connections: {mutuals}")
+    logger.info(f"{len(recommendations)} recommendations, mutual connections {mutuals[:10]}")
+
+
+async def test_incremental_sync(client: Client, did: str) -> None:
+    """Check that unchanged, grown and shrunk follower sets are synced with the least work."""
+    count = client.app.bsky.actor.get_profile({"actor": did}).followers_count
+    full = await sync_graph_set(client, did, FOLLOWERS, count)
+
+    unchanged = await sync_graph_set(client, did, FOLLOWERS, count)
+    logger.info(f"Unchanged: {unchanged.pages_fetched} pages, full refresh {unchanged.is_full_refresh}")
+    if unchanged.is_full_refresh or unchanged.pages_fetched != 1 or unchanged.added:
+        raise ValueError("Unchanged follower set was not served from the stored copy")
+
+    # Pretend the 150 newest followers arrived after the last sync
+    rewrite_stored_set(FOLLOWERS, did, full.dids[150:], count - 150)
+    grown = await sync_graph_set(client, did, FOLLOWERS, count)
+    logger.info(f"Grown by 150: {grown.pages_fetched} pages, +{len(grown.added)}, full refresh {grown.is_full_refresh}")
+    if grown.is_full_refresh or grown.added != full.dids[:150] or grown.dids != full.dids:
+        raise ValueError("New followers were not picked up incrementally")
+
+    # Pretend an account that was stored has since unfollowed
+    rewrite_stored_set(FOLLOWERS, did, [*full.dids[:10], "did:plc:unfollowed", *full.dids[10:]], count + 1)
+    shrunk = await sync_graph_set(client, did, FOLLOWERS, count)
+    logger.info(f"Shrunk by 1: {shrunk.pages_fetched} pages, full refresh {shrunk.is_full_refresh}")
+    if not shrunk.is_full_refresh or shrunk.dids != full.dids:
+        raise ValueError("Unfollow was not detected")
+
+
+async def main() -> None:
+    """Run follow-back tests against the fake PDS."""
+    server = FakePdsServer(FakePdsConfig(num_accounts=5_000, mean_follows=40), port=FAKE_PDS_PORT).start()
+    try:
+        client = Client(base_url=f"{server.url}/xrpc", request=UpstreamRequest())
+        client.login(login=ACTOR, password="unused")
+        did = client.me.did
+
+        await test_recommendations(client, did, server)
+        await test_incremental_sync(client, did)
+        logger.info("Follow-back tests successful")
+    except Exception as e:
+        logger.error(f"Follow-back tests failed: {e!s}")
+        sys.exit(1)
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,149 @@
+"""Test script for the DID-sharded graph service against a single-process snapshot of the same graph."""
+
+import asyncio
+import sys
+import tempfile
+from collections import Counter
+from pathlib import Path
+
+import numpy as np
+
+from app.core.logger import setup_logger
+from app.services.graph import sharding
+from app.services.graph.crawl_store import CrawlStore
+from app.services.graph.crawler import crawl_follows
+from app.services.graph.sharding import PARTITIONS_DIR, GraphShardError, HashRing, ShardedGraphStore, get_graph_store
+from app.services.graph.snapshot import GraphSnapshot, write_graph_arrays
+from app.services.recommenders.common_followers import CommonFollowersRecommender
+from scripts.common.synthetic_graph import make_did, make_graph_arrays
+
+
+# Add the project root to Python path
+project_root = str(Path(__file__).parent.parent)
+sys.path.append(project_root)
+
+logger = setup_logger(__name__)
+
+NUM_ACTORS = 2_000
+NUM_SHARDS = 3
+
+
+def test_ring() -> None:
+    """Check that actors spread evenly and adding a shard moves about 1/n of them."""
+    keys = [make_did(index) for index in range(50_000)]
+    ring, grown = HashRing(NUM_SHARDS), HashRing(NUM_SHARDS + 1)
+    sizes = Counter(ring.shard_for(key) for key in keys)
+    moved = sum(ring.shard_for(key) != grown.shard_for(key) for key in keys) / len(keys)
+    logger.info(f"Shard sizes {sorted(sizes.values())}, {moved:.1%} of keys moved when adding a shard")
+    if max(sizes.values()) > 1.5 * len(keys) / NUM_SHARDS:
+        raise ValueError(f"Keys are spread unevenly: {sizes}")
+    if not 0.15 < moved < 0.35:
+        raise ValueError(f"Adding a fourth shard moved {moved:.1%} of keys instead of about 25%")
+
+
+async def check_seed_counting(snapshot: GraphSnapshot, seeds: list[str]) -> None:
+    """Check that common followers counts its seeds in the active graph store and keeps only the candidates."""
+    seed_follows, degrees = await CommonFollowersRecommender(seeds, min_common_follows=2)._get_seed_follows(None)
+    counts = Counter(did for seed in seeds for did in snapshot.get_follows(seed).dids)
+    candidates = {did for did, count in counts.items() if count >= 2}
+    if {did for follows in seed_follows for did in follows} != candidates:
+        raise ValueError("Seed candidates counted in the graph store differ from counting the snapshot")
+    if degrees is None or degrees.tolist() != [len(snapshot.get_follows(seed).dids) for seed in seeds]:
+        raise ValueError("Seed degrees from the graph store differ from the snapshot")
+
+
+async def test_store(path: Path) -> None:
+    """Check that the sharded store answers like the snapshot it partitions."""
+    snapshot = GraphSnapshot(path)
+    store = ShardedGraphStore(path, NUM_SHARDS)
+    try:
+        actors = snapshot.actors()
+        logger.info(f"Shard partitions {[manifest['num_actors'] for manifest in store.manifests]} of {len(actors)}")
+        if sorted(store.actors()) != sorted(actors):
+            raise ValueError("Sharded actors differ from the snapshot")
+        for actor in actors[::50]:
+            if store.get_follows(actor).dids != snapshot.get_follows(actor).dids:
+                raise ValueError(f"Sharded follows of {actor} differ from the snapshot")
+        if store.get_follows("did:plc:unknown") is not None:
+            raise ValueError("Unknown actor resolved to a shard row")
+
+        batch = actors[:300]
+        expected = Counter(did for actor in batch for did in snapshot.get_follows(actor).dids)
+        if store.count_follows(batch) != expected or snapshot.count_follows(batch) != expected:
+            raise ValueError("Gathered follow counts differ from counting the follow lists")
+        if set(store.get_follows_many(batch)) != set(batch):
+            raise ValueError("Batched lookup missed actors")
+
+        # Crawls for actors the crawl store has never seen are served by the shards
+        sharding._sharded_store = store
+        result = await crawl_follows(None, actors[0], store=CrawlStore(":memory:"))
+        if result.dids != snapshot.get_follows(actors[0]).dids:
+            raise ValueError("Crawl was not served from the graph shards")
+        await check_seed_counting(snapshot, actors[:20])
+    finally:
+        sharding._sharded_store = None
+        store.close()
+    if any(process.is_alive() for process in store._processes):
+        raise ValueError("Shard workers are still running after close")
+
+
+async def test_failures(path: Path) -> None:
+    """Check that a failed scatter leaves no stale responses and a dead shard is dropped instead of failing crawls."""
+    snapshot = GraphSnapshot(path)
+    store = ShardedGraphStore(path, NUM_SHARDS)
+    try:
+        groups = store.ring.partition(snapshot.actors())
+        # The first shard fails to iterate its payload while the others answer
+        try:
+            store._scatter("follows", {**groups, 0: None})
+            raise ValueError("Failed shard request did not raise")
+        except GraphShardError:
+            pass
+        for shard, actors in groups.items():
+            if store.get_follows(actors[0]).dids != snapshot.get_follows(actors[0]).dids:
+                raise ValueError(f"Shard {shard} answered with a stale response after a failed scatter")
+
+        sharding._sharded_store = store
+        store._processes[0].kill()
+        store._processes[0].join()
+        result = await crawl_follows(None, groups[0][0], store=CrawlStore(":memory:"))
+        if result.is_complete or get_graph_store() is store:
+            raise ValueError("Dead graph shards were not dropped")
+    finally:
+        sharding._sharded_store = None
+        store.close()
+
+
+def check_partitions(path: Path) -> None:
+    """Check that partitions are written once into the snapshot and mapped by later shard groups."""
+    directory = path / PARTITIONS_DIR / f"{NUM_SHARDS}x64"
+    written = [(directory / str(shard) / "manifest.json").read_text() for shard in range(NUM_SHARDS)]
+    store = ShardedGraphStore(path, NUM_SHARDS)
+    store.close()
+    if [(directory / str(shard) / "manifest.json").read_text() for shard in range(NUM_SHARDS)] != written:
+        raise ValueError("A second shard group rewrote the partitions instead of mapping them")
+    if sum(manifest["num_actors"] for manifest in store.manifests) != NUM_ACTORS:
+        raise ValueError("Partitions do not cover every actor exactly once")
+    partition = GraphSnapshot(directory / "0")
+    if not isinstance(partition.indices, np.memmap):
+        raise ValueError("Partition arrays are not memory-mapped")
+
+
+async def main() -> None:
+    """Run graph sharding tests."""
+    try:
+        test_ring()
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory)
+            write_graph_arrays(path, make_graph_arrays(NUM_ACTORS, mean_follows=50))
+            await test_store(path)
+            await test_failures(path)
+            check_partitions(path)
+        logger.info("Graph sharding tests successful")
+    except Exception as e:
+        logger.error(f"Graph sharding tests failed: {e!s}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
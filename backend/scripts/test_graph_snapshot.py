@@ -0,0 +1,89 @@
+"""Test script exporting crawled follows to a memory-mapped snapshot and serving crawls from it."""
+
+import asyncio
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+from atproto import Client
+
+from app.bluesky.upstream import UpstreamRequest
+from app.core.logger import setup_logger
+from app.services.graph import snapshot as graph_snapshot
+from app.services.graph.crawl_store import CrawlStore
+from app.services.graph.crawler import FOLLOWS, crawl_follows
+from scripts.common.fake_pds import FakePdsConfig, FakePdsServer
+
+
+# Add the project root to Python path
+project_root = str(Path(__file__).parent.parent)
+sys.path.append(project_root)
+
+logger = setup_logger(__name__)
+
+FAKE_PDS_PORT = 8107
+ACTORS = ["seed0.test", "seed1.test", "seed2.test", *(f"user{i}.test" for i in range(10, 30))]
+
+
+def verify_snapshot(snapshot: graph_snapshot.GraphSnapshot, store: CrawlStore) -> None:
+    """Check that a snapshot is memory-mapped and matches the crawl store it was exported from."""
+    if not all(isinstance(array, np.memmap) for array in (snapshot.nodes, snapshot.indptr, snapshot.indices)):
+        raise ValueError("Snapshot arrays were copied instead of memory-mapped")
+    if sorted(snapshot.actors()) != sorted(ACTORS):
+        raise ValueError("Snapshot actors do not match the crawled actors")
+    for actor in ACTORS:
+        if snapshot.get_follows(actor).dids != store.get_dids(actor, FOLLOWS):
+            raise ValueError(f"Snapshot follows of {actor} differ from the crawl store")
+    if snapshot.get_follows("nobody.test") is not None:
+        raise ValueError("Unknown actor resolved to a snapshot row")
+
+
+async def main() -> None:
+    """Crawl, export, reload and verify a graph snapshot."""
+    server = FakePdsServer(FakePdsConfig(num_accounts=10_000, mean_follows=60), port=FAKE_PDS_PORT).start()
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            client = Client(base_url=f"{server.url}/xrpc", request=UpstreamRequest())
+            client.login(login="seed0.test", password="unused")
+
+            store = CrawlStore(":memory:")
+            for actor in ACTORS:
+                await crawl_follows(client, actor, store=store)
+
+            for _ in range(3):
+                path = graph_snapshot.export_snapshot(store, Path(directory))
+            versions = [p for p in Path(directory).iterdir() if p.is_dir() and not p.name.startswith(".")]
+            if len(versions) != 2:
+                raise ValueError(f"Expected 2 snapshot versions after pruning, found {len(versions)}")
+
+            started = time.perf_counter()
+            snapshot = graph_snapshot.open_current_snapshot(Path(directory))
+            logger.info(f"Mapped {path.name} in {(time.perf_counter() - started) * 1e3:.1f} ms: {snapshot.manifest}")
+            verify_snapshot(snapshot, store)
+
+            # A worker with an empty crawl store is served from the snapshot without upstream calls
+            graph_snapshot._snapshot = snapshot
+            server.stats.requests.clear()
+            result = await crawl_follows(client, ACTORS[0], store=CrawlStore(":memory:"))
+            if server.stats.requests["app.bsky.graph.getFollows"] or result.dids != store.get_dids(ACTORS[0], FOLLOWS):
+                raise ValueError("Crawl was not served from the snapshot")
+
+            # The store the snapshot was exported from answers from the snapshot, not by decoding its pages
+            decoded = []
+            get_dids = store.get_dids
+            store.get_dids = lambda actor, kind: decoded.append(actor) or get_dids(actor, kind)
+            result = await crawl_follows(client, ACTORS[1], store=store)
+            if decoded or result.dids != get_dids(ACTORS[1], FOLLOWS):
+                raise ValueError("Crawl decoded stored pages although the snapshot holds fresh follows")
+            logger.info("Graph snapshot test successful")
+    except Exception as e:
+        logger.error(f"Graph snapshot test failed: {e!s}")
+        sys.exit(1)
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
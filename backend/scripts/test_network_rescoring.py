@@ -0,0 +1,95 @@
+"""Test script for incremental per-user rescoring of the network strategy against a fake PDS."""
+
+import asyncio
+import sys
+from collections import Counter
+from pathlib import Path
+
+from atproto import Client
+
+from app.bluesky.upstream import UpstreamRequest
+from app.core.logger import setup_logger
+from app.services.graph.crawler import FOLLOWS, crawl_follows
+from app.services.graph.incremental import sync_graph_set
+from app.services.network_score_store import NetworkScoreStore
+from app.services.recommenders.network import NetworkRecommender
+from scripts.common.fake_pds import FakePdsConfig, FakePdsServer
+
+
+# Add the project root to Python path
+project_root = str(Path(__file__).parent.parent)
+sys.path.append(project_root)
+
+logger = setup_logger(__name__)
+
+FAKE_PDS_PORT = 8108
+ACTOR = "user50.test"
+NEW_FOLLOWS = ["user3001.test", "user3002.test", "user3003.test"]
+
+
+async def expected_counts(client: Client, did: str, follows: list[str]) -> dict[str, int]:
+    """Count from scratch how many of the given follows follow each candidate other than the user."""
+    counts: Counter[str] = Counter()
+    for follow in follows:
+        counts.update(set((await crawl_follows(client, follow)).dids))
+    counts.pop(did, None)
+    return dict(counts)
+
+
+def stored_counts(store: NetworkScoreStore, did: str) -> dict[str, int]:
+    """Read every stored candidate count of a user."""
+    return dict(store.rank(did, limit=sys.maxsize))
+
+
+async def main() -> None:
+    """Score a user, change their follows, and check the delta-updated counts match a full recount."""
+    server = FakePdsServer(FakePdsConfig(num_accounts=5_000, mean_follows=40), port=FAKE_PDS_PORT).start()
+    try:
+        client = Client(base_url=f"{server.url}/xrpc", request=UpstreamRequest())
+        client.login(login=ACTOR, password="unused")
+        did = client.me.did
+        store = NetworkScoreStore(":memory:")
+        recommender = NetworkRecommender(store=store)
+
+        recommendations = await recommender.get_recommendations(client, did)
+        follows = (await sync_graph_set(client, did, FOLLOWS)).dids
+        if not recommendations or any(profile.did in follows for profile in recommendations):
+            raise ValueError("Recommendations are empty or include accounts already followed")
+        if stored_counts(store, did) != await expected_counts(client, did, follows):
+            raise ValueError("Initial counts differ from a full recount")
+        logger.info(f"{len(recommendations)} recommendations from {len(follows)} follows")
+
+        # Follow three new accounts and unfollow two
+        new_dids = [client.app.bsky.actor.get_profile({"actor": actor}).did for actor in NEW_FOLLOWS]
+        changed = new_dids + follows[2:]
+        server.stats.requests.clear()
+        added, removed, rebuild = await recommender.rescore(client, did, changed)
+        crawled = server.stats.requests["app.bsky.graph.getFollows"]
+        logger.info(f"Rescored +{added} -{removed} follows with {crawled} follow pages fetched")
+        if (added, removed, rebuild) != (3, 2, False):
+            raise ValueError(f"Unexpected delta: +{added} -{removed}, rebuild {rebuild}")
+        if crawled > len(NEW_FOLLOWS) * 10:
+            raise ValueError("Rescoring crawled more than the changed follows")
+        if stored_counts(store, did) != await expected_counts(client, did, changed):
+            raise ValueError("Delta-updated counts differ from a full recount")
+
+        # An unchanged follow set applies no delta
+        if await recommender.rescore(client, did, changed) != (0, 0, False):
+            raise ValueError("Unchanged follow set was rescored")
+
+        # An unfollow subtracts the follow list counted when the follow was added, even if it changed since
+        scratch = NetworkScoreStore(":memory:")
+        scratch.apply(did, None, {"did:plc:a": ["did:plc:x", "did:plc:y"], "did:plc:b": ["did:plc:x"]}, [])
+        scratch.apply(did, scratch.get_state(did).version, {}, ["did:plc:a"])
+        if stored_counts(scratch, did) != {"did:plc:x": 1}:
+            raise ValueError("Unfollow did not subtract the follow list counted when it was added")
+        logger.info("Network rescoring test successful")
+    except Exception as e:
+        logger.error(f"Network rescoring test failed: {e!s}")
+        sys.exit(1)
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
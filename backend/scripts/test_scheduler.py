@@ -0,0 +1,152 @@
+"""Test script for the crawl scheduler: interactive preemption, reserved workers, deduplication and promotion."""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+from app.core.logger import setup_logger
+from app.services.scheduler import JobScheduler, Priority, scheduling_priority
+
+
+# Add the project root to Python path
+project_root = str(Path(__file__).parent.parent)
+sys.path.append(project_root)
+
+logger = setup_logger(__name__)
+
+
+def blocking_call(name: str, seconds: float, started: list[str], lock: threading.Lock) -> str:
+    """Simulate an upstream call, recording when it started."""
+    with lock:
+        started.append(name)
+    time.sleep(seconds)
+    return name
+
+
+async def test_interactive_preemption() -> None:
+    """Check that queued interactive jobs start before queued background jobs and use reserved workers."""
+    scheduler = JobScheduler(workers=4, interactive_reserved=2)
+    started: list[str] = []
+    lock = threading.Lock()
+
+    # A prefetch burst fills every worker background jobs may use and queues the rest
+    background = [
+        asyncio.create_task(scheduler.run(None, blocking_call, f"bg{i}", 0.2, started, lock)) for i in range(6)
+    ]
+    await asyncio.sleep(0.05)
+    running = scheduler.metrics().priorities["background"].running
+    if running != 2:
+        raise ValueError(f"Background jobs took reserved workers: {running} running")
+
+    began = time.perf_counter()
+    with scheduling_priority(Priority.INTERACTIVE):
+        await scheduler.run(None, blocking_call, "user", 0.05, started, lock)
+    latency = time.perf_counter() - began
+    await asyncio.gather(*background)
+
+    logger.info(f"Start order {started}, interactive latency {latency * 1000:.0f} ms")
+    if latency > 0.15:
+        raise ValueError(f"Interactive job waited behind background work: {latency * 1000:.0f} ms")
+    if started.index("user") > 2:
+        raise ValueError("Interactive job did not start ahead of queued background jobs")
+
+    # Interactive jobs queued behind a saturated pool still go first once a worker frees up
+    started.clear()
+    tasks = [asyncio.create_task(scheduler.run(None, blocking_call, f"bg{i}", 0.1, started, lock)) for i in range(4)]
+    await asyncio.sleep(0)
+    with scheduling_priority(Priority.INTERACTIVE):
+        tasks += [
+            asyncio.create_task(scheduler.run(None, blocking_call, f"user{i}", 0.1, started, lock)) for i in range(4)
+        ]
+    await asyncio.gather(*tasks)
+    logger.info(f"Start order under saturation {started}")
+    if sorted(started[:4]) != ["bg0", "bg1", "user0", "user1"] or started[6:] != ["bg2", "bg3"]:
+        raise ValueError(f"Queued background jobs were not held back: {started}")
+
+
+async def test_dedicated_workers() -> None:
+    """Check that the scheduler runs more jobs at once than the loop's default executor allows."""
+    default_workers = min(32, (os.cpu_count() or 1) + 4)
+    scheduler = JobScheduler(workers=default_workers + 4, interactive_reserved=2)
+    started: list[str] = []
+    lock = threading.Lock()
+
+    background_slots = scheduler.workers - scheduler.interactive_reserved
+    background = [
+        asyncio.create_task(scheduler.run(None, blocking_call, f"bg{i}", 0.5, started, lock))
+        for i in range(background_slots + 4)
+    ]
+    await asyncio.sleep(0.1)
+    if len(started) != background_slots:
+        raise ValueError(f"{len(started)} of {background_slots} running background jobs actually started")
+
+    began = time.perf_counter()
+    with scheduling_priority(Priority.INTERACTIVE):
+        await scheduler.run(None, blocking_call, "user", 0.01, started, lock)
+    latency = time.perf_counter() - began
+    await asyncio.gather(*background)
+    scheduler.close()
+
+    logger.info(f"Interactive latency with {background_slots} background jobs running: {latency * 1000:.0f} ms")
+    if latency > 0.15:
+        raise ValueError(f"Interactive job queued behind background threads: {latency * 1000:.0f} ms")
+
+
+async def test_deduplication_and_promotion() -> None:
+    """Check that concurrent requests for one key share an execution and promote a queued job."""
+    scheduler = JobScheduler(workers=2, interactive_reserved=1)
+    started: list[str] = []
+    lock = threading.Lock()
+
+    blocker = asyncio.create_task(scheduler.run(None, blocking_call, "blocker", 0.2, started, lock))
+    queued = [
+        asyncio.create_task(scheduler.run(("page", "a"), blocking_call, "a", 0.05, started, lock)) for _ in range(3)
+    ]
+    await asyncio.sleep(0.05)
+    with scheduling_priority(Priority.INTERACTIVE):
+        result = await scheduler.run(("page", "a"), blocking_call, "a", 0.05, started, lock)
+    results = await asyncio.gather(blocker, *queued)
+
+    metrics = scheduler.metrics()
+    logger.info(f"Started {started}, results {[*results, result]}, metrics {metrics.model_dump()}")
+    if started.count("a") != 1:
+        raise ValueError(f"Deduplicated job ran {started.count('a')} times")
+    if started != ["blocker", "a"] or results[1:] != ["a", "a", "a"]:
+        raise ValueError("Promoted job did not run on the reserved worker")
+    if (metrics.deduplicated_total, metrics.promoted_total) != (3, 1):
+        raise ValueError("Deduplication and promotion counters are wrong")
+    if any(stats.running or stats.queued for stats in metrics.priorities.values()):
+        raise ValueError("Scheduler did not return to idle")
+
+
+async def test_errors() -> None:
+    """Check that a failing job raises in every caller sharing it."""
+    scheduler = JobScheduler(workers=2, interactive_reserved=1)
+
+    def failing_call() -> None:
+        time.sleep(0.05)
+        raise ConnectionError("upstream down")
+
+    outcomes = await asyncio.gather(*(scheduler.run("key", failing_call) for _ in range(3)), return_exceptions=True)
+    if not all(isinstance(outcome, ConnectionError) for outcome in outcomes):
+        raise ValueError(f"Job errors were not propagated: {outcomes}")
+
+
+async def main() -> None:
+    """Run scheduler tests."""
+    try:
+        await test_interactive_preemption()
+        await test_dedicated_workers()
+        await test_deduplication_and_promotion()
+        await test_errors()
+        logger.info("Scheduler tests successful")
+    except Exception as e:
+        logger.error(f"Scheduler tests failed: {e!s}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
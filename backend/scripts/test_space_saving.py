@@ -0,0 +1,64 @@
+"""Test script for SpaceSaving heavy-hitter counting against exact counts on skewed streams."""
+
+import sys
+from collections import Counter
+from pathlib import Path
+
+import numpy as np
+
+from app.core.logger import setup_logger
+from app.services.recommenders.sketches import SpaceSaving
+
+
+# Add the project root to Python path
+project_root = str(Path(__file__).parent.parent)
+sys.path.append(project_root)
+
+logger = setup_logger(__name__)
+
+
+def check_guarantees(stream: list[int], capacity: int) -> None:
+    """Check the documented error bounds of a summary of one stream."""
+    sketch = SpaceSaving(capacity)
+    sketch.update_all(stream)
+    exact = Counter(stream)
+
+    if len(sketch) > capacity:
+        raise ValueError(f"Summary holds {len(sketch)} items with capacity {capacity}")
+    if sketch.min_count > len(stream) / capacity:
+        raise ValueError(f"Error bound {sketch.min_count} exceeds N / capacity")
+    for item, true_count in exact.items():
+        count, error = sketch.estimate(item)
+        if count == 0:
+            if true_count > sketch.min_count:
+                raise ValueError(f"Missed item {item} with count {true_count} > min_count {sketch.min_count}")
+        elif not count - error <= true_count <= count:
+            raise ValueError(f"Item {item}: true count {true_count} outside [{count - error}, {count}]")
+
+    threshold = sketch.min_count + 1
+    missing = {item for item, true_count in exact.items() if true_count >= threshold} - set(sketch.frequent(threshold))
+    if missing:
+        raise ValueError(f"frequent({threshold}) missed {len(missing)} items")
+    logger.info(
+        f"{len(stream):,} updates, {len(exact):,} distinct, capacity {capacity:,}: "
+        f"min_count {sketch.min_count} (N / capacity = {len(stream) / capacity:.1f})"
+    )
+
+
+def main() -> None:
+    """Run SpaceSaving tests."""
+    try:
+        rng = np.random.default_rng(0)
+        for capacity in [10, 1_000, 100_000]:
+            stream = rng.zipf(1.3, 200_000).tolist()
+            check_guarantees(stream, capacity)
+        # A stream with fewer distinct items than the capacity is counted exactly
+        check_guarantees(rng.integers(0, 500, 50_000).tolist(), 1_000)
+        logger.info("SpaceSaving tests successful")
+    except Exception as e:
+        logger.error(f"SpaceSaving tests failed: {e!s}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
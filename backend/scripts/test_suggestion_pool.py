@@ -0,0 +1,88 @@
+"""Test script for the cached, lazily paged suggestion pool behind the basic strategy against a fake PDS."""
+
+import asyncio
+import sys
+from pathlib import Path
+
+from atproto import Client
+
+from app.bluesky.upstream import UpstreamRequest
+from app.core.config import get_settings
+from app.core.logger import setup_logger
+from app.services import suggestion_pool
+from app.services.recommenders.basic import BasicRecommender
+from scripts.common.fake_pds import FakePdsConfig, FakePdsServer
+
+
+# Add the project root to Python path
+project_root = str(Path(__file__).parent.parent)
+sys.path.append(project_root)
+
+logger = setup_logger(__name__)
+settings = get_settings()
+
+FAKE_PDS_PORT = 8109
+ACTOR = "user50.test"
+
+
+async def fetch(server: FakePdsServer, client: Client, did: str, limit: int) -> tuple[list[str], dict[str, int]]:
+    """Get basic recommendations and the upstream requests they caused."""
+    server.stats.requests.clear()
+    profiles = await BasicRecommender(limit).get_recommendations(client, did)
+    requests = {name: count for name, count in server.stats.requests.items() if name.startswith("app.bsky.")}
+    logger.info(f"limit={limit}: {len(profiles)} profiles, upstream {requests}")
+    return [profile.did for profile in profiles], requests
+
+
+async def main() -> None:
+    """Fill, reuse and extend a user's suggestion pool."""
+    server = FakePdsServer(FakePdsConfig(num_accounts=5_000, deleted_fraction=0.05), port=FAKE_PDS_PORT).start()
+    try:
+        client = Client(base_url=f"{server.url}/xrpc", request=UpstreamRequest())
+        client.login(login=ACTOR, password="unused")
+        did = client.me.did
+
+        first, requests = await fetch(server, client, did, 10)
+        if requests.get("app.bsky.actor.getSuggestions") != 1 or requests.get("app.bsky.actor.getProfile"):
+            raise ValueError("First request should fetch one suggestion page and hydrate it in batches")
+
+        again, requests = await fetch(server, client, did, 10)
+        if requests or again != first:
+            raise ValueError("Repeated request was not served from the cached pool")
+
+        # Once the pool is older than CRAWL_VIEWER_MAX_AGE_SECONDS, an account followed from it is dropped
+        newest_follows, max_age = suggestion_pool.get_newest_follows, settings.CRAWL_VIEWER_MAX_AGE_SECONDS
+        suggestion_pool.get_newest_follows = lambda *args: asyncio.sleep(0, result={first[0]})
+        settings.CRAWL_VIEWER_MAX_AGE_SECONDS = -1
+        followed, requests = await fetch(server, client, did, 10)
+        suggestion_pool.get_newest_follows, settings.CRAWL_VIEWER_MAX_AGE_SECONDS = newest_follows, max_age
+        if first[0] in followed or followed[: len(first) - 1] != first[1:] or requests:
+            raise ValueError("Newly followed account was still suggested from the cached pool")
+
+        extended, requests = await fetch(server, client, did, 250)
+        if len(extended) != 250 or extended[: len(first) - 1] != first[1:] or len(set(extended)) != len(extended):
+            raise ValueError("Extended pool is not a duplicate-free continuation of the cached pool")
+        if requests.get("app.bsky.actor.getSuggestions", 0) < 2:
+            raise ValueError("Larger limit did not page further through getSuggestions")
+
+        # Suggestions left unhydrated by failing getProfiles calls are retried, not dropped with the page
+        actor_namespace = client.app.bsky.actor
+        get_profiles = actor_namespace.get_profiles
+        actor_namespace.get_profiles = lambda *args, **kwargs: (_ for _ in ()).throw(ConnectionError("transient"))
+        failed, requests = await fetch(server, client, "did:plc:retry", 10)
+        actor_namespace.get_profiles = get_profiles
+        if requests.get("app.bsky.actor.getSuggestions") != 1:
+            raise ValueError("Paging continued after a page's hydration failed")
+        retried, requests = await fetch(server, client, "did:plc:retry", 10)
+        if failed or len(retried) != len(first) or requests.get("app.bsky.actor.getSuggestions"):
+            raise ValueError("Suggestions from pages whose hydration failed were not retried")
+        logger.info("Suggestion pool test successful")
+    except Exception as e:
+        logger.error(f"Suggestion pool test failed: {e!s}")
+        sys.exit(1)
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,109 @@
+"""Test script crawling a large account through a local fake PDS that emits 429s and 5xx errors."""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import httpx
+from atproto import Client
+
+from app.bluesky.rate_limit import UpstreamRateLimiter, upstream_rate_limiter
+from app.bluesky.upstream import UpstreamRequest
+from app.core.config import get_settings
+from app.core.logger import setup_logger
+from app.services.graph.crawl_store import CrawlStore
+from app.services.graph.crawler import crawl_follows
+from scripts.common.fake_pds import FakePdsConfig, FakePdsServer
+
+
+# Add the project root to Python path
+project_root = str(Path(__file__).parent.parent)
+sys.path.append(project_root)
+
+logger = setup_logger(__name__)
+settings = get_settings()
+
+FAKE_PDS_PORT = 8101
+SEED_ACTOR = "seed0.test"
+
+
+def test_retry_delays() -> None:
+    """Check that only 429s wait for the rate-limit window and Retry-After applies to 429 and 503 only."""
+    limiter = UpstreamRateLimiter()
+    headers = httpx.Headers({"RateLimit-Limit": "3000", "RateLimit-Remaining": "2990"})
+    headers["RateLimit-Reset"] = str(int(time.time()) + 30)
+    backoff = settings.UPSTREAM_BACKOFF_BASE_SECONDS
+
+    for status_code in (500, 502, 503, 504, None):
+        delay = limiter.retry_after(status_code, headers, attempt=0)
+        if delay > backoff:
+            raise ValueError(f"Retry of a {status_code} waited {delay:.1f}s for the rate-limit window")
+    if not 25 < limiter.retry_after(429, headers, attempt=0) <= 30:
+        raise ValueError("Retry of a 429 did not wait for the rate-limit window")
+
+    headers["Retry-After"] = "5"
+    if limiter.retry_after(503, headers, attempt=0) != 5 or limiter.retry_after(429, headers, attempt=0) != 5:
+        raise ValueError("Retry-After was not honoured for 429 and 503")
+    if limiter.retry_after(502, headers, attempt=0) > backoff:
+        raise ValueError("Retry-After was honoured for a 502")
+
+
+def test_budget_isolation() -> None:
+    """Check that a 429 or a low budget only holds back requests of the same session and route."""
+    limiter = UpstreamRateLimiter()
+    throttled = ("did:plc:throttled", "app.bsky.graph.getFollows")
+    headers = httpx.Headers({"RateLimit-Limit": "100", "RateLimit-Remaining": "0"})
+    headers["RateLimit-Reset"] = str(int(time.time()) + 30)
+    limiter.observe(throttled, 429, headers)
+
+    started = time.perf_counter()
+    limiter.acquire(("did:plc:other", "app.bsky.graph.getFollows"))
+    limiter.acquire(("did:plc:throttled", "app.bsky.actor.getProfile"))
+    if time.perf_counter() - started > 0.1:
+        raise ValueError("A 429 of one session and route held back other budgets")
+    metrics = limiter.metrics()
+    if (metrics.budgets, metrics.remaining) != (1, 0):
+        raise ValueError(f"Metrics do not report the throttled budget: {metrics.model_dump()}")
+
+
+async def main() -> None:
+    """Crawl a seed account under a tight rate limit and verify nothing is truncated."""
+    config = FakePdsConfig(
+        num_accounts=50_000,
+        seed_follows=8_000,
+        rate_limit=20,
+        rate_window_seconds=2.0,
+        error_rate=0.05,
+    )
+    server = FakePdsServer(config, port=FAKE_PDS_PORT).start()
+    try:
+        test_retry_delays()
+        test_budget_isolation()
+        client = Client(base_url=server.url, request=UpstreamRequest())
+        client.login(login=SEED_ACTOR, password="unused")
+
+        started = time.perf_counter()
+        result = await crawl_follows(client, SEED_ACTOR, store=CrawlStore(":memory:"))
+        elapsed = time.perf_counter() - started
+
+        metrics = upstream_rate_limiter.metrics()
+        expected = client.app.bsky.actor.get_profile({"actor": SEED_ACTOR}).follows_count
+        logger.info(f"Crawled {len(result.dids)}/{expected} follows in {result.pages_total} pages, {elapsed:.1f}s")
+        logger.info(f"Fake PDS: {server.stats.throttled} throttled, {server.stats.injected_errors} injected errors")
+        logger.info(f"Limiter: {metrics.model_dump_json()}")
+
+        if not result.is_complete or len(result.dids) != expected:
+            raise ValueError("Crawl was truncated despite retries")
+        if not server.stats.throttled and not metrics.pacing_interval_seconds:
+            logger.warning("Rate limit was never approached; lower FakePdsConfig.rate_limit to exercise pacing")
+        logger.info("Upstream rate limit test successful")
+    except Exception as e:
+        logger.error(f"Upstream rate limit test failed: {e!s}")
+        sys.exit(1)
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())